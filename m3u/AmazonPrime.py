@@ -2,6 +2,7 @@ import asyncio
 import aiohttp
 import re
 import os
+import sys
 from itertools import islice
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
@@ -9,13 +10,33 @@ import logging
 from concurrent.futures import ThreadPoolExecutor
 import time
 
+from state import StateStore, platform_name
+from selector_stats import SelectorStats
+from resolution_cache import ResolutionCache, episode_key
+from seed import seed_if_empty
+from refresh import SeriesState, series_fingerprint
+from journal import RunJournal
+from cli import build_parser
+from budget import RunBudget
+from shutdown import GracefulShutdown
+from playlist import PlaylistWriter, REORDER_LIMIT
+from proxy import ProxyRewriter
+from transport import TRAFFIC, client_session
+from failures import CarryForward, ERROR, NO_PAGE, NegativeCache, PROBE_FAILED, failure_reason
+from platforms import playlist_path
+from timing import StageTimer, LISTING, METADATA, EPISODES, GUJAN, PLAYHOUSE, FALLBACK, PROXY_URL, WRITE
+from metrics import CrawlMetrics
+from tracing import Tracer
+from logsetup import setup_logging
+from profiling import RunProfiler
+from loopmonitor import LoopMonitor
+
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
 BASE_URL = "https://dizifun5.com/primevideo"
-PROXY_BASE_URL = "https://3.nejyoner19.workers.dev/"
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -25,15 +46,35 @@ HEADERS = {
     "Upgrade-Insecure-Requests": "1",
 }
 
+# Meta verisi alınamayan dizinin yer tutucu başlığı; çözüm önbelleğinde anahtar olarak kullanılmaz
+UNKNOWN_SERIES = "Bilinmeyen Dizi"
+
+PLATFORM = platform_name(__file__)
+STATE = StateStore(PLATFORM)
+SELECTOR_STATS = SelectorStats(STATE)
+RESOLUTION_CACHE = ResolutionCache(STATE)
+SERIES_STATE = SeriesState(STATE)
+JOURNAL = RunJournal(PLATFORM)
+BUDGET = RunBudget()
+SHUTDOWN = GracefulShutdown(BUDGET)
+PROXY = ProxyRewriter()
+CARRY_FORWARD = CarryForward()
+NEGATIVE_CACHE = NegativeCache(STATE)
+TIMINGS = StageTimer()
+METRICS = CrawlMetrics(PLATFORM)
+TRACER = Tracer()
+PROFILER = RunProfiler(PLATFORM)
+LOOP_MONITOR = LoopMonitor(PLATFORM)
+
 
 def create_proxy_url(original_url):
-    """Yeni proxy sistemine göre M3U8 URL'yi dönüştürür"""
+    """Ham M3U8 URL'yi yapılandırılmış proxy şablonuna göre dönüştürür"""
     if not original_url:
         return None
 
-    # Yeni proxy adresine göre yapılandır
-    proxy_url = f"https://3.nejyoner19.workers.dev/?url={original_url}"
-    logger.info(f"[PROXY] {original_url} -> {proxy_url}")
+    with TIMINGS.stage(PROXY_URL) as span:
+        proxy_url = span.url = PROXY.rewrite(original_url)
+    logger.debug("[PROXY] %s -> %s", original_url, proxy_url)
     return proxy_url
 
 
@@ -121,21 +162,23 @@ def normalize_episode_numbers(episode_links):
 
     return normalized_episodes
 
+@TRACER.traced("fetch_page")
 async def fetch_page(session, url, timeout=45):  
     """Async olarak sayfa içeriğini getirir - geliştirilmiş versiyon"""
+    BUDGET.spend()
     try:
         async with session.get(url, headers=HEADERS, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
             if response.status == 200:
                 content = await response.text()
                 return content
             else:
-                logger.warning(f"[!] HTTP {response.status} hatası: {url}")
+                logger.warning("[!] HTTP %s hatası: %s", response.status, url)
                 return None
     except asyncio.TimeoutError:
-        logger.error(f"[!] Timeout hatası ({timeout}s): {url}")
+        logger.error("[!] Timeout hatası (%ss): %s", timeout, url)
         return None
     except Exception as e:
-        logger.error(f"[!] Sayfa getirme hatası ({url}): {e}")
+        logger.error("[!] Sayfa getirme hatası (%s): %s", url, e)
         return None
 
 async def extract_gujan_m3u8(session, gujan_iframe_url):
@@ -145,12 +188,12 @@ async def extract_gujan_m3u8(session, gujan_iframe_url):
         if gujan_iframe_url.startswith("//"):
             gujan_iframe_url = "https:" + gujan_iframe_url
 
-        logger.info(f"[GUJAN] İframe URL'sine istek atılıyor: {gujan_iframe_url}")
+        logger.debug("[GUJAN] İframe URL'sine istek atılıyor: %s", gujan_iframe_url)
 
 
         content = await fetch_page(session, gujan_iframe_url)
         if not content:
-            logger.warning(f"[GUJAN] İframe içeriği alınamadı: {gujan_iframe_url}")
+            logger.warning("[GUJAN] İframe içeriği alınamadı: %s", gujan_iframe_url)
             return None
 
 
@@ -161,7 +204,7 @@ async def extract_gujan_m3u8(session, gujan_iframe_url):
         if source_element:
             m3u8_url = source_element.get('src')
             if m3u8_url:
-                logger.info(f"[GUJAN] ✅ M3U8 URL bulundu: {m3u8_url}")
+                logger.debug("[GUJAN] ✅ M3U8 URL bulundu: %s", m3u8_url)
                 return m3u8_url
 
 
@@ -180,7 +223,7 @@ async def extract_gujan_m3u8(session, gujan_iframe_url):
                 matches = re.findall(pattern, script_content)
                 if matches:
                     m3u8_url = matches[0]
-                    logger.info(f"[GUJAN] ✅ Script'ten M3U8 URL bulundu: {m3u8_url}")
+                    logger.debug("[GUJAN] ✅ Script'ten M3U8 URL bulundu: %s", m3u8_url)
                     return m3u8_url
 
 
@@ -188,22 +231,24 @@ async def extract_gujan_m3u8(session, gujan_iframe_url):
         if file_id_match:
             file_id = file_id_match.group(1)
             constructed_m3u8 = f"https://gujan.premiumvideo.click/hls/{file_id}_o/playlist.m3u8"
-            logger.info(f"[GUJAN] ✅ Constructed M3U8 URL: {constructed_m3u8}")
+            logger.debug("[GUJAN] ✅ Constructed M3U8 URL: %s", constructed_m3u8)
             return constructed_m3u8
 
-        logger.warning(f"[GUJAN] ❌ M3U8 URL bulunamadı: {gujan_iframe_url}")
+        logger.warning("[GUJAN] ❌ M3U8 URL bulunamadı: %s", gujan_iframe_url)
         return None
 
     except Exception as e:
-        logger.error(f"[GUJAN] ❌ Hata: {e}")
+        logger.error("[GUJAN] ❌ Hata: %s", e)
         return None
 
+@TRACER.traced("playhouse_redirect")
 async def get_correct_domain_from_playhouse(session, file_id, timeout=15):
     """Playhouse URL'ine istek atıp redirect edilen doğru domain'i bulur"""
     playhouse_url = f"https://playhouse.premiumvideo.click/player/{file_id}"
 
     try:
-        logger.info(f"[*] Playhouse URL'ine redirect testi: {playhouse_url}")
+        logger.debug("[*] Playhouse URL'ine redirect testi: %s", playhouse_url)
+        BUDGET.spend()
 
 
         async with session.get(playhouse_url, 
@@ -212,13 +257,13 @@ async def get_correct_domain_from_playhouse(session, file_id, timeout=15):
                               allow_redirects=True) as response:
 
             final_url = str(response.url)
-            logger.info(f"[*] Final redirect URL: {final_url}")
+            logger.debug("[*] Final redirect URL: %s", final_url)
 
 
             domain_match = re.search(r'https://([^.]+)\.premiumvideo\.click', final_url)
             if domain_match:
                 domain = domain_match.group(1)
-                logger.info(f"[✅] Redirect edilen domain bulundu: {domain}")
+                logger.debug("[✅] Redirect edilen domain bulundu: %s", domain)
 
 
                 m3u8_url = f"https://{domain}.premiumvideo.click/uploads/encode/{file_id}/master.m3u8"
@@ -226,64 +271,66 @@ async def get_correct_domain_from_playhouse(session, file_id, timeout=15):
 
                 is_valid = await test_m3u8_url(session, m3u8_url)
                 if is_valid:
-                    logger.info(f"[✅] M3U8 URL doğrulandı: {m3u8_url}")
+                    logger.debug("[✅] M3U8 URL doğrulandı: %s", m3u8_url)
                     return domain, m3u8_url
                 else:
-                    logger.warning(f"[⚠️] M3U8 URL doğrulanamadı ama domain bulundu: {domain}")
+                    logger.warning("[⚠️] M3U8 URL doğrulanamadı ama domain bulundu: %s", domain)
                     return domain, m3u8_url
             else:
-                logger.warning(f"[⚠️] Redirect URL'den domain çıkarılamadı: {final_url}")
+                logger.warning("[⚠️] Redirect URL'den domain çıkarılamadı: %s", final_url)
 
 
-                logger.info(f"[*] Fallback: Eski domain test sistemi kullanılıyor")
+                logger.debug("[*] Fallback: Eski domain test sistemi kullanılıyor")
                 return await find_working_domain_fallback(session, file_id)
 
     except asyncio.TimeoutError:
-        logger.warning(f"[⚠️] Playhouse timeout, fallback sistem kullanılıyor")
+        logger.warning("[⚠️] Playhouse timeout, fallback sistem kullanılıyor")
         return await find_working_domain_fallback(session, file_id)
     except Exception as e:
-        logger.warning(f"[⚠️] Playhouse hatası: {e}, fallback sistem kullanılıyor")
+        logger.warning("[⚠️] Playhouse hatası: %s, fallback sistem kullanılıyor", e)
         return await find_working_domain_fallback(session, file_id)
 
 async def find_working_domain_fallback(session, file_id, domains=["d1", "d2", "d3", "d4"]):
-    """Fallback: Eski sistem ile çalışan domain bulma"""
-    logger.info(f"[*] Fallback domain testi başlıyor...")
+    """Fallback: Eski sistem ile çalışan domain bulma (hiçbiri çalışmazsa domain None, URL default d2 olur)"""
+    logger.debug("[*] Fallback domain testi başlıyor...")
 
     for domain in domains:
         m3u8_url = f"https://{domain}.premiumvideo.click/uploads/encode/{file_id}/master.m3u8"
 
-        logger.info(f"[*] Fallback test: {domain}")
+        logger.debug("[*] Fallback test: %s", domain)
         is_working = await test_m3u8_url(session, m3u8_url)
 
         if is_working:
-            logger.info(f"[✅] Fallback domain çalışıyor: {domain}")
+            logger.debug("[✅] Fallback domain çalışıyor: %s", domain)
             return domain, m3u8_url
 
 
-    logger.warning(f"[⚠️] Hiçbir domain çalışmıyor! Default d2 kullanılacak.")
-    return "d2", f"https://d2.premiumvideo.click/uploads/encode/{file_id}/master.m3u8"
+    logger.warning("[⚠️] Hiçbir domain çalışmıyor! Default d2 kullanılacak.")
+    return None, f"https://d2.premiumvideo.click/uploads/encode/{file_id}/master.m3u8"
 
+@TRACER.traced("test_m3u8_url")
 async def test_m3u8_url(session, url, timeout=15):
     """Geliştirilmiş m3u8 URL test fonksiyonu"""
+    BUDGET.spend()
     try:
         async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout), allow_redirects=True) as response:
             final_url = str(response.url)
             content_type = response.headers.get("Content-Type", "").lower()
             content_length = response.headers.get("Content-Length")
 
-            logger.info(f"[DEBUG] Test URL: {url}")
-            logger.info(f"[DEBUG] Final URL: {final_url}")
-            logger.info(f"[DEBUG] Status: {response.status}")
-            logger.info(f"[DEBUG] Content-Type: {content_type}")
+            logger.debug("[DEBUG] Test URL: %s", url)
+            logger.debug("[DEBUG] Final URL: %s", final_url)
+            logger.debug("[DEBUG] Status: %s", response.status)
+            logger.debug("[DEBUG] Content-Type: %s", content_type)
 
 
             if response.status != 200:
-                logger.info(f"[DEBUG] Status code 200 değil: {response.status}")
+                logger.debug("[DEBUG] Status code 200 değil: %s", response.status)
                 return False
 
 
             if "premiumvideo.click" not in final_url:
-                logger.info(f"[DEBUG] Redirect: premiumvideo.click domain'inden çıkmış: {final_url}")
+                logger.debug("[DEBUG] Redirect: premiumvideo.click domain'inden çıkmış: %s", final_url)
                 return False
 
 
@@ -291,11 +338,11 @@ async def test_m3u8_url(session, url, timeout=15):
                 content = await response.content.read(4096)
                 text = content.decode('utf-8', errors='ignore')
 
-                logger.info(f"[DEBUG] İçerik ilk 100 karakter: {text[:100]}")
+                logger.debug("[DEBUG] İçerik ilk 100 karakter: %s", text[:100])
 
 
                 if not text.strip().startswith("#EXTM3U"):
-                    logger.info(f"[DEBUG] İçerik #EXTM3U ile başlamıyor")
+                    logger.debug("[DEBUG] İçerik #EXTM3U ile başlamıyor")
                     return False
 
 
@@ -306,42 +353,42 @@ async def test_m3u8_url(session, url, timeout=15):
 
                 for pattern in suspicious_patterns:
                     if re.search(pattern, text, re.IGNORECASE):
-                        logger.info(f"[DEBUG] Şüpheli pattern bulundu: {pattern}")
+                        logger.debug("[DEBUG] Şüpheli pattern bulundu: %s", pattern)
                         return False
 
 
                 if content_length and int(content_length) < 50:
-                    logger.info(f"[DEBUG] Content-Length çok küçük: {content_length}")
+                    logger.debug("[DEBUG] Content-Length çok küçük: %s", content_length)
                     return False
 
 
                 if "master.m3u8" not in final_url and "playlist.m3u8" not in final_url:
-                    logger.info(f"[DEBUG] URL'de m3u8 yok: {final_url}")
+                    logger.debug("[DEBUG] URL'de m3u8 yok: %s", final_url)
                     return False
 
-                logger.info(f"[DEBUG] ✅ Tüm kontroller başarılı!")
+                logger.debug("[DEBUG] ✅ Tüm kontroller başarılı!")
                 return True
 
             except UnicodeDecodeError:
-                logger.info(f"[DEBUG] Unicode decode hatası - muhtemelen binary content")
+                logger.debug("[DEBUG] Unicode decode hatası - muhtemelen binary content")
 
                 return False
 
     except asyncio.TimeoutError:
-        logger.info(f"[DEBUG] Timeout: {url}")
+        logger.debug("[DEBUG] Timeout: %s", url)
         return False
     except Exception as e:
-        logger.warning(f"[DEBUG] Test hatası: {e}")
+        logger.warning("[DEBUG] Test hatası: %s", e)
         return False
 
 async def get_series_from_page(session, page_num):
     """Belirli bir sayfadan dizi listesini alır"""
     diziler_url = f"{BASE_URL}/diziler?p={page_num}"
-    logger.info(f"Sayfa {page_num} alınıyor: {diziler_url}")
+    logger.info("Sayfa %s alınıyor: %s", page_num, diziler_url)
 
     content = await fetch_page(session, diziler_url)
     if not content:
-        logger.warning(f"[!] Sayfa {page_num} alınamadı.")
+        logger.warning("[!] Sayfa %s alınamadı.", page_num)
         return [], False
 
     soup = BeautifulSoup(content, 'html.parser')
@@ -369,7 +416,7 @@ async def get_series_from_page(session, page_num):
         ".uk-pagination a"
     ]
 
-    for selector in pagination_selectors:
+    for selector in SELECTOR_STATS.order("pagination", pagination_selectors):
         pagination_elements = soup.select(selector)
         for element in pagination_elements:
             href = element.get("href", "")
@@ -377,6 +424,7 @@ async def get_series_from_page(session, page_num):
                 has_next_page = True
                 break
         if has_next_page:
+            SELECTOR_STATS.hit("pagination", selector)
             break
 
 
@@ -389,21 +437,30 @@ async def get_series_from_page(session, page_num):
             if next_links:
                 has_next_page = True
 
-    logger.info(f"[+] Sayfa {page_num}: {len(series_links)} dizi linki toplandı. Sonraki sayfa: {'Var' if has_next_page else 'Yok'}")
+    logger.info("[+] Sayfa %s: %s dizi linki toplandı. Sonraki sayfa: %s", page_num, len(series_links), 'Var' if has_next_page else 'Yok')
     return series_links, has_next_page
 
 async def get_series_from_homepage():
     """Tüm sayfalardan dizi listesini alır"""
-    async with aiohttp.ClientSession() as session:
+    async with client_session() as session:
         all_series_links = []
         page_num = 1
         max_pages = 100  
 
         while page_num <= max_pages:
-            series_links, has_next_page = await get_series_from_page(session, page_num)
+            # Bütçe listeleme sırasında dolarsa taranmayan sayfaların dizileri önceki listeden alınır
+            if BUDGET.exhausted():
+                seen = set(all_series_links)
+                known = [link for link in STATE.listing if link not in seen]
+                all_series_links.extend(known)
+                logger.warning("[!] Bütçe doldu, listeleme %s. sayfada kesildi; önceki listeden %s dizi eklendi.", page_num, len(known))
+                break
+
+            with TIMINGS.stage(LISTING, BASE_URL):
+                series_links, has_next_page = await get_series_from_page(session, page_num)
 
             if not series_links:
-                logger.info(f"[!] Sayfa {page_num} boş, tarama durduruluyor.")
+                logger.info("[!] Sayfa %s boş, tarama durduruluyor.", page_num)
                 break
 
 
@@ -413,10 +470,10 @@ async def get_series_from_homepage():
                     all_series_links.append(link)
                     new_count += 1
 
-            logger.info(f"[+] Sayfa {page_num}: {new_count} yeni dizi eklendi. Toplam: {len(all_series_links)}")
+            logger.info("[+] Sayfa %s: %s yeni dizi eklendi. Toplam: %s", page_num, new_count, len(all_series_links))
 
             if not has_next_page:
-                logger.info(f"[✓] Son sayfa ({page_num}) işlendi.")
+                logger.info("[✓] Son sayfa (%s) işlendi.", page_num)
                 break
 
             page_num += 1
@@ -424,20 +481,20 @@ async def get_series_from_homepage():
 
             await asyncio.sleep(0.5)
 
-        logger.info(f"[✓] Toplam {len(all_series_links)} benzersiz dizi linki toplandı ({page_num} sayfa tarandı).")
+        logger.info("[✓] Toplam %s benzersiz dizi linki toplandı (%s sayfa tarandı).", len(all_series_links), page_num)
         return all_series_links
 
 async def get_series_metadata(session, series_url):
     """Dizi meta verilerini alır"""
     content = await fetch_page(session, series_url)
     if not content:
-        return "Bilinmeyen Dizi", ""
+        return UNKNOWN_SERIES, ""
 
     soup = BeautifulSoup(content, 'html.parser')
 
 
     title_element = soup.select_one(".text-bold")
-    title = title_element.get_text(strip=True) if title_element else "Bilinmeyen Dizi"
+    title = title_element.get_text(strip=True) if title_element else UNKNOWN_SERIES
 
 
     logo_url = ""
@@ -453,7 +510,7 @@ async def get_episode_links(session, series_url):
     """Dizi sayfasından bölüm linklerini alır"""
     content = await fetch_page(session, series_url)
     if not content:
-        return []
+        return [], None
 
     soup = BeautifulSoup(content, 'html.parser')
     episode_links = []
@@ -462,7 +519,7 @@ async def get_episode_links(session, series_url):
     season_buttons = soup.select(".season-menu .season-btn")
 
     if season_buttons:
-        logger.info(f"[+] {len(season_buttons)} sezon bulundu.")
+        logger.info("[+] %s sezon bulundu.", len(season_buttons))
 
 
         for button in season_buttons:
@@ -504,7 +561,10 @@ async def get_episode_links(session, series_url):
             "#season1 .uk-width-large-1-5 a"
         ]
 
-        for selector in selectors:
+        # Bölümler farklı işaretleme varyantlarına bölünebildiğinden tüm seçicilerin birleşimi alınır;
+        # sıralama yalnızca istatistik içindir, katkı sağlayan her seçici isabet sayılır
+        for selector in SELECTOR_STATS.order("episodes", selectors):
+            found_before = len(episode_links)
             episode_elements = soup.select(selector)
 
             for ep_element in episode_elements:
@@ -521,17 +581,24 @@ async def get_episode_links(session, series_url):
                         season_num = int(season_match.group(1)) if season_match else 1
                         episode_links.append((full_url, season_num))
 
+            if len(episode_links) > found_before:
+                SELECTOR_STATS.hit("episodes", selector)
+
 
     normalized_episodes = normalize_episode_numbers(episode_links)
+    fingerprint = series_fingerprint(
+        [button.get_text(strip=True) for button in season_buttons],
+        [episode_url for episode_url, _ in episode_links]
+    )
 
-    logger.info(f"[+] Toplam {len(normalized_episodes)} bölüm bulundu ve normalize edildi.")
-    return normalized_episodes
+    logger.info("[+] Toplam %s bölüm bulundu ve normalize edildi.", len(normalized_episodes))
+    return normalized_episodes, fingerprint
 
 async def extract_m3u8_from_episode(session, episode_url, season_num, episode_num):
     """Bölüm sayfasından m3u8 linkini çıkarır - YENİ SİSTEM (Gujan + Playhouse + Proxy)"""
     content = await fetch_page(session, episode_url)
     if not content:
-        return None, None, None
+        return None, None, None, NO_PAGE
 
     soup = BeautifulSoup(content, 'html.parser')
 
@@ -539,9 +606,13 @@ async def extract_m3u8_from_episode(session, episode_url, season_num, episode_nu
     title_element = soup.select_one("title")
     episode_name = title_element.get_text(strip=True) if title_element else "Bilinmeyen Bölüm"
 
-    logger.info(f"[*] İşleniyor: Sezon {season_num}, Bölüm {episode_num}")
+    logger.debug("[*] İşleniyor: Sezon %s, Bölüm %s", season_num, episode_num)
 
     m3u8_url = None
+    iframe_found = False
+    file_id = None
+    resolver = None
+    probe_failed = False
 
     try:
 
@@ -551,20 +622,24 @@ async def extract_m3u8_from_episode(session, episode_url, season_num, episode_nu
             'iframe[src*="gujan.premiumvideo.click"]'
         ]
 
-        for selector in gujan_iframe_selectors:
+        for selector in SELECTOR_STATS.order("gujan_iframe", gujan_iframe_selectors):
             iframe_element = soup.select_one(selector)
             if iframe_element:
                 src = iframe_element.get("src")
                 if src and "gujan.premiumvideo.click" in src:
-                    logger.info(f"[+] Gujan iframe bulundu: {src}")
-                    m3u8_url = await extract_gujan_m3u8(session, src)
+                    iframe_found = True
+                    logger.debug("[+] Gujan iframe bulundu: %s", src)
+                    with TIMINGS.stage(GUJAN, src):
+                        m3u8_url = await extract_gujan_m3u8(session, src)
                     if m3u8_url:
-                        logger.info(f"[✅] Gujan'dan M3U8 başarıyla alındı!")
+                        logger.debug("[✅] Gujan'dan M3U8 başarıyla alındı!")
+                        resolver = GUJAN
+                        SELECTOR_STATS.hit("gujan_iframe", selector)
                         break
 
 
         if not m3u8_url:
-            logger.info("[*] Gujan bulunamadı, Playhouse sistemi deneniyor...")
+            logger.debug("[*] Gujan bulunamadı, Playhouse sistemi deneniyor...")
 
 
             iframe_selectors = [
@@ -574,10 +649,9 @@ async def extract_m3u8_from_episode(session, episode_url, season_num, episode_nu
             ]
 
             playhouse_url = None
-            file_id = None
 
 
-            for selector in iframe_selectors:
+            for selector in SELECTOR_STATS.order("playhouse_iframe", iframe_selectors):
                 iframe_element = soup.select_one(selector)
                 if iframe_element:
                     src = iframe_element.get("src")
@@ -585,7 +659,8 @@ async def extract_m3u8_from_episode(session, episode_url, season_num, episode_nu
                         if src.startswith("//"):
                             src = "https:" + src
                         playhouse_url = src
-                        logger.info(f"[+] Playhouse iframe bulundu: {playhouse_url}")
+                        logger.debug("[+] Playhouse iframe bulundu: %s", playhouse_url)
+                        SELECTOR_STATS.hit("playhouse_iframe", selector)
                         break
 
 
@@ -598,7 +673,7 @@ async def extract_m3u8_from_episode(session, episode_url, season_num, episode_nu
                     hex_matches = hex_pattern.findall(script_content)
 
                     if hex_matches:
-                        logger.info(f"[+] Script içinde {len(hex_matches)} hex URL bulundu.")
+                        logger.debug("[+] Script içinde %s hex URL bulundu.", len(hex_matches))
                         for hex_value in hex_matches:
                             try:
                                 decoded_url = bytes.fromhex(hex_value).decode('utf-8')
@@ -606,27 +681,33 @@ async def extract_m3u8_from_episode(session, episode_url, season_num, episode_nu
                                     playhouse_url = decoded_url
                                     if playhouse_url.startswith("//"):
                                         playhouse_url = "https:" + playhouse_url
-                                    logger.info(f"[+] Hex'ten çözülen playhouse URL: {playhouse_url}")
+                                    logger.debug("[+] Hex'ten çözülen playhouse URL: %s", playhouse_url)
                                     break
                             except Exception as e:
-                                logger.error(f"[!] Hex çözme hatası: {e}")
+                                logger.error("[!] Hex çözme hatası: %s", e)
 
                         if playhouse_url:
                             break
 
 
             if playhouse_url:
+                iframe_found = True
                 playhouse_match = re.search(r'playhouse\.premiumvideo\.click/player/([a-zA-Z0-9]+)', playhouse_url)
                 if playhouse_match:
                     file_id = playhouse_match.group(1)
-                    logger.info(f"[+] Playhouse File ID bulundu: {file_id}")
+                    logger.debug("[+] Playhouse File ID bulundu: %s", file_id)
 
-                    working_domain, m3u8_url = await get_correct_domain_from_playhouse(session, file_id)
-                    logger.info(f"[+] Bulunan domain: {working_domain}, M3U8: {m3u8_url}")
+                    # Süre, yönlendirilen CDN domainine yazılır
+                    with TIMINGS.stage(PLAYHOUSE, playhouse_url) as span:
+                        working_domain, m3u8_url = await get_correct_domain_from_playhouse(session, file_id)
+                        span.url = m3u8_url
+                    resolver = PLAYHOUSE
+                    probe_failed = working_domain is None
+                    logger.debug("[+] Bulunan domain: %s, M3U8: %s", working_domain, m3u8_url)
 
 
             if not m3u8_url:
-                logger.info("[*] Playhouse bulunamadı, eski sistem ile deneniyor...")
+                logger.debug("[*] Playhouse bulunamadı, eski sistem ile deneniyor...")
 
                 iframe_selectors_fallback = [
                     "iframe#londonIframe",
@@ -636,7 +717,7 @@ async def extract_m3u8_from_episode(session, episode_url, season_num, episode_nu
                     "iframe"
                 ]
 
-                for selector in iframe_selectors_fallback:
+                for selector in SELECTOR_STATS.order("iframe_fallback", iframe_selectors_fallback):
                     iframe_element = soup.select_one(selector)
                     if iframe_element:
                         src = iframe_element.get("src")
@@ -644,93 +725,284 @@ async def extract_m3u8_from_episode(session, episode_url, season_num, episode_nu
                             src = iframe_element.get("data-src")
 
                         if src and src != "about:blank":
+                            iframe_found = True
                             iframe_url = fix_url(src)
-                            logger.info(f"[+] Fallback iframe URL: {iframe_url}")
+                            logger.debug("[+] Fallback iframe URL: %s", iframe_url)
 
 
                             premium_video_match = re.search(r'premiumvideo\.click/player\.php\?file_id=([a-zA-Z0-9]+)', iframe_url)
                             if premium_video_match:
                                 file_id = premium_video_match.group(1)
-                                logger.info(f"[+] Fallback File ID: {file_id}")
-
-                                working_domain, m3u8_url = await find_working_domain_fallback(session, file_id)
+                                logger.debug("[+] Fallback File ID: %s", file_id)
+                                SELECTOR_STATS.hit("iframe_fallback", selector)
+
+                                with TIMINGS.stage(FALLBACK, iframe_url) as span:
+                                    working_domain, m3u8_url = await find_working_domain_fallback(session, file_id)
+                                    span.url = m3u8_url
+                                resolver = FALLBACK
+                                probe_failed = working_domain is None
                                 break
 
     except Exception as e:
-        logger.error(f"[!] Bölüm işleme genel hatası: {e}")
-        return episode_name, episode_num, None
-
-
-    if m3u8_url:
-        m3u8_url = create_proxy_url(m3u8_url)
-
-    return episode_name, episode_num, m3u8_url
-
-async def process_series(all_series_links, output_filename="Amazon Prime.m3u"):
-    """Tüm dizileri tek bir dosyaya yazar"""
-    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=10)) as session:
-        with open(output_filename, "w", encoding="utf-8") as f:
-            f.write("#EXTM3U\n")
-
-            for series_url in all_series_links:
-                try:
-                    title, logo_url = await get_series_metadata(session, series_url)
-                    logger.info(f"\n[+] İşleniyor: {title}")
-
-                    normalized_episodes = await get_episode_links(session, series_url)
+        logger.error("[!] Bölüm işleme genel hatası: %s", e)
+        METRICS.resolved(None)
+        return episode_name, episode_num, None, ERROR
+
+    METRICS.resolved(resolver if m3u8_url and not probe_failed else None)
+    if not m3u8_url:
+        return episode_name, episode_num, None, failure_reason(iframe_found, file_id)
+    if probe_failed:
+        # Default d2 yazılır ama bölüm bekleme süresine alınır; domain testleri her çalıştırmada tekrarlanmaz
+        return episode_name, episode_num, m3u8_url, PROBE_FAILED
+
+    return episode_name, episode_num, m3u8_url, None
+
+def format_episode_lines(title, logo_url, season_num, episode_num, m3u8_url):
+    """Bölüm için #EXTINF ve proxy URL satırlarını üretir"""
+    display_name = f"{title} Sezon {season_num} Bölüm {episode_num}"
+    tvg_id = sanitize_id(f"{title}_{season_num}_{episode_num}")
+    return [
+        f'#EXTINF:-1 tvg-name="{display_name}" '
+        f'tvg-language="Turkish" tvg-country="TR" '
+        f'tvg-id="{tvg_id}" '
+        f'tvg-logo="{logo_url}" '
+        f'group-title="{title}",{display_name}\n',
+        create_proxy_url(m3u8_url.strip()) + "\n"
+    ]
 
-                    semaphore = asyncio.Semaphore(5)
+def stored_series_lines(series_url):
+    """Dizinin kayıtlı bölüm listesi ve çözüm önbelleğinden ağa çıkmadan satırları üretir (kaydı yoksa None)"""
+    known = SERIES_STATE.get(series_url)
+    if not known or "episodes" not in known:
+        return None
 
-                    async def process_episode(ep_url, season_num, episode_num):
-                        async with semaphore:
-                            return await extract_m3u8_from_episode(session, ep_url, season_num, episode_num)
+    lines = []
+    for _, season_num, episode_num in known["episodes"]:
+        entry = RESOLUTION_CACHE.get(episode_key(known["title"], season_num, episode_num))
+        if entry:
+            lines.extend(format_episode_lines(known["title"], known["logo"], season_num, episode_num, entry["url"]))
+    return lines
+
+async def process_single_series(session, series_url):
+    """Tek bir dizinin playlist satırlarını üretir; (satırlar, ağdan yenilendi mi) döndürür"""
+    # Katmanına göre zamanı gelmemiş ya da bütçe dolduğu için ertelenen dizinin sayfası hiç istenmez, kayıtlı bölümler yazılır
+    due = SERIES_STATE.is_due(series_url)
+    if due and BUDGET.exhausted():
+        BUDGET.defer(series_url)
+        due = False
+
+    if not due:
+        logger.info("\n[*] Zamanı gelmedi ya da ertelendi, kayıtlı bölümler kullanılıyor: %s", series_url)
+        return stored_series_lines(series_url), False
+
+    with TIMINGS.stage(METADATA, series_url):
+        title, logo_url = await get_series_metadata(session, series_url)
+    known = SERIES_STATE.get(series_url) or {}
+    if title == UNKNOWN_SERIES and known.get("title"):
+        title, logo_url = known["title"], logo_url or known.get("logo", "")
+    # Başlığı bilinmeyen dizilerin bölümleri aynı önbellek anahtarına düşüp birbirinin
+    # yayınını almasın diye önbellek (ve son doğrulanmış girdi) kullanılmaz
+    use_cache = title != UNKNOWN_SERIES
+    logger.info("\n[+] İşleniyor: %s", title)
+
+    with TIMINGS.stage(EPISODES, series_url):
+        normalized_episodes, fingerprint = await get_episode_links(session, series_url)
+
+    if fingerprint is None:
+        # Sayfa alınamadıysa dizi playlist'ten düşmez ve tamamlandı sayılmaz; kayıtlı bölümler yazılır
+        logger.warning("[!] Dizi sayfası alınamadı, kayıtlı bölümler kullanılıyor: %s", series_url)
+        return stored_series_lines(series_url), False
+
+    # Sayfa değişmediyse önbellekteki bölümler yeniden çözülmez; değiştiyse
+    # yalnızca en yeni ve henüz donmamış sezonlar yeniden çözülür
+    cached = {}
+    if use_cache:
+        unchanged = SERIES_STATE.is_unchanged(series_url, fingerprint)
+        refresh_seasons, reverify_seasons = SERIES_STATE.plan_seasons(series_url, normalized_episodes, STATE.run_no)
+        resolve_seasons = reverify_seasons if unchanged else refresh_seasons | reverify_seasons
+
+        for ep_url, season_num, episode_num in normalized_episodes:
+            if season_num in resolve_seasons:
+                continue
+            entry = RESOLUTION_CACHE.get(episode_key(title, season_num, episode_num))
+            if entry:
+                cached[ep_url] = entry["url"]
+
+    # Daha önce çözülemeyen bölüm bekleme süresi dolana kadar hiç istenmez; en yeni
+    # bölümler önce çözülür, bütçe biterse eskiler önbellekten yazılır
+    waiting = {}
+    pending = []
+    for episode in normalized_episodes:
+        if episode[0] in cached:
+            continue
+        reason = NEGATIVE_CACHE.pending_reason(episode[0])
+        if reason:
+            waiting[episode[0]] = reason
+        else:
+            pending.append(episode)
+    pending.sort(key=lambda episode: (-episode[1], -episode[2]))
+    SERIES_STATE.count(skipped=known.get("fingerprint") == fingerprint)
+    if cached:
+        logger.info("[*] %s bölüm önbellekten, %s bölüm çözülecek.", len(cached), len(pending))
+
+    semaphore = asyncio.Semaphore(5)
+
+    async def process_episode(ep_url, season_num, episode_num):
+        async with semaphore:
+            if BUDGET.exhausted():
+                BUDGET.defer_episode()
+                return None
+            with TRACER.span("episode", ep_url, season=season_num, episode=episode_num):
+                result = await extract_m3u8_from_episode(session, ep_url, season_num, episode_num)
+            NEGATIVE_CACHE.record(ep_url, result[3], result[2])
+            return result
+
+    tasks = [process_episode(ep_url, season_num, episode_num) for ep_url, season_num, episode_num in pending]
+    results = dict(zip([episode[0] for episode in pending], await asyncio.gather(*tasks, return_exceptions=True)))
+    results.update((ep_url, (None, None, None, reason)) for ep_url, reason in waiting.items())
+
+    lines = []
+    for ep_url, season_num, normalized_episode_num in normalized_episodes:
+        if ep_url in cached:
+            m3u8_url = cached[ep_url]
+        elif ep_url not in results:
+            continue
+        elif results[ep_url] is None:
+            entry = use_cache and RESOLUTION_CACHE.get(episode_key(title, season_num, normalized_episode_num))
+            if not entry:
+                continue
+            m3u8_url = entry["url"]
+        else:
+            result = results[ep_url]
+            key = episode_key(title, season_num, normalized_episode_num)
+            if isinstance(result, Exception):
+                logger.error("[!] Bölüm işleme hatası: %s", result)
+                m3u8_url, failure = None, ERROR
+            else:
+                episode_name, episode_num, m3u8_url, failure = result
+
+            if failure:
+                logger.warning("[!] m3u8 URL bulunamadı (%s): %s", failure, ep_url)
+                # Geçici hatada bölüm düşmez; son doğrulanmış girdi (çok eski değilse) yazılır.
+                # Domain doğrulanamadıysa default d2 adresi önbelleğe girmez, yalnızca doğrulanmış girdi yoksa yazılır
+                m3u8_url = (use_cache and CARRY_FORWARD.url(RESOLUTION_CACHE, key, failure)) or m3u8_url or NEGATIVE_CACHE.fallback(ep_url)
+                if not m3u8_url:
+                    continue
+            elif use_cache:
+                RESOLUTION_CACHE.put(key, m3u8_url.strip(), logo_url)
 
-                    tasks = [process_episode(ep_url, season_num, episode_num) for ep_url, season_num, episode_num in normalized_episodes]
-                    results = await asyncio.gather(*tasks, return_exceptions=True)
+        lines.extend(format_episode_lines(title, logo_url, season_num, normalized_episode_num, m3u8_url))
+        logger.info("[✓] %s Sezon %s Bölüm %s eklendi.", title, season_num, normalized_episode_num, extra={"event": "entry_added"})
 
-                    for i, result in enumerate(results):
-                        if isinstance(result, Exception):
-                            logger.error(f"[!] Bölüm işleme hatası: {result}")
-                            continue
+    if use_cache:
+        SERIES_STATE.update(series_url, fingerprint, title, logo_url, normalized_episodes)
 
-                        episode_name, episode_num, m3u8_url = result
-                        if not m3u8_url:
-                            logger.warning(f"[!] m3u8 URL bulunamadı: {normalized_episodes[i][0]}")
-                            continue
+    return lines, True
 
-                        season_num = normalized_episodes[i][1]
-                        normalized_episode_num = normalized_episodes[i][2]
-                        display_name = f"{title} Sezon {season_num} Bölüm {normalized_episode_num}"
-                        tvg_id = sanitize_id(f"{title}_{season_num}_{normalized_episode_num}")
+async def process_series(all_series_links, output_filename="Amazon Prime.m3u"):
+    """Tüm dizileri tek bir dosyaya yazar"""
+    STATE.set_listing(all_series_links)
 
-                        f.write(
-                            f'#EXTINF:-1 tvg-name="{display_name}" '
-                            f'tvg-language="Turkish" tvg-country="TR" '
-                            f'tvg-id="{tvg_id}" '
-                            f'tvg-logo="{logo_url}" '
-                            f'group-title="{title}",{display_name}\n'
-                        )
-                        f.write(m3u8_url.strip() + "\n")
-                        logger.info(f"[✓] {display_name} eklendi.")
+    # Bütçe kısıtlıyken en değerli işler (yeni, geciken, sık değişen diziler) önce yapılır;
+    # aksi halde liste sırasıyla işlenir ve playlist işlendikçe akıtılır
+    if BUDGET.limited:
+        order = SERIES_STATE.prioritize(all_series_links)
+        max_buffered = None
+    else:
+        order = all_series_links
+        max_buffered = REORDER_LIMIT
+
+    # Playlist, işleme sırasından bağımsız olarak sitedeki liste sırasıyla yazılır; önceki
+    # (yarıda kalan) çalıştırmada tamamlanan diziler günlükten, işlenemeyenler kayıtlı girdilerden gelir
+    writer = PlaylistWriter(
+        output_filename,
+        all_series_links,
+        fill=stored_series_lines,
+        lookup=JOURNAL.completed.get,
+        max_buffered=max_buffered,
+        previous_path=playlist_path(PLATFORM),
+        platform=PLATFORM,
+    ).open()
+    try:
+        async with client_session(limit=10) as session:
+            for series_url in order:
+                if series_url in JOURNAL.completed:
+                    continue
 
+                try:
+                    with TRACER.span("series", series_url):
+                        lines, refreshed = await process_single_series(session, series_url)
                 except Exception as e:
-                    logger.error(f"[!] Dizi işleme hatası: {e}")
+                    logger.error("[!] Dizi işleme hatası: %s", e)
+                    with TIMINGS.stage(WRITE):
+                        writer.add(series_url, stored_series_lines(series_url))
                     continue
 
-    logger.info(f"\n[✓] {output_filename} dosyası oluşturuldu.")
-
-async def main():
+                with TIMINGS.stage(WRITE):
+                    writer.add(series_url, lines)
+                if refreshed:
+                    JOURNAL.record(series_url, lines)
+    finally:
+        # Kesilse bile geçici dosya tamamlanıp atomik olarak yerine taşınır
+        with TIMINGS.stage(WRITE):
+            writer.close()
+        METRICS.playlist(output_filename, writer.entries)
+
+def parse_args(argv=None):
+    return build_parser("Dizi listesini tarayıp M3U playlist'i oluşturur").parse_args(argv)
+
+async def main(args=None):
+    args = args or parse_args([])
+    setup_logging(args.log_level, args.log_format, args.log_samples, PLATFORM)
     start_time = time.time()
 
-    series_urls = await get_series_from_homepage()
-    if not series_urls:
-        logger.error("[!] Dizi listesi boş, seçicileri kontrol et.")
-        return
+    SHUTDOWN.install(args.shutdown_grace)
+    BUDGET.configure(args.deadline, args.request_budget)
+    PROXY.configure(args.proxy_template, args.proxy_hosts)
+    CARRY_FORWARD.configure(args.carry_max_age)
+    METRICS.configure(args.metrics_dir)
+    TRACER.configure(args.trace)
+    PROFILER.configure(args.profile, args.profile_dir)
+    LOOP_MONITOR.configure(args.loop_lag)
+    STATE.begin_run()
+    JOURNAL.open(resume=args.resume)
+    seed_if_empty(RESOLUTION_CACHE, PLATFORM)
+    PROFILER.start()
+    LOOP_MONITOR.start()
 
-    await process_series(series_urls)
+    try:
+        series_urls = await get_series_from_homepage()
+        PROFILER.checkpoint("listing")
+        if not series_urls:
+            logger.error("[!] Dizi listesi boş, seçicileri kontrol et.")
+            return SHUTDOWN.exit_code
+
+        await process_series(series_urls)
+        PROFILER.checkpoint("process")
+
+        # Kesilen çalıştırmanın günlüğü sonraki --resume için saklanır
+        if not SHUTDOWN.requested:
+            JOURNAL.finish()
+    except asyncio.CancelledError:
+        logger.warning("[!] Çalıştırma kesildi; tamamlanan sonuçlar yazıldı.")
+    finally:
+        PROFILER.stop()
+        LOOP_MONITOR.stop()
+        SERIES_STATE.report(PLATFORM)
+        BUDGET.report(PLATFORM)
+        CARRY_FORWARD.report(PLATFORM)
+        NEGATIVE_CACHE.report(PLATFORM)
+        TIMINGS.report(PLATFORM)
+        SELECTOR_STATS.summary()
+        STATE.save()
+        METRICS.cache("resolution", RESOLUTION_CACHE.hits, RESOLUTION_CACHE.misses)
+        METRICS.cache("series", SERIES_STATE.skipped, SERIES_STATE.checked - SERIES_STATE.skipped)
+        METRICS.write(TRAFFIC, TIMINGS, time.time() - start_time)
+        TRACER.write(PLATFORM)
 
     end_time = time.time()
-    logger.info(f"\n[✓] Tüm işlemler tamamlandı. Süre: {end_time - start_time:.2f} saniye")
+    logger.info("\n[✓] Tüm işlemler tamamlandı. Süre: %.2f saniye", end_time - start_time)
+    return SHUTDOWN.exit_code
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    sys.exit(asyncio.run(main(parse_args())))
\ No newline at end of file
@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# "python -m m3u.bench" ile çalıştırıldığında betiklerin düz importları (from state import ...) çalışsın
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from platforms import PLAYLISTS
+from replay import ArchiveSite, ReplayServer, add_server_arguments
+from synthetic import SyntheticSite, parse_mix, parse_range
+from transport import HOST_MAP_ENV, RECORD_ENV
+
+
+logger = logging.getLogger(__name__)
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Metrik -> büyümesi kötü mü (True) yoksa iyi mi (False)
+METRICS = {
+    "wall_s": True,
+    "requests": True,
+    "rps": False,
+    "requests_per_entry": True,
+    "entries": False,
+    "bytes": True,
+    "peak_rss_mb": True,
+    "cpu_s": True,
+}
+DEFAULT_THRESHOLD = 0.10
+
+
+class ServerThread:
+    """Replay/sentetik sunucuyu ayrı bir thread'deki event loop'ta çalıştırır"""
+
+    def __init__(self, server):
+        self.server = server
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._ready = threading.Event()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.server.start(port=0))
+        self._ready.set()
+        self.loop.run_forever()
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait()
+        return self.server.host_map()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+def count_entries(path):
+    if not os.path.exists(path):
+        return 0
+    with open(path, "r", encoding="utf-8") as f:
+        return sum(1 for line in f if line.startswith("#EXTINF"))
+
+
+def run_platform(platform, host_map, workdir, server):
+    """Platform betiğini ayrı süreçte yerel sunucuya karşı çalıştırır ve ölçümleri döndürür
+
+    Durum ve playlist'ler platformun çalışma dizininde tutulur; aynı dizinle tekrar
+    çalıştırmak sıcak (önbellekli) çalıştırmayı ölçer.
+    """
+    cwd = os.path.join(workdir, platform)
+    os.makedirs(cwd, exist_ok=True)
+    env = dict(os.environ)
+    env.pop(RECORD_ENV, None)
+    env.update({
+        HOST_MAP_ENV: host_map,
+        "M3U_STATE_DIR": os.path.join(cwd, "durum"),
+        "M3U_PLAYLIST_DIR": cwd,
+    })
+
+    before = server.stats()
+    start = time.perf_counter()
+    with open(os.path.join(cwd, "run.log"), "w", encoding="utf-8") as log:
+        process = subprocess.Popen([sys.executable, os.path.join(SCRIPT_DIR, f"{platform}.py")], cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+        # wait4, yalnızca bu sürecin kaynak kullanımını (tepe RSS, CPU) verir
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+    wall = time.perf_counter() - start
+    after = server.stats()
+
+    requests = after["requests"] - before["requests"]
+    entries = count_entries(os.path.join(cwd, PLAYLISTS[platform]))
+    return {
+        "wall_s": round(wall, 3),
+        "requests": requests,
+        "rps": round(requests / wall, 1) if wall else 0.0,
+        "requests_per_entry": round(requests / entries, 3) if entries else None,
+        "entries": entries,
+        "bytes": after["bytes"] - before["bytes"],
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+        "cpu_s": round(usage.ru_utime + usage.ru_stime, 3),
+        "missing": after["missing"] - before["missing"],
+        "injected_errors": after["errors"] - before["errors"],
+        "exit_code": process.returncode,
+    }
+
+
+def format_table(results):
+    header = f"{'çalıştırma':<22}{'süre':>9}{'istek':>8}{'istek/s':>9}{'istek/girdi':>12}{'girdi':>8}{'MB':>8}{'RSS MB':>8}{'CPU s':>8}"
+    lines = [header, "-" * len(header)]
+    for name, result in results.items():
+        per_entry = result["requests_per_entry"]
+        lines.append(
+            f"{name:<22}{result['wall_s']:>9.2f}{result['requests']:>8}{result['rps']:>9.1f}"
+            f"{per_entry if per_entry is not None else '-':>12}{result['entries']:>8}"
+            f"{result['bytes'] / 1e6:>8.2f}{result['peak_rss_mb']:>8.1f}{result['cpu_s']:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def build_site(args):
+    if args.archive:
+        return ArchiveSite(args.archive), {"archive": os.path.abspath(args.archive)}
+    source = {
+        "synthetic": {
+            "series": args.series,
+            "movies": args.movies,
+            "seasons": list(args.seasons),
+            "episodes": list(args.episodes),
+            "page_size": args.page_size,
+            "player_mix": args.player_mix,
+            "seed": args.seed or 0,
+        }
+    }
+    site = SyntheticSite(args.series, args.movies, args.seasons, args.episodes, args.page_size, args.player_mix, args.seed or 0)
+    return site, source
+
+
+def run(args):
+    site, source = build_site(args)
+    server = ReplayServer(site, args.latency, args.jitter, args.error_rate, args.seed)
+    thread = ServerThread(server)
+    host_map = thread.start()
+    workdir = args.workdir or tempfile.mkdtemp(prefix="m3u-bench-")
+    logger.info("[+] Sunucu %s, çalışma dizini %s", host_map, workdir)
+
+    results = {}
+    try:
+        for platform in args.platforms or PLAYLISTS:
+            for run_no in range(1, args.runs + 1):
+                name = f"{platform}/{run_no}"
+                results[name] = run_platform(platform, host_map, workdir, server)
+                logger.info("[✓] %s: %s", name, results[name])
+    finally:
+        thread.stop()
+
+    report = {
+        "created_at": int(time.time()),
+        "python": sys.version.split()[0],
+        "source": source,
+        "server": {"latency": args.latency, "jitter": args.jitter, "error_rate": args.error_rate},
+        "runs": args.runs,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    print(format_table(results))
+    logger.info("[✓] Sonuçlar kaydedildi: %s", args.output)
+    return 0
+
+
+def compare_results(old, new, threshold=DEFAULT_THRESHOLD, metrics=METRICS):
+    """İki sonuç dosyasını karşılaştırır; (satırlar, gerileme listesi) döndürür"""
+    lines = []
+    regressions = []
+    for name in new["results"]:
+        if name not in old["results"]:
+            continue
+        before, after = old["results"][name], new["results"][name]
+        for metric, higher_is_worse in metrics.items():
+            a, b = before.get(metric), after.get(metric)
+            if not a or b is None:
+                continue
+            change = (b - a) / a
+            worse = change > threshold if higher_is_worse else change < -threshold
+            flag = "GERİLEME" if worse else ""
+            lines.append(f"{name:<22}{metric:<20}{a:>12}{b:>12}{change:>+9.1%}  {flag}")
+            if worse:
+                regressions.append((name, metric, change))
+    return lines, regressions
+
+
+def compare(args):
+    with open(args.old, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    if old.get("source") != new.get("source"):
+        logger.warning("[!] Sonuçlar farklı site/arşiv ile alınmış, karşılaştırma yanıltıcı olabilir.")
+
+    lines, regressions = compare_results(old, new, args.threshold)
+    print(f"{'çalıştırma':<22}{'metrik':<20}{'önce':>12}{'sonra':>12}{'değişim':>9}")
+    print("\n".join(lines))
+    if regressions:
+        logger.warning("[!] %%%g eşiğini aşan %s gerileme var.", args.threshold * 100, len(regressions))
+        return 1
+    logger.info("[✓] Eşiği aşan gerileme yok.")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m m3u.bench", description="Platform taramalarını yerel replay/sentetik sunucuya karşı ölçer")
+    commands = parser.add_subparsers(dest="command")
+
+    run_parser = commands.add_parser("run", help="Benchmark'ı çalıştır (varsayılan)")
+    run_parser.add_argument("platforms", nargs="*", help="Platform adları (boşsa hepsi)")
+    run_parser.add_argument("--archive", help="Sentetik site yerine sunulacak fixture arşivi (.jsonl.gz)")
+    run_parser.add_argument("--series", type=int, default=200, help="Sentetik sitede platform başına dizi sayısı (varsayılan 200)")
+    run_parser.add_argument("--movies", type=int, default=500, help="Sentetik sitede film sayısı (varsayılan 500)")
+    run_parser.add_argument("--seasons", type=parse_range, default=(1, 6), help="Dizi başına sezon aralığı (varsayılan 1-6)")
+    run_parser.add_argument("--episodes", type=parse_range, default=(4, 16), help="Sezon başına bölüm aralığı (varsayılan 4-16)")
+    run_parser.add_argument("--page-size", type=int, default=24, help="Liste sayfası başına öğe (varsayılan 24)")
+    run_parser.add_argument("--player-mix", type=parse_mix, help="Oynatıcı türü oranları (bkz. synthetic.py)")
+    run_parser.add_argument("--runs", type=int, default=1, help="Platform başına ardışık çalıştırma (2. ve sonrası sıcak önbellekle)")
+    run_parser.add_argument("--workdir", help="Durum/playlist/log dizini (varsayılan geçici dizin)")
+    run_parser.add_argument("--output", default="bench.json", help="Sonuç dosyası (varsayılan bench.json)")
+    add_server_arguments(run_parser)
+    run_parser.set_defaults(port=0)
+
+    compare_parser = commands.add_parser("compare", help="İki sonuç dosyasını karşılaştır, gerilemeleri işaretle")
+    compare_parser.add_argument("old", help="Önceki sonuç dosyası")
+    compare_parser.add_argument("new", help="Yeni sonuç dosyası")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Gerileme eşiği (varsayılan 0.10 = %%10)")
+    return parser
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in ("run", "compare", "-h", "--help"):
+        argv.insert(0, "run")
+    args = build_parser().parse_args(argv)
+    return compare(args) if args.command == "compare" else run(args)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import argparse
+import logging
+import re
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+DURATION_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)\s*(ms|[smhd]?)$')
+DURATION_UNITS = {"": 1, "ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_duration(text):
+    """'90', '250ms', '45m', '5.5h', '14d' gibi süreleri saniyeye çevirir (argparse type olarak kullanılır)"""
+    match = DURATION_PATTERN.match(text.strip().lower())
+    if not match:
+        raise argparse.ArgumentTypeError(f"Geçersiz süre: {text} (örnek: 3600, 90m, 5h, 14d)")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+
+class RunBudget:
+    """Çalıştırmanın süre ve istek bütçesini izler; bütçe dolunca ertelenen işleri kaydeder"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.deadline = None
+        self.request_budget = None
+        self.requests = 0
+        self.deferred = []
+        self.deferred_episodes = 0
+        self.stopped = False
+        self._announced = False
+
+    def configure(self, deadline=None, request_budget=None):
+        """Süre (saniye, başlangıçtan itibaren) ve istek sınırını ayarlar"""
+        self.started = time.monotonic()
+        self.deadline = self.started + deadline if deadline else None
+        self.request_budget = request_budget
+
+    @property
+    def limited(self):
+        """Süre ya da istek sınırı verildiyse True"""
+        return self.deadline is not None or self.request_budget is not None
+
+    def spend(self, count=1):
+        """Yapılan HTTP isteğini sayar"""
+        self.requests += count
+
+    def stop(self):
+        """Bütçeyi hemen kapatır (örn. kapanma sinyali geldiğinde)"""
+        self.stopped = True
+
+    def exhausted(self):
+        """Süre ya da istek bütçesi dolduysa (veya durdurulduysa) True; yeni iş başlatılmamalı"""
+        if self.stopped:
+            return True
+        over_time = self.deadline is not None and time.monotonic() >= self.deadline
+        over_requests = self.request_budget is not None and self.requests >= self.request_budget
+        if (over_time or over_requests) and not self._announced:
+            self._announced = True
+            reason = "Süre" if over_time else "İstek"
+            logger.warning("[!] %s bütçesi doldu (%s istek), kalan işler erteleniyor.", reason, self.requests)
+        return over_time or over_requests
+
+    def defer(self, key):
+        """Bütçe yüzünden bu çalıştırmada yapılmayan işi kaydeder"""
+        self.deferred.append(key)
+
+    def defer_episode(self):
+        self.deferred_episodes += 1
+
+    def report(self, platform):
+        """Harcanan bütçeyi ve ertelenen işleri loglar"""
+        elapsed = time.monotonic() - self.started
+        logger.info("[✓] %s bütçe: %s istek, %.0f saniye", platform, self.requests, elapsed)
+        if self.deferred or self.deferred_episodes:
+            sample = ", ".join(self.deferred[:10])
+            more = f" (+{len(self.deferred) - 10})" if len(self.deferred) > 10 else ""
+            episodes = f" ve {self.deferred_episodes} bölüm" if self.deferred_episodes else ""
+            logger.warning(
+                "[!] %s: %s iş%s sonraki çalıştırmaya ertelendi%s",
+                platform, len(self.deferred), episodes, ": " + sample + more if sample else "",
+            )
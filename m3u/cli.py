@@ -0,0 +1,78 @@
+import argparse
+
+from budget import parse_duration
+from logsetup import add_logging_arguments
+from loopmonitor import DEFAULT_THRESHOLD, LAG_ENV
+from profiling import PROFILE_MODES
+from proxy import HOSTS_ENV, TEMPLATE_ENV
+
+
+def build_parser(description):
+    """Tüm scraper betiklerinin ortak komut satırı seçenekleri"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Yarıda kalan çalıştırmanın günlüğünden devam et (tamamlanan işleri atla)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=parse_duration,
+        help="Çalıştırma süresi sınırı (örn. 5h, 300m); dolunca kalan işler ertelenir",
+    )
+    parser.add_argument(
+        "--request-budget",
+        type=int,
+        help="En fazla yapılacak HTTP isteği sayısı; dolunca kalan işler ertelenir",
+    )
+    parser.add_argument(
+        "--shutdown-grace",
+        type=parse_duration,
+        default=10.0,
+        help="SIGTERM/SIGINT sonrası devam eden isteklerin tamamlanması için beklenecek süre (varsayılan 10s)",
+    )
+    parser.add_argument(
+        "--carry-max-age",
+        type=parse_duration,
+        help="Geçici hatada korunacak son doğrulanmış girdinin en fazla yaşı (varsayılan 14d)",
+    )
+    parser.add_argument(
+        "--metrics-dir",
+        help="Çalıştırma sonunda <platform>.prom metrik dosyasının yazılacağı dizin (node-exporter textfile collector; varsayılan $M3U_METRICS_DIR)",
+    )
+    parser.add_argument(
+        "--trace",
+        help="İstek span'lerinin Chrome Trace Event JSON olarak yazılacağı dosya (Perfetto/about:tracing; varsayılan $M3U_TRACE)",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        help="Çalıştırmayı profille: cpu (pstats + collapsed yığın), alloc (aşama sınırlarında tracemalloc), asyncio (coroutine başına duvar/CPU süresi)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        help="Profil çıktılarının yazılacağı dizin (varsayılan çalışma dizini)",
+    )
+    parser.add_argument(
+        "--loop-lag",
+        type=parse_duration,
+        help=f"Olay döngüsü bu süreden uzun bloklanırsa çalışan kodun yığınını logla (örn. 250ms; varsayılan ${LAG_ENV} ya da {DEFAULT_THRESHOLD * 1000:.0f}ms, 0 kapatır)",
+    )
+    add_proxy_arguments(parser)
+    add_logging_arguments(parser)
+    return parser
+
+
+def add_proxy_arguments(parser):
+    """Playlist'e yazılan proxy URL'lerinin şablon ve host seçenekleri"""
+    parser.add_argument(
+        "--proxy-template",
+        help=f"Proxy URL şablonu; {{host}}, {{url}}, {{quoted_url}} kullanılabilir (varsayılan ${TEMPLATE_ENV} ya da https://{{host}}/?url={{url}})",
+    )
+    parser.add_argument(
+        "--proxy-host",
+        dest="proxy_hosts",
+        action="append",
+        help=f"Proxy host'u (birden fazla verilebilir, yayınlar sabit özetle dağıtılır; varsayılan ${HOSTS_ENV})",
+    )
+    return parser
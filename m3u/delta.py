@@ -0,0 +1,96 @@
+import json
+import logging
+import os
+import time
+
+from seed import parse_playlist
+from state import STATE_DIR
+
+
+logger = logging.getLogger(__name__)
+
+
+def diff_entries(old_entries, new_entries):
+    """İki playlist girdi listesini tvg-id ve yayın URL'sine göre karşılaştırır
+
+    (tvg-id, URL) çifti aynı kalan girdiler değişmemiş sayılır; kalanlar arasında
+    tvg-id'si eşleşenler "changed", eşleşmeyenler "added"/"removed" olur.
+    """
+    old_pairs = {}
+    for entry in old_entries:
+        old_pairs.setdefault((entry.get("tvg-id", ""), entry["url"]), []).append(entry)
+
+    new_only = []
+    for entry in new_entries:
+        matches = old_pairs.get((entry.get("tvg-id", ""), entry["url"]))
+        if matches:
+            matches.pop()
+        else:
+            new_only.append(entry)
+
+    old_by_id = {}
+    for matches in old_pairs.values():
+        for entry in matches:
+            old_by_id.setdefault(entry.get("tvg-id", ""), []).append(entry)
+
+    added, changed = [], []
+    for entry in new_only:
+        matches = old_by_id.get(entry.get("tvg-id", ""))
+        if matches:
+            old = matches.pop(0)
+            changed.append({
+                "tvg-id": entry.get("tvg-id", ""),
+                "title": entry["title"],
+                "old_url": old["url"],
+                "url": entry["url"],
+            })
+        else:
+            added.append({"tvg-id": entry.get("tvg-id", ""), "title": entry["title"], "url": entry["url"]})
+
+    removed = [
+        {"tvg-id": entry.get("tvg-id", ""), "title": entry["title"], "url": entry["url"]}
+        for matches in old_by_id.values()
+        for entry in matches
+    ]
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def diff_playlists(old_path, new_path):
+    """Önceki playlist dosyası ile yenisi arasındaki farkı döndürür (önceki yoksa hepsi eklenmiş sayılır)"""
+    old_entries = parse_playlist(old_path) if os.path.exists(old_path) else []
+    return diff_entries(old_entries, parse_playlist(new_path))
+
+
+def same_content(old_path, new_path):
+    """İki dosyanın içeriği birebir aynıysa True"""
+    if not os.path.exists(old_path) or os.path.getsize(old_path) != os.path.getsize(new_path):
+        return False
+    with open(old_path, "rb") as old, open(new_path, "rb") as new:
+        return old.read() == new.read()
+
+
+def write_changes(platform, playlist, delta, state_dir=STATE_DIR):
+    """Son çalıştırmanın değişiklik günlüğünü durum/<platform>.changes.json dosyasına yazar
+
+    Kayıtlı fark aynıysa dosyaya dokunulmaz; değişmeyen çalıştırmalar depoda yeni sürüm üretmez.
+    """
+    path = os.path.join(state_dir, f"{platform}.changes.json")
+    os.makedirs(state_dir, exist_ok=True)
+    record = {"platform": platform, "playlist": playlist, "generated_at": int(time.time())}
+    record.update(delta)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = None
+    if previous and dict(previous, generated_at=None) == dict(record, generated_at=None):
+        return path
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+    return path
+
+
+def summary(delta):
+    return f"+{len(delta['added'])} -{len(delta['removed'])} ~{len(delta['changed'])}"
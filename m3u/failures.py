@@ -0,0 +1,148 @@
+import logging
+import time
+
+from refresh import DAY, RUN_INTERVAL, SCHEDULE_SLACK
+
+
+logger = logging.getLogger(__name__)
+
+
+# Bölüm/film çözümünün neden başarısız olduğunu belirten kodlar
+NO_PAGE = "no_page"            # sayfa alınamadı (zaman aşımı, HTTP hatası)
+ERROR = "error"                # işleme sırasında beklenmeyen hata
+NO_IFRAME = "no_iframe"        # sayfada oynatıcı iframe'i yok
+NO_FILE_ID = "no_file_id"      # iframe var ama file_id çıkarılamadı
+PROBE_FAILED = "probe_failed"  # file_id var ama çalışan domain/M3U8 bulunamadı
+
+# Sonraki denemede düzelmesi beklenen (ağ/upstream kaynaklı) hatalar
+TRANSIENT_REASONS = {NO_PAGE, ERROR, PROBE_FAILED}
+# Sayfa alındığı halde çözülemeyen; her çalıştırmada yeniden denenince boşa istek harcatan hatalar
+BACKOFF_REASONS = {NO_IFRAME, NO_FILE_ID, PROBE_FAILED}
+
+# Çözülemeyen girdinin yeniden denenmesi için bekleme: her başarısızlıkta ikiye katlanır
+BACKOFF_BASE = 2 * RUN_INTERVAL
+BACKOFF_MAX = 14 * DAY
+# Bu süredir denenmeyen (artık listede olmayan) kayıtlar silinir
+NEGATIVE_MAX_AGE = 60 * DAY
+
+# Geçici hatada en fazla bu yaştaki son doğrulanmış girdi korunur
+DEFAULT_CARRY_MAX_AGE = 14 * DAY
+
+
+def failure_reason(iframe_found, file_id):
+    """Çözüm zincirinin nerede tıkandığına göre hata kodunu döndürür"""
+    if file_id:
+        return PROBE_FAILED
+    if iframe_found:
+        return NO_FILE_ID
+    return NO_IFRAME
+
+
+class CarryForward:
+    """Geçici hatayla çözülemeyen girdiler için son doğrulanmış URL'yi kullanır ve raporlar
+
+    Böylece bir zaman aşımı yüzünden bölüm playlist'ten düşüp sonraki çalıştırmada geri
+    gelmez. max_age'den eski girdiler taşınmaz; taşınan her girdi raporda listelenir.
+    """
+
+    def __init__(self, max_age=DEFAULT_CARRY_MAX_AGE):
+        self.max_age = max_age
+        self.carried = []
+        self.expired = 0
+
+    def configure(self, max_age=None):
+        if max_age is not None:
+            self.max_age = max_age
+
+    def url(self, cache, key, reason, now=None):
+        """Hata geçiciyse ve kayıt yeterince yeniyse son doğrulanmış URL'yi, değilse None döndürür"""
+        if reason not in TRANSIENT_REASONS:
+            return None
+        entry = cache.get(key)
+        if not entry:
+            return None
+
+        now = now if now is not None else time.time()
+        age = now - entry.get("ts", 0)
+        if age > self.max_age:
+            self.expired += 1
+            return None
+
+        self.carried.append((key, reason, age))
+        return entry["url"]
+
+    def report(self, platform):
+        """Bu çalıştırmada yeniden doğrulanamayıp önceki girdisiyle yazılanları loglar"""
+        if not self.carried and not self.expired:
+            return
+        logger.warning(
+            "[!] %s: %s girdi doğrulanamadı, son doğrulanmış hali kullanıldı (%s girdi %g günden eski olduğu için düşürüldü)",
+            platform, len(self.carried), self.expired, self.max_age / DAY,
+        )
+        for key, reason, age in self.carried:
+            logger.warning("    [taşındı] %s (%s, %.1f gün önce doğrulandı)", key, reason, age / DAY)
+
+
+class NegativeCache:
+    """Çözülemeyen bölüm/film URL'lerini hata koduyla saklar, yeniden denemeyi üstel olarak geciktirir
+
+    Kayıtlar durum dosyasının "failures" bölümünde tutulur: url -> {reason, attempts,
+    failed_at, retry_at} (domain doğrulanamadıysa ayrıca doğrulanmamış "fallback" URL'si).
+    Bekleme süresi dolmamış girdi için hiç istek yapılmaz; başarılı çözümde kayıt silinir.
+    """
+
+    def __init__(self, store, now=None):
+        self.entries = store.section("failures")
+        self.skipped = {}
+        now = int(now if now is not None else time.time())
+        for url in [url for url, entry in self.entries.items() if now - entry["failed_at"] > NEGATIVE_MAX_AGE]:
+            del self.entries[url]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def pending_reason(self, url, now=None):
+        """Girdi bekleme süresindeyse kayıtlı hata kodunu, değilse None döndürür (atlananları sayar)"""
+        entry = self.entries.get(url)
+        if not entry:
+            return None
+        now = now if now is not None else time.time()
+        if now + SCHEDULE_SLACK >= entry["retry_at"]:
+            return None
+        self.skipped[entry["reason"]] = self.skipped.get(entry["reason"], 0) + 1
+        return entry["reason"]
+
+    def fallback(self, url):
+        """Girdi için saklanan doğrulanmamış URL'yi (yoksa None) döndürür"""
+        return self.entries.get(url, {}).get("fallback")
+
+    def record(self, url, reason, fallback=None, now=None):
+        """Deneme sonucunu kaydeder: başarıda kaydı siler, kalıcı hatada beklemeyi ikiye katlar"""
+        if reason is None:
+            self.entries.pop(url, None)
+            return
+        if reason not in BACKOFF_REASONS:
+            return
+
+        now = int(now if now is not None else time.time())
+        attempts = self.entries.get(url, {}).get("attempts", 0) + 1
+        delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+        self.entries[url] = {
+            "reason": reason,
+            "attempts": attempts,
+            "failed_at": now,
+            "retry_at": now + delay,
+        }
+        if fallback:
+            self.entries[url]["fallback"] = fallback
+
+    def report(self, platform):
+        """Bekleme yüzünden denenmeyen girdileri hata koduna göre loglar"""
+        if not self.entries:
+            return
+        skipped = sum(self.skipped.values())
+        reasons = ", ".join(f"{reason} {count}" for reason, count in sorted(self.skipped.items()))
+        logger.info(
+            "[✓] %s çözülemeyenler: %s kayıt, %s tanesi bekleme süresinde olduğu için denenmedi%s",
+            platform, len(self.entries), skipped, " (" + reasons + ")" if reasons else "",
+        )
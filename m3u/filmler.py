@@ -2,6 +2,7 @@ import asyncio
 import aiohttp
 import re
 import os
+import sys
 from itertools import islice
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
@@ -9,13 +10,32 @@ import logging
 from concurrent.futures import ThreadPoolExecutor
 import time
 
+from state import StateStore, platform_name
+from selector_stats import SelectorStats
+from resolution_cache import ResolutionCache
+from seed import seed_if_empty
+from journal import RunJournal
+from cli import build_parser
+from budget import RunBudget
+from shutdown import GracefulShutdown
+from playlist import PlaylistWriter, REORDER_LIMIT
+from proxy import ProxyRewriter
+from transport import TRAFFIC, client_session
+from failures import CarryForward, ERROR, NO_PAGE, NegativeCache, PROBE_FAILED, failure_reason
+from platforms import playlist_path
+from timing import StageTimer, LISTING, METADATA, GUJAN, PLAYHOUSE, FALLBACK, PROXY_URL, WRITE
+from metrics import CrawlMetrics
+from tracing import Tracer
+from logsetup import setup_logging
+from profiling import RunProfiler
+from loopmonitor import LoopMonitor
+
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
 BASE_URL = "https://dizifun5.com"
-PROXY_BASE = "https://3.nejyoner19.workers.dev/?url="  # PROXY ADRESİ DEĞİŞTİRİLDİ
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -25,19 +45,38 @@ HEADERS = {
     "Upgrade-Insecure-Requests": "1",
 }
 
+# Aynı anda işlenen film sayısı
+MOVIE_WORKERS = 5
+
+# Sayfası alınamayan filmin yer tutucu başlığı; saklı meta verinin ve önbellek anahtarının yerine geçmez
+UNKNOWN_MOVIE = "Bilinmeyen Film"
+
+PLATFORM = platform_name(__file__)
+STATE = StateStore(PLATFORM)
+SELECTOR_STATS = SelectorStats(STATE)
+RESOLUTION_CACHE = ResolutionCache(STATE)
+JOURNAL = RunJournal(PLATFORM)
+BUDGET = RunBudget()
+SHUTDOWN = GracefulShutdown(BUDGET)
+PROXY = ProxyRewriter()
+CARRY_FORWARD = CarryForward()
+NEGATIVE_CACHE = NegativeCache(STATE)
+TIMINGS = StageTimer()
+METRICS = CrawlMetrics(PLATFORM)
+TRACER = Tracer()
+PROFILER = RunProfiler(PLATFORM)
+LOOP_MONITOR = LoopMonitor(PLATFORM)
+
 
 def create_proxy_url(original_url):
-    """Orijinal URL'yi proxy üzerinden geçirir"""
+    """Orijinal URL'yi yapılandırılmış proxy üzerinden geçirir (önceden proxy'lenmişse önek yenilenir)"""
     if not original_url:
         return None
     
     
-    if PROXY_BASE in original_url:
-        return original_url
-    
-    
-    proxy_url = f"{PROXY_BASE}{original_url}"  # BASİT BİR ŞEKİLDE DEĞİŞTİRİLDİ
-    logger.info(f"[+] Proxy URL oluşturuldu: {proxy_url}")
+    with TIMINGS.stage(PROXY_URL) as span:
+        proxy_url = span.url = PROXY.rewrite(original_url)
+    logger.debug("[+] Proxy URL oluşturuldu: %s", proxy_url)
     return proxy_url
 
 
@@ -91,28 +130,30 @@ def fix_url(url, base=BASE_URL):
         return urljoin(base, url)
     return url
 
+@TRACER.traced("fetch_page")
 async def fetch_page(session, url, timeout=45):  
     """Async olarak sayfa içeriğini getirir"""
+    BUDGET.spend()
     try:
         async with session.get(url, headers=HEADERS, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
             if response.status == 200:
                 content = await response.text()
                 return content
             else:
-                logger.warning(f"[!] HTTP {response.status} hatası: {url}")
+                logger.warning("[!] HTTP %s hatası: %s", response.status, url)
                 return None
     except asyncio.TimeoutError:
-        logger.error(f"[!] Timeout hatası ({timeout}s): {url}")
+        logger.error("[!] Timeout hatası (%ss): %s", timeout, url)
         return None
     except Exception as e:
-        logger.error(f"[!] Sayfa getirme hatası ({url}): {e}")
+        logger.error("[!] Sayfa getirme hatası (%s): %s", url, e)
         return None
 
 async def extract_gujan_m3u8(session, iframe_url, file_id):
     """Gujan player'dan M3U8 URL'ini çıkarır"""
     try:
         
-        logger.info(f"[*] Gujan player sayfası getiriliyor: {iframe_url}")
+        logger.debug("[*] Gujan player sayfası getiriliyor: %s", iframe_url)
         
         
         if iframe_url.startswith("//"):
@@ -120,7 +161,7 @@ async def extract_gujan_m3u8(session, iframe_url, file_id):
         
         content = await fetch_page(session, iframe_url)
         if not content:
-            logger.warning(f"[!] Gujan player sayfası alınamadı: {iframe_url}")
+            logger.warning("[!] Gujan player sayfası alınamadı: %s", iframe_url)
             return None
         
         
@@ -129,22 +170,24 @@ async def extract_gujan_m3u8(session, iframe_url, file_id):
         
         is_valid = await test_m3u8_url(session, m3u8_url)
         if is_valid:
-            logger.info(f"[✅] Gujan M3U8 URL doğrulandı: {m3u8_url}")
+            logger.debug("[✅] Gujan M3U8 URL doğrulandı: %s", m3u8_url)
             return m3u8_url
         else:
-            logger.warning(f"[⚠️] Gujan M3U8 URL doğrulanamadı: {m3u8_url}")
+            logger.warning("[⚠️] Gujan M3U8 URL doğrulanamadı: %s", m3u8_url)
             return m3u8_url  
     
     except Exception as e:
-        logger.error(f"[!] Gujan M3U8 çıkarma hatası: {e}")
+        logger.error("[!] Gujan M3U8 çıkarma hatası: %s", e)
         return None
 
+@TRACER.traced("playhouse_redirect")
 async def get_correct_domain_from_playhouse(session, file_id, timeout=15):
     """Playhouse URL'ine istek atıp redirect edilen doğru domain'i bulur"""
     playhouse_url = f"https://playhouse.premiumvideo.click/player/{file_id}"
     
     try:
-        logger.info(f"[*] Playhouse URL'ine redirect testi: {playhouse_url}")
+        logger.debug("[*] Playhouse URL'ine redirect testi: %s", playhouse_url)
+        BUDGET.spend()
         
         async with session.get(playhouse_url, 
                               headers=HEADERS, 
@@ -152,53 +195,55 @@ async def get_correct_domain_from_playhouse(session, file_id, timeout=15):
                               allow_redirects=True) as response:
             
             final_url = str(response.url)
-            logger.info(f"[*] Final redirect URL: {final_url}")
+            logger.debug("[*] Final redirect URL: %s", final_url)
             
             domain_match = re.search(r'https://([^.]+)\.premiumvideo\.click', final_url)
             if domain_match:
                 domain = domain_match.group(1)
-                logger.info(f"[✅] Redirect edilen domain bulundu: {domain}")
+                logger.debug("[✅] Redirect edilen domain bulundu: %s", domain)
                 
                 m3u8_url = f"https://{domain}.premiumvideo.click/uploads/encode/{file_id}/master.m3u8"
                 
                 is_valid = await test_m3u8_url(session, m3u8_url)
                 if is_valid:
-                    logger.info(f"[✅] M3U8 URL doğrulandı: {m3u8_url}")
+                    logger.debug("[✅] M3U8 URL doğrulandı: %s", m3u8_url)
                     return domain, m3u8_url
                 else:
-                    logger.warning(f"[⚠️] M3U8 URL doğrulanamadı ama domain bulundu: {domain}")
+                    logger.warning("[⚠️] M3U8 URL doğrulanamadı ama domain bulundu: %s", domain)
                     return domain, m3u8_url
             else:
-                logger.warning(f"[⚠️] Redirect URL'den domain çıkarılamadı: {final_url}")
-                logger.info(f"[*] Fallback: Eski domain test sistemi kullanılıyor")
+                logger.warning("[⚠️] Redirect URL'den domain çıkarılamadı: %s", final_url)
+                logger.debug("[*] Fallback: Eski domain test sistemi kullanılıyor")
                 return await find_working_domain_fallback(session, file_id)
                 
     except asyncio.TimeoutError:
-        logger.warning(f"[⚠️] Playhouse timeout, fallback sistem kullanılıyor")
+        logger.warning("[⚠️] Playhouse timeout, fallback sistem kullanılıyor")
         return await find_working_domain_fallback(session, file_id)
     except Exception as e:
-        logger.warning(f"[⚠️] Playhouse hatası: {e}, fallback sistem kullanılıyor")
+        logger.warning("[⚠️] Playhouse hatası: %s, fallback sistem kullanılıyor", e)
         return await find_working_domain_fallback(session, file_id)
 
 async def find_working_domain_fallback(session, file_id, domains=["d1", "d2", "d3", "d4"]):
-    """Fallback: Eski sistem ile çalışan domain bulma"""
-    logger.info(f"[*] Fallback domain testi başlıyor...")
+    """Fallback: Eski sistem ile çalışan domain bulma (hiçbiri çalışmazsa domain None, URL default d2 olur)"""
+    logger.debug("[*] Fallback domain testi başlıyor...")
     
     for domain in domains:
         m3u8_url = f"https://{domain}.premiumvideo.click/uploads/encode/{file_id}/master.m3u8"
         
-        logger.info(f"[*] Fallback test: {domain}")
+        logger.debug("[*] Fallback test: %s", domain)
         is_working = await test_m3u8_url(session, m3u8_url)
         
         if is_working:
-            logger.info(f"[✅] Fallback domain çalışıyor: {domain}")
+            logger.debug("[✅] Fallback domain çalışıyor: %s", domain)
             return domain, m3u8_url
     
-    logger.warning(f"[⚠️] Hiçbir domain çalışmıyor! Default d2 kullanılacak.")
-    return "d2", f"https://d2.premiumvideo.click/uploads/encode/{file_id}/master.m3u8"
+    logger.warning("[⚠️] Hiçbir domain çalışmıyor! Default d2 kullanılacak.")
+    return None, f"https://d2.premiumvideo.click/uploads/encode/{file_id}/master.m3u8"
 
+@TRACER.traced("test_m3u8_url")
 async def test_m3u8_url(session, url, timeout=15):
     """M3U8 URL test fonksiyonu"""
+    BUDGET.spend()
     try:
         async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout), allow_redirects=True) as response:
             final_url = str(response.url)
@@ -243,11 +288,11 @@ async def test_m3u8_url(session, url, timeout=15):
 async def get_movies_from_page(session, page_num):
     """Belirli bir sayfadan film listesini alır"""
     filmler_url = f"{BASE_URL}/filmler?p={page_num}"
-    logger.info(f"Sayfa {page_num} alınıyor: {filmler_url}")
+    logger.info("Sayfa %s alınıyor: %s", page_num, filmler_url)
     
     content = await fetch_page(session, filmler_url)
     if not content:
-        logger.warning(f"[!] Film sayfası {page_num} alınamadı.")
+        logger.warning("[!] Film sayfası %s alınamadı.", page_num)
         return [], False
     
     soup = BeautifulSoup(content, 'html.parser')
@@ -271,7 +316,9 @@ async def get_movies_from_page(session, page_num):
             "a[href*='/film/']"
         ]
         
-        for selector in alt_selectors:
+        # Tüm seçicilerin birleşimi alınır; katkı sağlayan her seçici isabet sayılır
+        for selector in SELECTOR_STATS.order("listing", alt_selectors):
+            found_before = len(movie_links)
             elements = soup.select(selector)
             for element in elements:
                 href = element.get("href")
@@ -279,6 +326,9 @@ async def get_movies_from_page(session, page_num):
                     full_url = fix_url(href)
                     if full_url and full_url not in movie_links:
                         movie_links.append(full_url)
+            
+            if len(movie_links) > found_before:
+                SELECTOR_STATS.hit("listing", selector)
     
     
     has_next_page = False
@@ -289,7 +339,7 @@ async def get_movies_from_page(session, page_num):
         ".uk-pagination a"
     ]
     
-    for selector in pagination_selectors:
+    for selector in SELECTOR_STATS.order("pagination", pagination_selectors):
         pagination_elements = soup.select(selector)
         for element in pagination_elements:
             href = element.get("href", "")
@@ -297,6 +347,7 @@ async def get_movies_from_page(session, page_num):
                 has_next_page = True
                 break
         if has_next_page:
+            SELECTOR_STATS.hit("pagination", selector)
             break
     
     
@@ -309,21 +360,30 @@ async def get_movies_from_page(session, page_num):
             if next_links:
                 has_next_page = True
     
-    logger.info(f"[+] Sayfa {page_num}: {len(movie_links)} film linki toplandı. Sonraki sayfa: {'Var' if has_next_page else 'Yok'}")
+    logger.info("[+] Sayfa %s: %s film linki toplandı. Sonraki sayfa: %s", page_num, len(movie_links), 'Var' if has_next_page else 'Yok')
     return movie_links, has_next_page
 
 async def get_movies_from_homepage():
     """Tüm sayfalardan film listesini alır"""
-    async with aiohttp.ClientSession() as session:
+    async with client_session() as session:
         all_movie_links = []
         page_num = 1
         max_pages = 1000  # TÜM SAYFALARI TARAMAK İÇİN YÜKSEK BİR SINIR
         
         while page_num <= max_pages:
-            movie_links, has_next_page = await get_movies_from_page(session, page_num)
+            # Bütçe listeleme sırasında dolarsa taranmayan sayfaların filmleri önceki listeden alınır
+            if BUDGET.exhausted():
+                seen = set(all_movie_links)
+                known = [link for link in STATE.listing if link not in seen]
+                all_movie_links.extend(known)
+                logger.warning("[!] Bütçe doldu, listeleme %s. sayfada kesildi; önceki listeden %s film eklendi.", page_num, len(known))
+                break
+            
+            with TIMINGS.stage(LISTING, BASE_URL):
+                movie_links, has_next_page = await get_movies_from_page(session, page_num)
             
             if not movie_links:
-                logger.info(f"[!] Sayfa {page_num} boş, tarama durduruluyor.")
+                logger.info("[!] Sayfa %s boş, tarama durduruluyor.", page_num)
                 break
             
             
@@ -333,10 +393,10 @@ async def get_movies_from_homepage():
                     all_movie_links.append(link)
                     new_count += 1
             
-            logger.info(f"[+] Sayfa {page_num}: {new_count} yeni film eklendi. Toplam: {len(all_movie_links)}")
+            logger.info("[+] Sayfa %s: %s yeni film eklendi. Toplam: %s", page_num, new_count, len(all_movie_links))
             
             if not has_next_page:
-                logger.info(f"[✓] Son sayfa ({page_num}) işlendi.")
+                logger.info("[✓] Son sayfa (%s) işlendi.", page_num)
                 break
             
             page_num += 1
@@ -344,20 +404,20 @@ async def get_movies_from_homepage():
             
             await asyncio.sleep(0.5)
         
-        logger.info(f"[✓] Toplam {len(all_movie_links)} benzersiz film linki toplandı ({page_num} sayfa tarandı).")
+        logger.info("[✓] Toplam %s benzersiz film linki toplandı (%s sayfa tarandı).", len(all_movie_links), page_num)
         return all_movie_links
 
 async def get_movie_metadata(session, movie_url):
     """Film meta verilerini alır"""
     content = await fetch_page(session, movie_url)
     if not content:
-        return "Bilinmeyen Film", ""
+        return UNKNOWN_MOVIE, ""
     
     soup = BeautifulSoup(content, 'html.parser')
     
     
     title_element = soup.select_one(".text-bold")
-    title = title_element.get_text(strip=True) if title_element else "Bilinmeyen Film"
+    title = title_element.get_text(strip=True) if title_element else UNKNOWN_MOVIE
     
     
     logo_url = ""
@@ -370,16 +430,20 @@ async def get_movie_metadata(session, movie_url):
     return title, logo_url
 
 async def extract_m3u8_from_movie(session, movie_url):
-    """Film sayfasından m3u8 linkini çıkarır"""
+    """Film sayfasından m3u8 linkini çıkarır; (m3u8 URL, hata kodu) döndürür"""
     content = await fetch_page(session, movie_url)
     if not content:
-        return None
+        return None, NO_PAGE
     
     soup = BeautifulSoup(content, 'html.parser')
     
-    logger.info(f"[*] Film işleniyor: {movie_url}")
+    logger.debug("[*] Film işleniyor: %s", movie_url)
     
     m3u8_url = None
+    iframe_found = False
+    file_id = None
+    resolver = None
+    probe_failed = False
     
     try:
         
@@ -387,19 +451,22 @@ async def extract_m3u8_from_movie(session, movie_url):
         if gujan_iframe:
             src = gujan_iframe.get("src")
             if src and "gujan.premiumvideo.click/e/" in src:
-                logger.info(f"[+] Gujan player iframe bulundu: {src}")
+                iframe_found = True
+                logger.debug("[+] Gujan player iframe bulundu: %s", src)
                 
                 
                 gujan_match = re.search(r'gujan\.premiumvideo\.click/e/([a-zA-Z0-9]+)', src)
                 if gujan_match:
                     file_id = gujan_match.group(1)
-                    logger.info(f"[+] Gujan File ID: {file_id}")
+                    logger.debug("[+] Gujan File ID: %s", file_id)
                     
                     
-                    m3u8_url = await extract_gujan_m3u8(session, src, file_id)
+                    with TIMINGS.stage(GUJAN, src):
+                        m3u8_url = await extract_gujan_m3u8(session, src, file_id)
                     if m3u8_url:
-                        logger.info(f"[✅] Gujan M3U8 bulundu: {m3u8_url}")
-                        return create_proxy_url(m3u8_url)
+                        logger.debug("[✅] Gujan M3U8 bulundu: %s", m3u8_url)
+                        METRICS.resolved(GUJAN)
+                        return m3u8_url, None
         
         
         if not m3u8_url:
@@ -410,10 +477,9 @@ async def extract_m3u8_from_movie(session, movie_url):
             ]
             
             playhouse_url = None
-            file_id = None
             
             
-            for selector in iframe_selectors:
+            for selector in SELECTOR_STATS.order("playhouse_iframe", iframe_selectors):
                 iframe_element = soup.select_one(selector)
                 if iframe_element:
                     src = iframe_element.get("src")
@@ -421,7 +487,8 @@ async def extract_m3u8_from_movie(session, movie_url):
                         if src.startswith("//"):
                             src = "https:" + src
                         playhouse_url = src
-                        logger.info(f"[+] Playhouse iframe bulundu: {playhouse_url}")
+                        logger.debug("[+] Playhouse iframe bulundu: %s", playhouse_url)
+                        SELECTOR_STATS.hit("playhouse_iframe", selector)
                         break
             
             
@@ -434,7 +501,7 @@ async def extract_m3u8_from_movie(session, movie_url):
                     hex_matches = hex_pattern.findall(script_content)
                     
                     if hex_matches:
-                        logger.info(f"[+] Script içinde {len(hex_matches)} hex URL bulundu.")
+                        logger.debug("[+] Script içinde %s hex URL bulundu.", len(hex_matches))
                         for hex_value in hex_matches:
                             try:
                                 decoded_url = bytes.fromhex(hex_value).decode('utf-8')
@@ -442,28 +509,34 @@ async def extract_m3u8_from_movie(session, movie_url):
                                     playhouse_url = decoded_url
                                     if playhouse_url.startswith("//"):
                                         playhouse_url = "https:" + playhouse_url
-                                    logger.info(f"[+] Hex'ten çözülen playhouse URL: {playhouse_url}")
+                                    logger.debug("[+] Hex'ten çözülen playhouse URL: %s", playhouse_url)
                                     break
                             except Exception as e:
-                                logger.error(f"[!] Hex çözme hatası: {e}")
+                                logger.error("[!] Hex çözme hatası: %s", e)
                         
                         if playhouse_url:
                             break
             
             
             if playhouse_url:
+                iframe_found = True
                 playhouse_match = re.search(r'playhouse\.premiumvideo\.click/player/([a-zA-Z0-9]+)', playhouse_url)
                 if playhouse_match:
                     file_id = playhouse_match.group(1)
-                    logger.info(f"[+] Playhouse File ID bulundu: {file_id}")
+                    logger.debug("[+] Playhouse File ID bulundu: %s", file_id)
                     
                     
-                    working_domain, m3u8_url = await get_correct_domain_from_playhouse(session, file_id)
-                    logger.info(f"[+] Bulunan domain: {working_domain}, M3U8: {m3u8_url}")
+                    # Süre, yönlendirilen CDN domainine yazılır
+                    with TIMINGS.stage(PLAYHOUSE, playhouse_url) as span:
+                        working_domain, m3u8_url = await get_correct_domain_from_playhouse(session, file_id)
+                        span.url = m3u8_url
+                    resolver = PLAYHOUSE
+                    probe_failed = working_domain is None
+                    logger.debug("[+] Bulunan domain: %s, M3U8: %s", working_domain, m3u8_url)
         
         # 3. FALLBACK KONTROLÜ
         if not m3u8_url:
-            logger.info("[*] Playhouse ve Gujan bulunamadı, fallback sistem ile deneniyor...")
+            logger.debug("[*] Playhouse ve Gujan bulunamadı, fallback sistem ile deneniyor...")
             
             iframe_selectors_fallback = [
                 "iframe#londonIframe",
@@ -473,7 +546,7 @@ async def extract_m3u8_from_movie(session, movie_url):
                 "iframe"
             ]
             
-            for selector in iframe_selectors_fallback:
+            for selector in SELECTOR_STATS.order("iframe_fallback", iframe_selectors_fallback):
                 iframe_element = soup.select_one(selector)
                 if iframe_element:
                     src = iframe_element.get("src")
@@ -481,110 +554,245 @@ async def extract_m3u8_from_movie(session, movie_url):
                         src = iframe_element.get("data-src")
                     
                     if src and src != "about:blank":
+                        iframe_found = True
                         iframe_url = fix_url(src)
-                        logger.info(f"[+] Fallback iframe URL: {iframe_url}")
+                        logger.debug("[+] Fallback iframe URL: %s", iframe_url)
                         
                         
                         premium_video_match = re.search(r'premiumvideo\.click/player\.php\?file_id=([a-zA-Z0-9]+)', iframe_url)
                         if premium_video_match:
                             file_id = premium_video_match.group(1)
-                            logger.info(f"[+] Fallback File ID: {file_id}")
+                            logger.debug("[+] Fallback File ID: %s", file_id)
+                            SELECTOR_STATS.hit("iframe_fallback", selector)
                             
                             
-                            working_domain, m3u8_url = await find_working_domain_fallback(session, file_id)
+                            with TIMINGS.stage(FALLBACK, iframe_url) as span:
+                                working_domain, m3u8_url = await find_working_domain_fallback(session, file_id)
+                                span.url = m3u8_url
+                            resolver = FALLBACK
+                            probe_failed = working_domain is None
                             break
     
     except Exception as e:
-        logger.error(f"[!] Film işleme genel hatası: {e}")
+        logger.error("[!] Film işleme genel hatası: %s", e)
+        METRICS.resolved(None)
+        return None, ERROR
     
     
+    METRICS.resolved(resolver if m3u8_url and not probe_failed else None)
     if m3u8_url:
-        return create_proxy_url(m3u8_url)
+        # Domain doğrulanamadıysa default d2 yazılır ama film bekleme süresine alınır
+        return m3u8_url, PROBE_FAILED if probe_failed else None
+    
+    return None, failure_reason(iframe_found, file_id)
+
+def format_movie_lines(title, logo_url, m3u8_url):
+    """Film için #EXTINF ve proxy URL satırlarını üretir"""
+    tvg_id = sanitize_id(title)
+    return [
+        f'#EXTINF:-1 tvg-name="{title}" '
+        f'tvg-language="Turkish" tvg-country="TR" '
+        f'tvg-id="{tvg_id}" '
+        f'tvg-logo="{logo_url}" '
+        f'group-title="Filmler",{title}\n',
+        create_proxy_url(m3u8_url.strip()) + "\n"
+    ]
+
+def movie_key(movie_url, title):
+    """Filmin çözüm önbelleği anahtarı film URL'sidir; aynı adlı filmler birbirinin yayınını almaz
+
+    Playlist'ten başlıkla doldurulmuş kayıt ilk kullanımda URL anahtarına taşınır.
+    """
+    if title == UNKNOWN_MOVIE:
+        return movie_url
+    return RESOLUTION_CACHE.adopt(movie_url, title)
+
+def stored_movie_lines(movie_url, known_movies):
+    """Ertelenen ya da işlenemeyen film için son bilinen girdiyi döndürür (kaydı yoksa None)"""
+    known = known_movies.get(movie_url)
+    if not known:
+        return None
+    entry = RESOLUTION_CACHE.get(movie_key(movie_url, known["title"]))
+    if not entry:
+        return []
+    return format_movie_lines(known["title"], known["logo"], entry["url"])
+
+async def process_single_movie(session, movie_url, known_movies):
+    """Tek bir filmi işler; playlist satırlarını (bulunamazsa boş liste) döndürür"""
+    reason = NEGATIVE_CACHE.pending_reason(movie_url)
+    if reason and movie_url in known_movies:
+        # Daha önce çözülemeyen film bekleme süresi dolana kadar hiç istenmez
+        title, logo_url = known_movies[movie_url]["title"], known_movies[movie_url]["logo"]
+        m3u8_url, failure = None, reason
+    else:
+        with TIMINGS.stage(METADATA, movie_url):
+            title, logo_url = await get_movie_metadata(session, movie_url)
+        known = known_movies.get(movie_url) or {}
+        if title == UNKNOWN_MOVIE and known.get("title"):
+            # Sayfa alınamadıysa saklı başlık ve logo korunur
+            title, logo_url = known["title"], logo_url or known.get("logo", "")
+        logger.info("\n[+] İşleniyor: %s", title)
+        if title != UNKNOWN_MOVIE:
+            known_movies[movie_url] = {"title": title, "logo": logo_url or ""}
+        
+        m3u8_url, failure = await extract_m3u8_from_movie(session, movie_url)
+        NEGATIVE_CACHE.record(movie_url, failure, m3u8_url)
+    
+    key = movie_key(movie_url, title)
+    if failure:
+        logger.warning("[!] m3u8 URL bulunamadı (%s): %s", failure, title)
+        # Geçici hatada film düşmez; son doğrulanmış girdi (çok eski değilse) yazılır.
+        # Domain doğrulanamadıysa default d2 adresi önbelleğe girmez, yalnızca doğrulanmış girdi yoksa yazılır
+        m3u8_url = CARRY_FORWARD.url(RESOLUTION_CACHE, key, failure) or m3u8_url or NEGATIVE_CACHE.fallback(movie_url)
+        if not m3u8_url:
+            return []
+        return format_movie_lines(title, logo_url, m3u8_url)
     
-    return None
+    RESOLUTION_CACHE.put(key, m3u8_url.strip(), logo_url)
+    logger.info("[✓] %s eklendi.", title, extra={"event": "entry_added"})
+    return format_movie_lines(title, logo_url, m3u8_url)
+
+async def movie_worker(session, queue, results, known_movies):
+    """Kuyruktan film URL'si alıp işler, sonucu yazıcıya iletir"""
+    while True:
+        movie_url = await queue.get()
+        try:
+            # Bütçe dolduysa film ertelenir, kayıtlı girdisi yazılır
+            if BUDGET.exhausted():
+                BUDGET.defer(movie_url)
+                await results.put((movie_url, None))
+                continue
+            
+            with TRACER.span("movie", movie_url):
+                lines = await process_single_movie(session, movie_url, known_movies)
+            await results.put((movie_url, lines))
+        except Exception as e:
+            logger.error("[!] Film işleme hatası (%s): %s", movie_url, e)
+            await results.put((movie_url, None))
+        finally:
+            queue.task_done()
+
+async def movie_result_writer(results, playlist, known_movies):
+    """İşlenen filmleri geldikleri anda günlüğe ve playlist yazıcısına iletir"""
+    while True:
+        movie_url, lines = await results.get()
+        if lines is None:
+            # Ertelenen/hatalı film: son bilinen girdisi yazılır, günlüğe alınmaz
+            with TIMINGS.stage(WRITE):
+                playlist.add(movie_url, stored_movie_lines(movie_url, known_movies))
+        else:
+            JOURNAL.record(movie_url, lines)
+            with TIMINGS.stage(WRITE):
+                playlist.add(movie_url, lines)
+        results.task_done()
 
 async def process_movies(all_movie_links, output_filename="filmfun.m3u"):
     """Tüm filmleri tek bir dosyaya yazar"""
-    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=10)) as session:
-        with open(output_filename, "w", encoding="utf-8") as f:
-            f.write("#EXTM3U\n")
-            
-            
-            semaphore = asyncio.Semaphore(5)
-            
-            async def process_single_movie(movie_url):
-                async with semaphore:
-                    try:
-                        
-                        title, logo_url = await get_movie_metadata(session, movie_url)
-                        logger.info(f"\n[+] İşleniyor: {title}")
-                        
-                        
-                        m3u8_url = await extract_m3u8_from_movie(session, movie_url)
-                        
-                        if m3u8_url:
-                            tvg_id = sanitize_id(title)
-                            
-                            return {
-                                'title': title,
-                                'logo_url': logo_url,
-                                'tvg_id': tvg_id,
-                                'm3u8_url': m3u8_url
-                            }
-                        else:
-                            logger.warning(f"[!] m3u8 URL bulunamadı: {title}")
-                            return None
-                    
-                    except Exception as e:
-                        logger.error(f"[!] Film işleme hatası ({movie_url}): {e}")
-                        return None
-            
-            
-            tasks = [process_single_movie(movie_url) for movie_url in all_movie_links]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            
-            successful_count = 0
-            for result in results:
-                if isinstance(result, Exception):
-                    logger.error(f"[!] Task hatası: {result}")
-                    continue
-                
-                if result is None:
-                    continue
-                
-                f.write(
-                    f'#EXTINF:-1 tvg-name="{result["title"]}" '
-                    f'tvg-language="Turkish" tvg-country="TR" '
-                    f'tvg-id="{result["tvg_id"]}" '
-                    f'tvg-logo="{result["logo_url"]}" '
-                    f'group-title="Filmler",{result["title"]}\n'
-                )
-                f.write(result["m3u8_url"].strip() + "\n")
-                logger.info(f"[✓] {result['title']} eklendi.")
-                successful_count += 1
+    known_movies = STATE.section("movies")
+    STATE.set_listing(all_movie_links)
+    
+    # Önceki (yarıda kalan) çalıştırmada tamamlanan filmler yeniden işlenmez;
+    # bütçe kısıtlıyken daha önce hiç görülmemiş filmler önce işlenir
+    remaining = [movie_url for movie_url in all_movie_links if movie_url not in JOURNAL.completed]
+    if BUDGET.limited:
+        remaining.sort(key=lambda movie_url: movie_url in known_movies)
+        max_buffered = None
+    else:
+        max_buffered = REORDER_LIMIT
+    
+    # Playlist liste sırasıyla, sonuçlar geldikçe geçici dosyaya akıtılır
+    playlist = PlaylistWriter(
+        output_filename,
+        all_movie_links,
+        fill=lambda movie_url: stored_movie_lines(movie_url, known_movies),
+        lookup=JOURNAL.completed.get,
+        max_buffered=max_buffered,
+        previous_path=playlist_path(PLATFORM),
+        platform=PLATFORM,
+    ).open()
+    
+    # Sabit sayıda işçi: bellek katalog boyutundan bağımsız kalır
+    queue = asyncio.Queue()
+    for movie_url in remaining:
+        queue.put_nowait(movie_url)
+    results = asyncio.Queue(maxsize=MOVIE_WORKERS * 2)
+    
+    try:
+        async with client_session(limit=10) as session:
+            workers = [asyncio.create_task(movie_worker(session, queue, results, known_movies)) for _ in range(MOVIE_WORKERS)]
+            writer = asyncio.create_task(movie_result_writer(results, playlist, known_movies))
+            try:
+                await queue.join()
+                await results.join()
+            finally:
+                for task in workers + [writer]:
+                    task.cancel()
+                await asyncio.gather(*workers, writer, return_exceptions=True)
+    finally:
+        # Kesilse bile tamamlanan filmler ve kayıtlı girdiler yazılıp dosya atomik olarak yerine taşınır
+        with TIMINGS.stage(WRITE):
+            playlist.close()
+        METRICS.playlist(output_filename, playlist.entries)
 
-            logger.info(f"\n[✓] {successful_count} film başarıyla eklendi.")
 
-    logger.info(f"\n[✓] {output_filename} dosyası oluşturuldu.")
+def parse_args(argv=None):
+    return build_parser("Film listesini tarayıp M3U playlist'i oluşturur").parse_args(argv)
 
 
-async def main():
+async def main(args=None):
+    args = args or parse_args([])
+    setup_logging(args.log_level, args.log_format, args.log_samples, PLATFORM)
     start_time = time.time()
     
     
-    movie_urls = await get_movies_from_homepage()
-    if not movie_urls:
-        logger.error("[!] Film listesi boş, seçicileri kontrol et.")
-        return
-
+    SHUTDOWN.install(args.shutdown_grace)
+    BUDGET.configure(args.deadline, args.request_budget)
+    PROXY.configure(args.proxy_template, args.proxy_hosts)
+    CARRY_FORWARD.configure(args.carry_max_age)
+    METRICS.configure(args.metrics_dir)
+    TRACER.configure(args.trace)
+    PROFILER.configure(args.profile, args.profile_dir)
+    LOOP_MONITOR.configure(args.loop_lag)
+    STATE.begin_run()
+    JOURNAL.open(resume=args.resume)
+    seed_if_empty(RESOLUTION_CACHE, PLATFORM)
+    PROFILER.start()
+    LOOP_MONITOR.start()
     
-    await process_movies(movie_urls)
+    try:
+        movie_urls = await get_movies_from_homepage()
+        PROFILER.checkpoint("listing")
+        if not movie_urls:
+            logger.error("[!] Film listesi boş, seçicileri kontrol et.")
+            return SHUTDOWN.exit_code
+
+        
+        await process_movies(movie_urls)
+        PROFILER.checkpoint("process")
+        
+        # Kesilen çalıştırmanın günlüğü sonraki --resume için saklanır
+        if not SHUTDOWN.requested:
+            JOURNAL.finish()
+    except asyncio.CancelledError:
+        logger.warning("[!] Çalıştırma kesildi; tamamlanan sonuçlar yazıldı.")
+    finally:
+        PROFILER.stop()
+        LOOP_MONITOR.stop()
+        BUDGET.report(PLATFORM)
+        CARRY_FORWARD.report(PLATFORM)
+        NEGATIVE_CACHE.report(PLATFORM)
+        TIMINGS.report(PLATFORM)
+        SELECTOR_STATS.summary()
+        STATE.save()
+        METRICS.cache("resolution", RESOLUTION_CACHE.hits, RESOLUTION_CACHE.misses)
+        METRICS.write(TRAFFIC, TIMINGS, time.time() - start_time)
+        TRACER.write(PLATFORM)
 
     end_time = time.time()
-    logger.info(f"\n[✓] Tüm işlemler tamamlandı. Süre: {end_time - start_time:.2f} saniye")
+    logger.info("\n[✓] Tüm işlemler tamamlandı. Süre: %.2f saniye", end_time - start_time)
+    return SHUTDOWN.exit_code
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    sys.exit(asyncio.run(main(parse_args())))
     
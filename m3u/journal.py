@@ -0,0 +1,73 @@
+import json
+import logging
+import os
+import time
+
+from state import STATE_DIR
+
+
+logger = logging.getLogger(__name__)
+
+
+# Bundan eski yarım kalmış günlükler devam ettirilmez
+MAX_RESUME_AGE = 24 * 3600
+
+
+class RunJournal:
+    """Tamamlanan dizi/film girdilerini iş bittikçe ekleyen çalıştırma günlüğü (durum/<platform>.journal.jsonl)"""
+
+    def __init__(self, platform, state_dir=STATE_DIR):
+        self.path = os.path.join(state_dir, f"{platform}.journal.jsonl")
+        self.completed = {}
+        self._file = None
+
+    def _read(self):
+        started_at = None
+        completed = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Kesilen çalıştırmanın yarım kalan son satırı
+                    continue
+                if "started_at" in record:
+                    started_at = record["started_at"]
+                else:
+                    completed[record["key"]] = record["lines"]
+        return started_at, completed
+
+    def open(self, resume=False):
+        """Günlüğü açar; resume ise önceki çalıştırmanın tamamlanan işlerini yükler"""
+        if resume and os.path.exists(self.path):
+            started_at, completed = self._read()
+            if started_at and time.time() - started_at <= MAX_RESUME_AGE:
+                self.completed = completed
+                logger.info("[+] Günlükten devam ediliyor: %s tamamlanmış iş (%s)", len(completed), self.path)
+                self._file = open(self.path, "a", encoding="utf-8")
+                return self.completed
+            logger.info("[!] Günlük çok eski, baştan başlanıyor: %s", self.path)
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.completed = {}
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._append({"started_at": int(time.time())})
+        return self.completed
+
+    def _append(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def record(self, key, lines):
+        """Tamamlanan işin playlist satırlarını günlüğe ekler"""
+        self.completed[key] = lines
+        if self._file:
+            self._append({"key": key, "lines": lines})
+
+    def finish(self):
+        """Çalıştırma tamamlandı: günlük artık gerekmez"""
+        if self._file:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,145 @@
+import argparse
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+
+# Varsayılan log seviyesi ve biçimi (komut satırı verilmezse)
+LEVEL_ENV = "M3U_LOG_LEVEL"
+FORMAT_ENV = "M3U_LOG_FORMAT"
+# Virgülle ayrılmış örnekleme listesi, örn. entry_added=100
+SAMPLE_ENV = "M3U_LOG_SAMPLE"
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+FORMATS = ("text", "json")
+
+# LogRecord'un standart alanları; bunların dışındaki extra alanlar JSON'a eklenir
+RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def parse_sample(text):
+    """'event=N' biçimini (olay, N) çiftine çevirir: olayın her N kaydından biri yazılır"""
+    event, _, every = text.partition("=")
+    try:
+        every = int(every)
+    except ValueError:
+        every = 0
+    if not event or every < 1:
+        raise argparse.ArgumentTypeError(f"Geçersiz örnekleme: {text} (örnek: entry_added=100)")
+    return event, every
+
+
+class JsonFormatter(logging.Formatter):
+    """Her kaydı tek satır JSON olarak yazar (ts, level, logger, message, platform ve extra alanlar)"""
+
+    def __init__(self, platform=None):
+        super().__init__()
+        self.platform = platform
+
+    def format(self, record):
+        data = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if self.platform:
+            data["platform"] = self.platform
+        for name, value in vars(record).items():
+            if name not in RECORD_FIELDS and not name.startswith("_"):
+                data[name] = value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SampleFilter(logging.Filter):
+    """extra={"event": ...} ile işaretlenmiş yüksek hacimli kayıtlardan her N'de birini geçirir
+
+    Uyarı ve üstü seviyeler her zaman geçer; örneklenen kayıtlara kaçıncı olduğu
+    (sample_seq) eklenir.
+    """
+
+    def __init__(self, samples=None):
+        super().__init__()
+        self.samples = dict(samples or {})
+        self.counts = {}
+
+    def filter(self, record):
+        event = getattr(record, "event", None)
+        every = self.samples.get(event)
+        if not every or record.levelno >= logging.WARNING:
+            return True
+        count = self.counts.get(event, 0) + 1
+        self.counts[event] = count
+        if (count - 1) % every:
+            return False
+        record.sample_seq = count
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Kaydı biçimlendirmeden kuyruğa koyar; mesaj ve JSON dinleyici thread'inde üretilir
+
+    Kuyruk süreç içi olduğundan kaydın kopyalanıp mesajın önceden hazırlanmasına gerek yoktur.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(level=None, log_format=None, samples=None, platform=None):
+    """Kök logger'ı kuyruk üzerinden arka plan thread'ine yazacak şekilde yeniden kurar
+
+    Olay döngüsündeki log çağrısı yalnızca kaydı kuyruğa koyar; biçimlendirme ve stderr'e
+    yazma QueueListener thread'inde yapılır. Çıkışta kuyruk boşaltılır.
+    """
+    level = (level or os.environ.get(LEVEL_ENV) or "INFO").upper()
+    log_format = log_format or os.environ.get(FORMAT_ENV) or "text"
+    samples = samples or [parse_sample(item) for item in os.environ.get(SAMPLE_ENV, "").split(",") if item]
+
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(JsonFormatter(platform) if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+
+    handler = DeferredQueueHandler(queue.SimpleQueue())
+    handler.addFilter(SampleFilter(samples))
+
+    root = logging.getLogger()
+    for old in root.handlers[:]:
+        root.removeHandler(old)
+        old.close()
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    listener = QueueListener(handler.queue, stream, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def add_logging_arguments(parser):
+    """Log seviyesi, biçimi ve örnekleme seçenekleri"""
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        type=str.upper,
+        help=f"Log seviyesi (varsayılan ${LEVEL_ENV} ya da INFO); DEBUG, tek tek M3U8 testlerini ve proxy dönüşümlerini de yazar",
+    )
+    parser.add_argument(
+        "--log-format",
+        choices=FORMATS,
+        help=f"Log biçimi: text ya da satır başına bir JSON nesnesi (varsayılan ${FORMAT_ENV} ya da text)",
+    )
+    parser.add_argument(
+        "--log-sample",
+        dest="log_samples",
+        type=parse_sample,
+        action="append",
+        help=f"Yüksek hacimli olayın her N kaydından birini yaz, örn. entry_added=100 (tekrarlanabilir; varsayılan ${SAMPLE_ENV})",
+    )
+    return parser
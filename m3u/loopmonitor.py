@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import os
+import selectors
+import sys
+import threading
+import time
+import traceback
+
+from budget import parse_duration
+from timing import Histogram
+
+
+logger = logging.getLogger(__name__)
+
+
+# Gecikme eşiği (örn. 250ms); komut satırı verilmezse kullanılır, 0 izlemeyi kapatır
+LAG_ENV = "M3U_LOOP_LAG"
+DEFAULT_THRESHOLD = 0.25
+
+# Olay döngüsünün ne sıklıkla yoklandığı (saniye)
+SAMPLE_INTERVAL = 0.05
+# Bir çalıştırmada yığını loglanan en fazla takılma ve yığında gösterilen çerçeve sayısı
+MAX_STACK_LOGS = 10
+STACK_LIMIT = 12
+TOP_HOTSPOTS = 10
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Olay döngüsünün callback'leri çalıştırdığı çerçeve (asyncio.events.Handle._run)
+HANDLE_RUN_FILE = asyncio.events.__file__
+
+
+def callback_stack(frame):
+    """Yığının olay döngüsünün çalıştırdığı callback'ten başlayan kısmı (döngü çerçeveleri atlanır)"""
+    stack = traceback.extract_stack(frame)
+    start = 0
+    for index, summary in enumerate(stack):
+        if summary.filename == HANDLE_RUN_FILE and summary.name == "_run":
+            start = index + 1
+    return stack[start:]
+
+
+def hotspot(stack):
+    """En içteki betik çerçevesini (yoksa en içteki çerçeveyi) 'fonksiyon (dosya:satır)' olarak verir"""
+    found = stack[-1]
+    for summary in reversed(stack):
+        if os.path.dirname(os.path.abspath(summary.filename)) == SCRIPT_DIR:
+            found = summary
+            break
+    return f"{found.name} ({os.path.basename(found.filename)}:{found.lineno})"
+
+
+class LoopMonitor:
+    """Olay döngüsünün zamanlama gecikmesini örnekler ve döngüyü bloklayan kodu bulur
+
+    Döngüde çalışan yoklama görevi SAMPLE_INTERVAL kadar uyur; uyanmadaki gecikme o
+    aralıkta döngüyü tutan senkron işin (HTML ayrıştırma, dosya yazma...) süresidir ve
+    histograma eklenir. Ayrı bir bekçi thread'i, yoklama eşikten uzun süre uyanmazsa
+    döngü thread'inin o anki yığınını ve çalışan görevi loglar; takılmalar en içteki
+    betik fonksiyonuna göre sayılır. Çalıştırma sonunda dağılım ve sıcak noktalar loglanır.
+    """
+
+    def __init__(self, platform):
+        self.platform = platform
+        self.threshold = None
+        self.lags = Histogram()
+        self.stalls = {}
+        self._logged = 0
+        self._tick = None
+        self._task = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._loop = None
+        self._loop_thread = None
+
+    def configure(self, threshold=None):
+        """Eşiği ayarlar (yoksa $M3U_LOOP_LAG, o da yoksa DEFAULT_THRESHOLD); 0 izlemeyi kapatır"""
+        if threshold is None:
+            env = os.environ.get(LAG_ENV)
+            threshold = parse_duration(env) if env else DEFAULT_THRESHOLD
+        self.threshold = threshold or None
+
+    @property
+    def enabled(self):
+        return self.threshold is not None
+
+    def start(self):
+        """Yoklama görevini ve bekçi thread'ini başlatır; çalışan olay döngüsü içinden çağrılmalıdır"""
+        if not self.enabled or self._task:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._tick = time.monotonic()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._sample())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def _sample(self):
+        while True:
+            expected = time.monotonic() + SAMPLE_INTERVAL
+            self._tick = expected
+            await asyncio.sleep(SAMPLE_INTERVAL)
+            now = time.monotonic()
+            self.lags.observe(max(now - expected, 0.0))
+            self._tick = now
+
+    def _watch(self):
+        reported = None
+        while not self._stop.wait(min(self.threshold / 2, SAMPLE_INTERVAL)):
+            tick = self._tick
+            stalled = time.monotonic() - tick
+            if stalled < self.threshold or tick == reported:
+                continue
+            # Aynı takılma bir kez raporlanır; yoklama uyanınca tick değişir
+            reported = tick
+            frame = sys._current_frames().get(self._loop_thread)
+            task = asyncio.current_task(self._loop)
+            # select() içindeyse döngü bloklu değil, zamanlayıcı geç uyanmıştır
+            if frame is None or frame.f_code.co_filename == selectors.__file__:
+                continue
+            stack = callback_stack(frame)
+            if not stack:
+                continue
+            location = hotspot(stack)
+            self.stalls[location] = self.stalls.get(location, 0) + 1
+            if self._logged >= MAX_STACK_LOGS:
+                continue
+            self._logged += 1
+            coroutine = task.get_coro().__qualname__ if task else "-"
+            logger.warning(
+                "[!] Olay döngüsü %.0f ms'dir bloklu (görev: %s, konum: %s):\n%s",
+                stalled * 1000, coroutine, location, "".join(traceback.format_list(stack[-STACK_LIMIT:])).rstrip(),
+                extra={"event": "loop_stall"},
+            )
+
+    def stop(self):
+        """Yoklamayı durdurur ve gecikme dağılımı ile sıcak noktaları loglar"""
+        if not self._task:
+            return
+        self._task.cancel()
+        self._task = None
+        # Yoklama uyanamadan biten son takılma da dağılıma eklenir
+        pending = time.monotonic() - self._tick
+        if pending > 0:
+            self.lags.observe(pending)
+        self._stop.set()
+        self._thread.join()
+        self.report()
+
+    def report(self):
+        lags = self.lags
+        if not lags.count:
+            return
+        over = sum(1 for lag in lags.samples if lag >= self.threshold)
+        lines = [
+            f"[✓] {self.platform} olay döngüsü gecikmesi ({lags.count} örnek, her {SAMPLE_INTERVAL * 1000:.0f} ms): "
+            f"p50 {lags.percentile(50) * 1000:.1f} ms, p95 {lags.percentile(95) * 1000:.1f} ms, "
+            f"p99 {lags.percentile(99) * 1000:.1f} ms, en yüksek {max(lags.samples) * 1000:.1f} ms; "
+            f"{self.threshold * 1000:.0f} ms eşiğini aşan {over}, toplam gecikme {lags.total:.2f} s",
+        ]
+        for hotspot, count in sorted(self.stalls.items(), key=lambda item: -item[1])[:TOP_HOTSPOTS]:
+            lines.append(f"    {count:>5} takılma  {hotspot}")
+        logger.info("\n".join(lines))
@@ -0,0 +1,130 @@
+import logging
+import os
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+# Verilirse her çalıştırma sonunda bu dizine <platform>.prom metrik dosyası yazılır
+METRICS_DIR_ENV = "M3U_METRICS_DIR"
+
+# Çözüm sonucu kodu: hiçbir çözücü M3U8 bulamadı
+NO_RESOLVER = "none"
+
+# Aşama süresi histogram kovaları (saniye)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels):
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in labels.items()) + "}"
+
+
+def format_value(value):
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+class CrawlMetrics:
+    """Çalıştırmanın metriklerini node-exporter textfile collector'ın okuduğu metin biçiminde yazar
+
+    İstek/bayt sayıları transport.TRAFFIC'ten, aşama süreleri timing.StageTimer'dan gelir;
+    çözücü sonuçları, önbellek isabetleri ve playlist girdi sayıları betik tarafından
+    kaydedilir. Her örnek platform etiketi taşır; dosya atomik olarak değiştirilir.
+    """
+
+    def __init__(self, platform):
+        self.platform = platform
+        self.directory = None
+        self.resolves = {}
+        self.caches = {}
+        self.playlists = {}
+
+    def configure(self, directory=None):
+        """Metrik dizinini ayarlar (yoksa $M3U_METRICS_DIR); ikisi de yoksa dosya yazılmaz"""
+        self.directory = directory or os.environ.get(METRICS_DIR_ENV) or None
+
+    def resolved(self, resolver):
+        """Bölüm/film çözümünün hangi çözücüyle (ya da NO_RESOLVER) sonuçlandığını sayar"""
+        resolver = resolver or NO_RESOLVER
+        self.resolves[resolver] = self.resolves.get(resolver, 0) + 1
+
+    def cache(self, name, hits, misses):
+        self.caches[name] = (hits, misses)
+
+    def playlist(self, name, entries):
+        self.playlists[name] = entries
+
+    def render(self, traffic, timings, duration, now=None):
+        """Metrik dosyasının içeriğini üretir"""
+        base = {"platform": self.platform}
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            if not samples:
+                return
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{format_labels({**base, **labels})} {format_value(value)}")
+
+        family("m3u_http_requests_total", "counter", "Host ve durum koduna göre HTTP istekleri", [
+            ("m3u_http_requests_total", {"host": host, "status": status}, count)
+            for (host, status), count in sorted(traffic.requests.items())
+        ])
+        family("m3u_http_response_bytes_total", "counter", "Host başına tamamı okunan yanıt gövdelerinin baytları", [
+            ("m3u_http_response_bytes_total", {"host": host}, count)
+            for host, count in sorted(traffic.bytes.items())
+        ])
+        family("m3u_resolves_total", "counter", "Çözücüye göre bölüm/film M3U8 çözüm sonuçları", [
+            ("m3u_resolves_total", {"resolver": resolver}, count)
+            for resolver, count in sorted(self.resolves.items())
+        ])
+        family("m3u_cache_requests_total", "counter", "Önbellek sorguları (hit/miss)", [
+            ("m3u_cache_requests_total", {"cache": name, "result": result}, count)
+            for name, (hits, misses) in sorted(self.caches.items())
+            for result, count in (("hit", hits), ("miss", misses))
+        ])
+        family("m3u_cache_hit_ratio", "gauge", "Önbellek isabet oranı (0-1)", [
+            ("m3u_cache_hit_ratio", {"cache": name}, hits / (hits + misses))
+            for name, (hits, misses) in sorted(self.caches.items()) if hits + misses
+        ])
+        family("m3u_playlist_entries", "gauge", "Playlist'e yazılan girdi sayısı", [
+            ("m3u_playlist_entries", {"playlist": name}, entries)
+            for name, entries in sorted(self.playlists.items())
+        ])
+
+        histogram_samples = []
+        for stage, host, histogram in timings.rows():
+            labels = {"stage": stage, "host": host}
+            for bound, count in zip(LATENCY_BUCKETS, histogram.bucket_counts(LATENCY_BUCKETS)):
+                histogram_samples.append(("m3u_stage_duration_seconds_bucket", {**labels, "le": format_value(bound)}, count))
+            histogram_samples.append(("m3u_stage_duration_seconds_bucket", {**labels, "le": "+Inf"}, histogram.count))
+            histogram_samples.append(("m3u_stage_duration_seconds_sum", labels, histogram.total))
+            histogram_samples.append(("m3u_stage_duration_seconds_count", labels, histogram.count))
+        family("m3u_stage_duration_seconds", "histogram", "Pipeline aşama süreleri", histogram_samples)
+
+        family("m3u_run_duration_seconds", "gauge", "Son çalıştırmanın süresi", [("m3u_run_duration_seconds", {}, float(duration))])
+        family("m3u_last_run_timestamp_seconds", "gauge", "Son çalıştırmanın bittiği zaman (unix)", [
+            ("m3u_last_run_timestamp_seconds", {}, int(now if now is not None else time.time()))
+        ])
+        return "\n".join(lines) + "\n"
+
+    def write(self, traffic, timings, duration):
+        """Metrik dosyasını yazar; dizin ayarlanmadıysa hiçbir şey yapmaz"""
+        if not self.directory:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{self.platform}.prom")
+        # Collector yalnızca *.prom okur; yarım dosya görmemesi için geçici adla yazılıp taşınır
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render(traffic, timings, duration))
+        os.replace(tmp_path, path)
+        logger.info("[✓] Metrikler yazıldı: %s", path)
+        return path
@@ -0,0 +1,324 @@
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+# "python -m m3u.microbench" ile çalıştırıldığında betiklerin düz importları çalışsın
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+
+from bench import DEFAULT_THRESHOLD, compare_results
+from replay import ArchiveSite
+from synthetic import DEFAULT_PLAYER_MIX, SyntheticSite, file_domain, file_id
+
+
+logger = logging.getLogger(__name__)
+
+
+BACKENDS = ["html.parser", "lxml", "html5lib"]
+DEFAULT_SIZES = [24, 96, 384]
+# Metrik -> büyümesi kötü mü
+METRICS = {"us_per_call": True}
+
+REPEATS = 5
+
+TITLES = [
+    "Kuruluş Osman",
+    "Çağrı Merkezi: Gece Vardiyası",
+    "İstanbul'un Gizli Sokakları ve Şehrin Unutulmuş Hikâyeleri",
+]
+
+
+class CannedResponse:
+    """Bellekteki yanıtı aiohttp yanıtı gibi sunar (status, url, headers, text(), content.read())"""
+
+    def __init__(self, url, status, headers, body):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.content = self
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self, n=-1):
+        return self._body if n < 0 else self._body[:n]
+
+    async def text(self):
+        return self._body.decode("utf-8", errors="replace")
+
+
+class CannedSession:
+    """Siteyi (sentetik ya da arşiv) ağa çıkmadan sunan oturum; yönlendirmeleri izler
+
+    Mikro ölçümlerde yalnızca ayrıştırma ve kontrol maliyeti kalsın diye ağ tamamen atlanır.
+    """
+
+    def __init__(self, site, overrides=None):
+        self.site = site
+        self.overrides = overrides or {}
+
+    def get(self, url, allow_redirects=True, **kwargs):
+        for _ in range(10):
+            result = self.overrides.get(url) or self.site.respond("GET", url)
+            if result is None:
+                return CannedResponse(url, 404, {}, b"not recorded")
+            status, headers, body = result
+            if allow_redirects and status in (301, 302, 303, 307, 308) and "Location" in headers:
+                url = headers["Location"]
+                continue
+            return CannedResponse(url, status, headers, body)
+        return CannedResponse(url, 599, {}, b"")
+
+
+def available_backends(requested=None):
+    """İstenen (ya da bilinen) BeautifulSoup ayrıştırıcılarından kurulu olanları döndürür"""
+    backends = []
+    for backend in requested or BACKENDS:
+        if builder_registry.lookup(backend):
+            backends.append(backend)
+        elif requested:
+            logger.warning("[!] Ayrıştırıcı kurulu değil, atlanıyor: %s", backend)
+    return backends
+
+
+def soup_factory(backend):
+    """Betiklerin BeautifulSoup(content, 'html.parser') çağrılarını verilen ayrıştırıcıya yönlendirir"""
+    def make(markup, features=None, **kwargs):
+        return BeautifulSoup(markup, backend, **kwargs)
+    return make
+
+
+def measure(run_batch, min_time):
+    """Çağrı başına süreyi (µs) ölçer: tur süresi min_time/REPEATS'i geçene kadar çağrı sayısı
+    artırılır, ardından REPEATS turun en iyisi alınır"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        run_batch(number)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / REPEATS or number >= 1 << 20:
+            break
+        number *= 2
+
+    best = elapsed
+    for _ in range(REPEATS - 1):
+        start = time.perf_counter()
+        run_batch(number)
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e6, number
+
+
+def async_batch(loop, make_call):
+    def run_batch(number):
+        async def batch():
+            for _ in range(number):
+                await make_call()
+        loop.run_until_complete(batch())
+    return run_batch
+
+
+def sync_batch(call):
+    def run_batch(number):
+        for _ in range(number):
+            call()
+    return run_batch
+
+
+def synthetic_cases(module, sizes):
+    """Her sayfa boyutu için (fonksiyon, durum, site, oturum dışı argümanlar) girdilerini üretir"""
+    platform = module.BASE_URL.rstrip("/").rsplit("/", 1)[-1]
+    cases = []
+    for size in sizes:
+        # Sonraki sayfa bağlantısı olsun diye iki sayfalık katalog
+        site = SyntheticSite(series=size * 2, page_size=size)
+        cases.append(("get_series_from_page", f"{size} dizi", site, (1,)))
+
+        seasons = max(1, size // 16)
+        per_season = max(1, size // seasons)
+        site = SyntheticSite(seasons=(seasons, seasons), episodes=(per_season, per_season))
+        series_url = f"https://{module.BASE_URL.split('/')[2]}/dizi/{platform}-0"
+        cases.append(("get_episode_links", f"{seasons * per_season} bölüm", site, (series_url,)))
+
+    site = SyntheticSite()
+    for kind in DEFAULT_PLAYER_MIX:
+        episode = next(e for e in range(1, 10000) if site.player_kind(f"{platform}-0-1-{e}") == kind)
+        episode_url = f"https://{module.BASE_URL.split('/')[2]}/dizi/{platform}-0?sezon=1&bolum={episode}"
+        cases.append(("extract_m3u8_from_episode", kind, site, (episode_url, 1, episode)))
+    return cases
+
+
+def archive_cases(module, path):
+    """Kayıtlı arşivdeki liste, dizi ve bölüm sayfalarından girdileri üretir"""
+    site = ArchiveSite(path)
+    cases = []
+    for method, url in site.records:
+        if method != "GET" or site.records[(method, url)]["status"] != 200:
+            continue
+        if url.startswith(f"{module.BASE_URL}/diziler?p="):
+            cases.append(("get_series_from_page", "arşiv", site, (int(url.rsplit("=", 1)[-1]),)))
+        elif "/dizi/" in url and "sezon=" in url:
+            season, episode = module.extract_season_episode_from_url(url)
+            cases.append(("extract_m3u8_from_episode", "arşiv", site, (url, season, episode)))
+        elif "/dizi/" in url:
+            cases.append(("get_episode_links", "arşiv", site, (url,)))
+    return cases
+
+
+def m3u8_cases():
+    """test_m3u8_url içerik kontrolleri: geçerli, HTML gövde, şüpheli içerik, yanlış domain"""
+    fid = file_id("microbench")
+    site = SyntheticSite()
+    valid = f"https://{file_domain(fid)}.premiumvideo.click/uploads/encode/{fid}/master.m3u8"
+    wrong = next(
+        f"https://{domain}.premiumvideo.click/uploads/encode/{fid}/master.m3u8"
+        for domain in ("d1", "d2", "d3", "d4") if domain != file_domain(fid)
+    )
+    html = f"https://{file_domain(fid)}.premiumvideo.click/uploads/encode/html/master.m3u8"
+    suspicious = f"https://{file_domain(fid)}.premiumvideo.click/uploads/encode/error/master.m3u8"
+    overrides = {
+        html: (200, {"Content-Type": "text/html"}, b"<html><body>player</body></html>" * 40),
+        suspicious: (200, {"Content-Type": "application/vnd.apple.mpegurl"}, b"#EXTM3U\n#EXT-X-ERROR: access denied\n" * 40),
+    }
+    session = CannedSession(site, overrides)
+    return [("geçerli", session, valid), ("html", session, html), ("şüpheli", session, suspicious), ("404", session, wrong)]
+
+
+def run(args):
+    # İçe aktarılan betik depodaki durum dosyalarını okumasın
+    os.environ.setdefault("M3U_STATE_DIR", tempfile.mkdtemp(prefix="m3u-microbench-"))
+    module = importlib.import_module(args.script)
+    module.logger.setLevel(logging.WARNING)
+    original_soup = module.BeautifulSoup
+
+    backends = available_backends(args.backends)
+    cases = archive_cases(module, args.archive) if args.archive else synthetic_cases(module, args.sizes)
+    loop = asyncio.new_event_loop()
+    results = {}
+
+    def record(function, case, backend, call):
+        us, number = measure(call, args.min_time)
+        name = f"{function}/{case}/{backend}"
+        results[name] = {"function": function, "case": case, "backend": backend, "us_per_call": round(us, 2), "calls": number * REPEATS}
+
+    try:
+        for backend in backends:
+            module.BeautifulSoup = soup_factory(backend)
+            grouped = {}
+            for function, case, site, call_args in cases:
+                grouped.setdefault((function, case), []).append((site, call_args))
+            for (function, case), items in grouped.items():
+                target = getattr(module, function)
+                sessions = [(CannedSession(site), call_args) for site, call_args in items]
+                # Arşivde aynı türden birden çok sayfa varsa sırayla hepsi ölçülür, ortalaması alınır
+                calls = iter(())
+
+                def next_call():
+                    nonlocal calls
+                    item = next(calls, None)
+                    if item is None:
+                        calls = iter(sessions)
+                        item = next(calls)
+                    session, call_args = item
+                    return target(session, *call_args)
+
+                record(function, case, backend, async_batch(loop, next_call))
+    finally:
+        module.BeautifulSoup = original_soup
+
+    for case, session, url in m3u8_cases():
+        record("test_m3u8_url", case, "-", async_batch(loop, lambda session=session, url=url: module.test_m3u8_url(session, url)))
+
+    for title in TITLES:
+        record("sanitize_id", f"{len(title)} karakter", "-", sync_batch(lambda title=title: module.sanitize_id(f"{title}_1_1")))
+
+    for size in args.sizes:
+        links = [(f"https://dizifun5.com/dizi/x?sezon={i // 16 + 1}&bolum={i % 16 + 1}", i // 16 + 1) for i in range(size)]
+        record("normalize_episode_numbers", f"{size} bölüm", "-", sync_batch(lambda links=links: module.normalize_episode_numbers(links)))
+
+    m3u8_url = "https://d1.premiumvideo.click/uploads/encode/abc123/master.m3u8"
+    record("format_episode_lines", "1 bölüm", "-", sync_batch(lambda: module.format_episode_lines(TITLES[1], "https://dizifun5.com/logo.webp", 1, 1, m3u8_url)))
+    loop.close()
+
+    print(format_table(results))
+    if args.output:
+        report = {
+            "created_at": int(time.time()),
+            "python": sys.version.split()[0],
+            "script": args.script,
+            "source": {"archive": os.path.abspath(args.archive)} if args.archive else {"sizes": args.sizes},
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        logger.info("[✓] Sonuçlar kaydedildi: %s", args.output)
+    return 0
+
+
+def format_table(results):
+    header = f"{'fonksiyon':<28}{'durum':<16}{'ayrıştırıcı':<14}{'µs/çağrı':>12}"
+    lines = [header, "-" * len(header)]
+    for result in results.values():
+        lines.append(f"{result['function']:<28}{result['case']:<16}{result['backend']:<14}{result['us_per_call']:>12.2f}")
+    return "\n".join(lines)
+
+
+def compare(args):
+    with open(args.old, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    lines, regressions = compare_results(old, new, args.threshold, METRICS)
+    print("\n".join(lines))
+    if regressions:
+        logger.warning("[!] %%%g eşiğini aşan %s gerileme var.", args.threshold * 100, len(regressions))
+        return 1
+    logger.info("[✓] Eşiği aşan gerileme yok.")
+    return 0
+
+
+def parse_sizes(text):
+    return [int(size) for size in text.split(",") if size.strip()]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m m3u.microbench", description="Sıcak fonksiyonları ağsız, ayrıştırıcı ve sayfa boyutu başına ölçer")
+    commands = parser.add_subparsers(dest="command")
+
+    run_parser = commands.add_parser("run", help="Ölçümleri çalıştır (varsayılan)")
+    run_parser.add_argument("--script", default="Exxen", help="Fonksiyonları ölçülecek dizi betiği (varsayılan Exxen)")
+    run_parser.add_argument("--backend", dest="backends", action="append", help=f"BeautifulSoup ayrıştırıcısı, tekrarlanabilir (varsayılan kurulu olanlar: {', '.join(BACKENDS)})")
+    run_parser.add_argument("--sizes", type=parse_sizes, default=DEFAULT_SIZES, help="Liste/dizi sayfası boyutları (varsayılan 24,96,384)")
+    run_parser.add_argument("--archive", help="Sentetik sayfalar yerine kayıtlı fixture arşivindeki sayfaları kullan")
+    run_parser.add_argument("--min-time", type=float, default=0.5, help="Ölçüm başına en az süre, saniye (varsayılan 0.5)")
+    run_parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+
+    compare_parser = commands.add_parser("compare", help="İki sonuç dosyasını karşılaştır, gerilemeleri işaretle")
+    compare_parser.add_argument("old", help="Önceki sonuç dosyası")
+    compare_parser.add_argument("new", help="Yeni sonuç dosyası")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Gerileme eşiği (varsayılan 0.10 = %%10)")
+    return parser
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in ("run", "compare", "-h", "--help"):
+        argv.insert(0, "run")
+    args = build_parser().parse_args(argv)
+    return compare(args) if args.command == "compare" else run(args)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(main())
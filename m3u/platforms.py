@@ -0,0 +1,29 @@
+import os
+
+
+# Önceki playlist'lerin yeri; benchmark/test için M3U_PLAYLIST_DIR ile değiştirilebilir
+PLAYLIST_DIR = os.environ.get("M3U_PLAYLIST_DIR") or os.path.dirname(os.path.abspath(__file__))
+
+
+# Betik adı -> ürettiği playlist dosyası
+PLAYLISTS = {
+    "AmazonPrime": "Amazon Prime.m3u",
+    "Blutv": "Blutv.m3u",
+    "Disney": "Disney+.m3u",
+    "Exxen": "Exxen.m3u",
+    "Gain": "Gain.m3u",
+    "HBOMax": "HBO Max.m3u",
+    "Hulu": "Hulu.m3u",
+    "Netflix": "Netflix.m3u",
+    "Paramount": "Paramount+.m3u",
+    "TODTV": "TOD TV.m3u",
+    "Tabii": "Tabii.m3u",
+    "UnutulmazDiziler": "Unutulmaz Diziler.m3u",
+    "diziler": "Diziler.m3u",
+    "filmler": "filmfun.m3u",
+}
+
+
+def playlist_path(platform):
+    """Platformun depodaki (bir önceki çalıştırmadan kalan) playlist yolunu döndürür"""
+    return os.path.join(PLAYLIST_DIR, PLAYLISTS[platform])
@@ -0,0 +1,161 @@
+import logging
+import os
+
+from delta import diff_playlists, same_content, summary, write_changes
+from seed import parse_playlist
+
+
+logger = logging.getLogger(__name__)
+
+
+# Sırası gelmemiş en fazla bu kadar sonuç bellekte bekletilir
+REORDER_LIMIT = 256
+# Tampon bu boyutu geçince diske yazılır
+FLUSH_BYTES = 1 << 16
+
+
+def entry_identity(entry):
+    return entry.get("group-title", ""), entry.get("tvg-name") or entry["title"]
+
+
+class PlaylistWriter:
+    """Sonuçları sırasız kabul edip liste sırasıyla yazan, bitince atomik olarak yayınlayan playlist yazıcı
+
+    Sonuçlar geçici dosyaya (<dosya>.tmp) büyük parçalar halinde yazılır ve close()
+    ile os.replace kullanılarak yerine taşınır; okuyucular hiçbir zaman yarım playlist
+    görmez. Sırası gelen anahtarın sonucu henüz yoksa sonraki sonuçlar tamponda bekler;
+    tampon max_buffered'ı aşarsa sıradaki anahtar fill() ile (kayıtlı girdiler) yazılır.
+
+    fill() ya da add() None verirse anahtarın kayıtlı verisi yok demektir (örn. dağıtımdan
+    sonraki ilk kesilen çalıştırma). Böyle anahtar kaldıysa, yeni dosyada karşılığı olmayan
+    önceki playlist girdileri sona eklenir; kısmi çalıştırma playlist'i küçültmez.
+
+    previous_path verilirse yeni içerik önceki playlist ile karşılaştırılır: içerik aynıysa
+    dosya hiç yazılmaz (boş fark kaydedilir), farklıysa değişiklikler durum/<platform>.changes.json'a kaydedilir.
+    """
+
+    def __init__(self, path, keys, fill=None, lookup=None, max_buffered=REORDER_LIMIT,
+                 previous_path=None, platform=None):
+        self.path = path
+        self.previous_path = previous_path
+        self.platform = platform
+        self.delta = None
+        self.tmp_path = path + ".tmp"
+        self.keys = list(keys)
+        # Anahtarın liste sırasındaki (son) yeri; add() sırası geçmiş anahtarı dilim kopyalamadan ayırt eder
+        self.index = {key: index for index, key in enumerate(self.keys)}
+        self.fill = fill or (lambda key: [])
+        self.lookup = lookup or (lambda key: None)
+        self.max_buffered = max_buffered
+        self.pending = {}
+        self.position = 0
+        self.entries = 0
+        self.unfilled = 0
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._file = None
+
+    def open(self):
+        self._file = open(self.tmp_path, "w", encoding="utf-8")
+        self._file.write("#EXTM3U\n")
+        return self
+
+    def add(self, key, lines):
+        """Anahtarın satırlarını kabul eder; sırası gelenleri tampona aktarır"""
+        if self.index.get(key, -1) >= self.position:
+            self.pending[key] = lines
+        else:
+            logger.warning("[!] Sırası geçmiş ya da bilinmeyen sonuç yok sayıldı: %s", key)
+        self._drain()
+
+        if self.max_buffered is not None:
+            while len(self.pending) > self.max_buffered:
+                self._emit(self.fill(self.keys[self.position]))
+                self.position += 1
+                self._drain()
+
+    def _drain(self):
+        while self.position < len(self.keys):
+            key = self.keys[self.position]
+            if key in self.pending:
+                lines = self.pending.pop(key)
+            else:
+                lines = self.lookup(key)
+                if lines is None:
+                    return
+            self._emit(lines)
+            self.position += 1
+
+    def _emit(self, lines):
+        if lines is None:
+            self.unfilled += 1
+            return
+        if not lines:
+            return
+        self._buffer.extend(lines)
+        self._buffered_bytes += sum(len(line) for line in lines)
+        self.entries += len(lines) // 2
+        if self._buffered_bytes >= FLUSH_BYTES:
+            self._flush()
+
+    def _flush(self):
+        self._file.write("".join(self._buffer))
+        self._buffer = []
+        self._buffered_bytes = 0
+
+    def _keep_previous(self):
+        """Kayıtlı verisi olmayan anahtarların yerine önceki playlist'te olup yeni dosyada olmayan girdileri yazar
+
+        Önceki girdilerin hangi anahtara ait olduğu bilinmediğinden grup ve ada göre eşleştirilir
+        (tvg-id, sanitize_id yüzünden farklı bölümlerde çakışabilir).
+        """
+        if not self.previous_path or not os.path.exists(self.previous_path):
+            logger.warning("[!] %s anahtarın kayıtlı verisi yok ve önceki playlist bulunamadı: %s", self.unfilled, self.path)
+            return
+        self._file.flush()
+        written = {entry_identity(entry) for entry in parse_playlist(self.tmp_path)}
+        kept = 0
+        for entry in parse_playlist(self.previous_path):
+            if entry_identity(entry) not in written:
+                self._emit([entry["extinf"] + "\n", entry["url"] + "\n"])
+                kept += 1
+        self._flush()
+        logger.warning("[!] %s anahtarın kayıtlı verisi yok; önceki playlist'ten %s girdi korundu: %s", self.unfilled, kept, self.path)
+
+    def close(self):
+        """Kalan anahtarları (gelmeyenler fill ile) yazar ve dosyayı atomik olarak yayınlar"""
+        while self.position < len(self.keys):
+            key = self.keys[self.position]
+            if key in self.pending:
+                lines = self.pending.pop(key)
+            else:
+                lines = self.lookup(key)
+                if lines is None:
+                    lines = self.fill(key)
+            self._emit(lines)
+            self.position += 1
+
+        self._flush()
+        if self.unfilled:
+            self._keep_previous()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+        if self.previous_path:
+            if same_content(self.previous_path, self.tmp_path):
+                os.remove(self.tmp_path)
+                # Önceki çalıştırmanın farkı "son değişiklikler" olarak kalmasın
+                self.delta = {"added": [], "removed": [], "changed": []}
+                if self.platform:
+                    write_changes(self.platform, os.path.basename(self.path), self.delta)
+                logger.info("[✓] %s değişmedi (%s girdi), yeniden yazılmadı", self.path, self.entries)
+                return None
+            self.delta = diff_playlists(self.previous_path, self.tmp_path)
+            if self.platform:
+                write_changes(self.platform, os.path.basename(self.path), self.delta)
+
+        os.replace(self.tmp_path, self.path)
+        changes = f" ({summary(self.delta)})" if self.delta else ""
+        logger.info("[✓] %s yayınlandı: %s girdi%s", self.path, self.entries, changes)
+        return self.delta
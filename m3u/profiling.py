@@ -0,0 +1,199 @@
+import asyncio
+import cProfile
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+
+logger = logging.getLogger(__name__)
+
+
+PROFILE_MODES = ("cpu", "alloc", "asyncio")
+
+# cpu modunda yığın örnekleme aralığı (saniye)
+SAMPLE_INTERVAL = 0.005
+# alloc modunda saklanan çağrı yığını derinliği ve raporlanan satır sayısı
+TRACEMALLOC_FRAMES = 25
+TOP_ALLOCATIONS = 15
+
+
+class StackSampler:
+    """Ana thread'in yığınını aralıklarla örnekleyip katlanmış (collapsed) yığın sayılarını tutar
+
+    Duvar saati örneklemesidir: olay döngüsünün ağ beklerken durduğu select/epoll çağrısı da
+    sayılır, böylece flamegraph'ta ayrıştırma, log ve ağ bekleme payları birlikte görünür.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = {}
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+                frame = frame.f_back
+            if names:
+                stack = ";".join(reversed(names))
+                self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def write(self, path):
+        """flamegraph.pl / speedscope'un okuduğu 'çerçeve;çerçeve sayı' biçiminde yazar"""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class _TimedStep:
+    """Sarılan coroutine'in her adımındaki (send/throw) thread CPU süresini toplar"""
+
+    def __init__(self, coro, stats):
+        self.coro = coro
+        self.stats = stats
+
+    def __await__(self):
+        coro = self.coro
+        value, error = None, None
+        while True:
+            start = time.thread_time()
+            try:
+                yielded = coro.throw(error) if error is not None else coro.send(value)
+            except StopIteration as done:
+                return done.value
+            finally:
+                self.stats[1] += time.thread_time() - start
+            try:
+                value, error = (yield yielded), None
+            except BaseException as e:
+                value, error = None, e
+
+
+class RunProfiler:
+    """--profile cpu|alloc|asyncio seçeneklerini uygular ve çıktıları yazar
+
+    cpu: cProfile ile <platform>.pstats ve yığın örneklemesiyle <platform>.collapsed
+    alloc: aşama sınırlarında tracemalloc anlık görüntüleri ve aradaki farkların raporu
+    asyncio: coroutine (görev) adına göre toplam duvar ve CPU süresi
+    """
+
+    def __init__(self, platform):
+        self.platform = platform
+        self.mode = None
+        self.directory = "."
+        self._profile = None
+        self._sampler = None
+        self._snapshots = []
+        self._tasks = {}
+        self._started = None
+        self._peak = 0
+
+    def configure(self, mode=None, directory=None):
+        self.mode = mode
+        self.directory = directory or "."
+
+    def _path(self, suffix):
+        os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, f"{self.platform}.{suffix}")
+
+    def start(self):
+        """Profili başlatır; asyncio modu çalışan olay döngüsü içinden çağrılmalıdır"""
+        if self.mode == "cpu":
+            self._sampler = StackSampler()
+            self._sampler.start()
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self.mode == "alloc":
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self.checkpoint("start")
+        elif self.mode == "asyncio":
+            self._started = (time.perf_counter(), time.thread_time())
+            asyncio.get_running_loop().set_task_factory(self._task_factory)
+
+    def checkpoint(self, stage):
+        """alloc modunda aşama sınırında anlık görüntü alır"""
+        if self.mode != "alloc" or not tracemalloc.is_tracing():
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        snapshot.dump(self._path(f"{len(self._snapshots)}-{stage}.tracemalloc"))
+        self._snapshots.append((stage, snapshot))
+
+    def _task_factory(self, loop, coro, **kwargs):
+        name = getattr(coro, "__qualname__", type(coro).__name__)
+        stats = self._tasks.setdefault(name, [0.0, 0.0, 0])
+        stats[2] += 1
+
+        async def timed():
+            started = time.perf_counter()
+            try:
+                return await _TimedStep(coro, stats)
+            finally:
+                stats[0] += time.perf_counter() - started
+
+        return asyncio.Task(timed(), loop=loop, **kwargs)
+
+    def stop(self):
+        """Profili durdurur, çıktıları yazar ve özetini loglar"""
+        if self.mode == "cpu" and self._profile:
+            self._profile.disable()
+            self._sampler.stop()
+            self._profile.dump_stats(self._path("pstats"))
+            self._sampler.write(self._path("collapsed"))
+            logger.info("[✓] CPU profili yazıldı: %s, %s (%s örnek)", self._path('pstats'), self._path('collapsed'), sum(self._sampler.stacks.values()))
+            self._profile = None
+        elif self.mode == "alloc" and tracemalloc.is_tracing():
+            self.checkpoint("end")
+            self._peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self._write_alloc_report()
+        elif self.mode == "asyncio" and self._started:
+            asyncio.get_running_loop().set_task_factory(None)
+            self._write_asyncio_report()
+            self._started = None
+
+    def _write_alloc_report(self):
+        lines = []
+        for (previous, before), (stage, after) in zip(self._snapshots, self._snapshots[1:]):
+            diff = after.compare_to(before, "lineno")
+            grown = sum(stat.size_diff for stat in diff)
+            lines.append(f"== {previous} -> {stage}: {grown / 1024:+.0f} KiB")
+            for stat in diff[:TOP_ALLOCATIONS]:
+                lines.append(f"   {stat}")
+        lines.append(f"== en yüksek izlenen bellek: {self._peak / 1024 / 1024:.1f} MiB")
+
+        with open(self._path("alloc.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        logger.info("[✓] Bellek profili yazıldı: %s\n%s", self._path('alloc.txt'), "\n".join(line for line in lines if line.startswith("==")))
+
+    def _write_asyncio_report(self):
+        rows = sorted(self._tasks.items(), key=lambda item: -item[1][1])
+        # Görev olarak başlatılmayan kısım (main ve doğrudan await edilen coroutine'ler)
+        wall = time.perf_counter() - self._started[0]
+        cpu = time.thread_time() - self._started[1] - sum(stats[1] for stats in self._tasks.values())
+        rows.append(("main (görev dışı)", [wall, max(cpu, 0.0), 1]))
+        lines = [f"{'coroutine':<50} {'görev':>7} {'duvar s':>10} {'CPU s':>9} {'CPU %':>6}"]
+        for name, (wall, cpu, count) in rows:
+            share = 100.0 * cpu / wall if wall else 0.0
+            lines.append(f"{name[:50]:<50} {count:>7} {wall:>10.2f} {cpu:>9.2f} {share:>6.1f}")
+
+        with open(self._path("asyncio.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        logger.info("[✓] %s coroutine süreleri (%s):\n    %s", self.platform, self._path('asyncio.txt'), "\n    ".join(lines))
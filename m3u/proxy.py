@@ -0,0 +1,56 @@
+import os
+import zlib
+from urllib.parse import quote
+
+from resolution_cache import parse_stream_url, strip_proxy
+
+
+# Şablonda {host}, {url} ve {quoted_url} kullanılabilir
+DEFAULT_TEMPLATE = "https://{host}/?url={url}"
+DEFAULT_HOSTS = ["3.nejyoner19.workers.dev"]
+
+# Workflow'da komut satırı yerine ortam değişkeniyle de ayarlanabilir
+TEMPLATE_ENV = "M3U_PROXY_TEMPLATE"
+HOSTS_ENV = "M3U_PROXY_HOSTS"
+
+
+def env_template():
+    return os.environ.get(TEMPLATE_ENV) or DEFAULT_TEMPLATE
+
+
+def env_hosts():
+    hosts = [host.strip() for host in os.environ.get(HOSTS_ENV, "").split(",") if host.strip()]
+    return hosts or list(DEFAULT_HOSTS)
+
+
+class ProxyRewriter:
+    """Saklanan ham yayın URL'lerini playlist yazılırken proxy şablonuna göre dönüştürür
+
+    Birden fazla proxy host'u verilirse her yayın, file_id'sinin (yoksa URL'nin) sabit
+    özetine göre hep aynı host'a atanır; trafik worker'lara dağılır ve CDN alan adı
+    (d1/d2...) değişse bile girdinin proxy'si değişmez.
+    """
+
+    def __init__(self, template=None, hosts=None):
+        self.template = template or env_template()
+        self.hosts = list(hosts) if hosts else env_hosts()
+
+    def configure(self, template=None, hosts=None):
+        """Komut satırından gelen şablon/host listesini uygular (verilmeyenler aynı kalır)"""
+        if template:
+            self.template = template
+        if hosts:
+            self.hosts = list(hosts)
+
+    def host_for(self, url):
+        """URL için sabit özetle seçilen proxy host'u"""
+        file_id, _ = parse_stream_url(url)
+        digest = zlib.crc32((file_id or url).encode("utf-8"))
+        return self.hosts[digest % len(self.hosts)]
+
+    def rewrite(self, url):
+        """Ham URL'yi (önceden proxy'lenmişse önce öneki kaldırıp) proxy URL'sine çevirir"""
+        if not url:
+            return None
+        url = strip_proxy(url)
+        return self.template.format(host=self.host_for(url), url=url, quoted_url=quote(url, safe=""))
@@ -0,0 +1,84 @@
+import argparse
+import importlib
+import logging
+import os
+import time
+
+from cli import add_proxy_arguments
+from platforms import PLAYLISTS, playlist_path
+from playlist import PlaylistWriter
+from resolution_cache import strip_proxy
+from seed import EPISODE_NAME_PATTERN, parse_playlist
+
+
+logger = logging.getLogger(__name__)
+
+
+def entry_lines(module, entry):
+    """Eski playlist girdisini betiğin güncel biçimiyle yeniden üretir
+
+    URL girdinin kendisinden alınır: başlıkla kurulan önbellek anahtarı aynı adlı
+    başka bir girdiye ait olabilir.
+    """
+    url = strip_proxy(entry["url"])
+    logo = entry.get("tvg-logo", "")
+
+    match = EPISODE_NAME_PATTERN.match(entry.get("tvg-name", ""))
+    if match and hasattr(module, "format_episode_lines"):
+        title = entry.get("group-title") or match.group(1)
+        return module.format_episode_lines(title, logo, int(match.group(2)), int(match.group(3)), url)
+    return module.format_movie_lines(entry.get("tvg-name") or entry["title"], logo, url)
+
+
+def playlist_source(platform, module):
+    """Playlist anahtarlarını (liste sırasıyla) ve her anahtarın satırlarını üreten fonksiyonu döndürür
+
+    Durumda liste sırası varsa kayıtlı dizi/film verisi kullanılır; yoksa (henüz bu sürümle
+    çalışmamış platform) mevcut playlist'teki sıra ve girdiler esas alınır.
+    """
+    listing = module.STATE.listing
+    if listing:
+        if hasattr(module, "stored_series_lines"):
+            return listing, module.stored_series_lines
+        known_movies = module.STATE.section("movies")
+        return listing, lambda movie_url: module.stored_movie_lines(movie_url, known_movies)
+
+    path = playlist_path(platform)
+    entries = parse_playlist(path) if os.path.exists(path) else []
+    return range(len(entries)), lambda index: entry_lines(module, entries[index])
+
+
+def rebuild(platform, proxy_template=None, proxy_hosts=None):
+    """Platformun playlist'ini ağa çıkmadan kayıtlı durumdan yeniden yazar"""
+    module = importlib.import_module(platform)
+    module.PROXY.configure(proxy_template, proxy_hosts)
+    # Betiklerin girdi başına (proxy vb.) logları yeniden üretimde gereksiz
+    module.logger.setLevel(logging.WARNING)
+    keys, fill = playlist_source(platform, module)
+    if not keys:
+        logger.info("[!] %s: kayıtlı veri ya da playlist yok, atlandı", platform)
+        return 0
+
+    path = playlist_path(platform)
+    writer = PlaylistWriter(path, keys, fill=fill, max_buffered=None, previous_path=path, platform=platform).open()
+    writer.close()
+    return writer.entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tüm .m3u dosyalarını ağa çıkmadan kayıtlı çözüm verisinden yeniden üretir")
+    parser.add_argument("platforms", nargs="*", help="Platform adları (boşsa hepsi)")
+    add_proxy_arguments(parser)
+    args = parser.parse_args()
+
+    start_time = time.time()
+    total = 0
+    for platform in args.platforms or PLAYLISTS:
+        total += rebuild(platform, args.proxy_template, args.proxy_hosts)
+
+    logger.info("[✓] %s playlist yeniden üretildi, %s girdi. Süre: %.2f saniye", len(args.platforms or PLAYLISTS), total, time.time() - start_time)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
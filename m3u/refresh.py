@@ -0,0 +1,191 @@
+import hashlib
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+# Bölüm listesi bu kadar çalıştırma boyunca değişmeyen eski sezon donmuş sayılır
+FROZEN_AFTER_RUNS = 3
+# Donmuş sezonlar bu kadar çalıştırmada bir yeniden doğrulanır (6 saatte bir çalışmada ~1 hafta)
+REVERIFY_EVERY_RUNS = 28
+
+# Değişim sıklığına göre yenileme katmanları: son değişimden bu yana geçen süre -> yenileme aralığı
+DAY = 24 * 3600
+RUN_INTERVAL = 6 * 3600
+TIERS = [
+    ("hot", 14 * DAY, 0),
+    ("warm", 90 * DAY, 1 * DAY),
+    ("frozen", None, 7 * DAY),
+]
+TIER_INTERVALS = {name: interval for name, _, interval in TIERS}
+# Cron gecikmesi yüzünden bir günlük dizinin bir çalıştırma kaçırmaması için pay
+SCHEDULE_SLACK = 30 * 60
+
+
+def series_fingerprint(season_labels, episode_hrefs):
+    """Sezon butonları ve sıralı bölüm linklerinden dizi sayfası parmak izi üretir"""
+    digest = hashlib.sha1()
+    for label in season_labels:
+        digest.update(label.encode("utf-8") + b"\x00")
+    digest.update(b"\x01")
+    for href in episode_hrefs:
+        digest.update(href.encode("utf-8") + b"\x00")
+    return digest.hexdigest()
+
+
+def season_hashes(episodes):
+    """Normalize edilmiş bölüm listesinden sezon başına sıralı link özeti üretir"""
+    digests = {}
+    for episode_url, season_num, _ in episodes:
+        digests.setdefault(season_num, hashlib.sha1()).update(episode_url.encode("utf-8") + b"\x00")
+    return {season_num: digest.hexdigest() for season_num, digest in digests.items()}
+
+
+# Öncelik sırası (küçük olan önce işlenir)
+PRIORITY_NEW = 0
+PRIORITY_OVERDUE = 1
+PRIORITY_BY_TIER = {"hot": 2, "warm": 3, "frozen": 4}
+
+
+def classify(record, now):
+    """Dizinin son değişim zamanına göre katmanını (hot/warm/frozen) belirler"""
+    age = now - record.get("changed_at", now)
+    for name, changed_within, _ in TIERS:
+        if changed_within is None or age <= changed_within:
+            return name
+
+
+class SeriesState:
+    """Dizi başına parmak izi, meta veri ve bölüm listesini saklar"""
+
+    def __init__(self, store):
+        self.series = store.section("series")
+        self.checked = 0
+        self.skipped = 0
+        self.schedule_counts = {"scheduled": 0, "skipped": 0, "overdue": 0}
+        self.tier_counts = {name: 0 for name, _, _ in TIERS}
+
+    def get(self, series_url):
+        return self.series.get(series_url)
+
+    def is_unchanged(self, series_url, fingerprint):
+        """Parmak izi kayıtlıysa ve aynıysa True (ilk kez görülen dizi de değişmemiş sayılır)"""
+        known = self.series.get(series_url) or {}
+        return known.get("fingerprint") in (None, fingerprint)
+
+    def is_due(self, series_url, now=None):
+        """Dizinin bu çalıştırmada yenilenmesi gerekip gerekmediğini döndürür ve sayar"""
+        now = int(now if now is not None else time.time())
+        known = self.series.get(series_url)
+        if not known or "checked_at" not in known or not known.get("episodes"):
+            self.tier_counts["hot"] += 1
+            self.schedule_counts["scheduled"] += 1
+            return True
+
+        tier = known.get("tier") or classify(known, now)
+        interval = TIER_INTERVALS[tier]
+        self.tier_counts[tier] += 1
+
+        since_check = now - known["checked_at"]
+        if since_check + SCHEDULE_SLACK < interval:
+            self.schedule_counts["skipped"] += 1
+            return False
+
+        self.schedule_counts["scheduled"] += 1
+        if interval and since_check > interval + RUN_INTERVAL:
+            self.schedule_counts["overdue"] += 1
+        return True
+
+    def priority(self, series_url, now):
+        """Bütçe kısıtlıyken işin değerine göre sıralama anahtarı (yeni > geciken > hot > warm > frozen)"""
+        known = self.series.get(series_url)
+        if not known or "checked_at" not in known or not known.get("episodes"):
+            return PRIORITY_NEW
+        tier = known.get("tier") or classify(known, now)
+        interval = TIER_INTERVALS[tier]
+        if interval and now - known["checked_at"] > interval + RUN_INTERVAL:
+            return PRIORITY_OVERDUE
+        return PRIORITY_BY_TIER[tier]
+
+    def prioritize(self, series_urls, now=None):
+        """Dizileri önceliğe göre sıralar (eşitlerde liste sırası korunur)"""
+        now = int(now if now is not None else time.time())
+        return sorted(series_urls, key=lambda series_url: self.priority(series_url, now))
+
+    def plan_seasons(self, series_url, episodes, run_no):
+        """Sezon durumlarını günceller; (yenilenecek, yeniden doğrulanacak) sezon kümelerini döndürür
+
+        En yeni sezon ve bölüm listesi yakın zamanda değişen sezonlar her çalıştırmada
+        yenilenir. FROZEN_AFTER_RUNS boyunca sabit kalan eski sezonlar donar ve dizi
+        başına en fazla bir tanesi REVERIFY_EVERY_RUNS aralıkla yeniden doğrulanır.
+        """
+        hashes = season_hashes(episodes)
+        if not hashes:
+            return set(), set()
+
+        known = (self.series.get(series_url) or {}).get("seasons", {})
+        newest = max(hashes)
+        seasons = {}
+        refresh = set()
+        reverify = set()
+
+        for season_num in sorted(hashes):
+            digest = hashes[season_num]
+            old = known.get(str(season_num))
+            if old and old["hash"] == digest:
+                record = dict(old, stable_runs=old["stable_runs"] + 1)
+            else:
+                # İlk doğrulama zamanı kaydırılır, böylece donan sezonlar aynı çalıştırmada birikmez
+                offset = int(digest[:8], 16) % REVERIFY_EVERY_RUNS
+                record = {"hash": digest, "stable_runs": 0, "verified_run": run_no - offset}
+
+            frozen = season_num != newest and record["stable_runs"] >= FROZEN_AFTER_RUNS
+            if not frozen:
+                refresh.add(season_num)
+            elif not reverify and run_no - record["verified_run"] >= REVERIFY_EVERY_RUNS:
+                reverify.add(season_num)
+                record["verified_run"] = run_no
+
+            seasons[str(season_num)] = record
+
+        self.series.setdefault(series_url, {})["seasons"] = seasons
+        return refresh, reverify
+
+    def update(self, series_url, fingerprint, title, logo_url, episodes, now=None):
+        """Dizinin son durumunu kaydeder"""
+        now = int(now if now is not None else time.time())
+        known = self.series.get(series_url) or {}
+        changed = known.get("fingerprint") != fingerprint
+        record = {
+            "fingerprint": fingerprint,
+            "seasons": known.get("seasons", {}),
+            "title": title,
+            "logo": logo_url or "",
+            "episodes": [list(episode) for episode in episodes],
+            "checked_at": now,
+            "changed_at": now if changed else known.get("changed_at", now),
+        }
+        record["tier"] = classify(record, now)
+        self.series[series_url] = record
+
+    def count(self, skipped):
+        """Dizi sayfasının (parmak izi) önceki çalıştırmadan beri değişmediğini, yani bölüm çözümünün atlandığını sayar"""
+        self.checked += 1
+        if skipped:
+            self.skipped += 1
+
+    def report(self, platform):
+        """Platform için atlama oranını loglar"""
+        rate = 100.0 * self.skipped / self.checked if self.checked else 0.0
+        logger.info("[✓] %s: %s/%s dizi değişmemiş, bölüm çözümü atlandı (%%%.1f)", platform, self.skipped, self.checked, rate)
+
+        total = sum(self.tier_counts.values())
+        tiers = ", ".join(f"{name} {count}" for name, count in self.tier_counts.items())
+        counts = self.schedule_counts
+        logger.info(
+            "[✓] %s zamanlama: %s dizi | planlanan %s, atlanan %s, geciken %s | %s",
+            platform, total, counts["scheduled"], counts["skipped"], counts["overdue"], tiers,
+        )
+        return rate
@@ -0,0 +1,156 @@
+import argparse
+import asyncio
+import logging
+import os
+import random
+import ssl
+import subprocess
+import tempfile
+
+from aiohttp import web
+
+from transport import HOST_MAP_ENV, decode_body, load_archive
+
+
+logger = logging.getLogger(__name__)
+
+
+def self_signed_context():
+    """Yerel sunucu için geçici, kendinden imzalı sertifikayla SSL bağlamı üretir (openssl gerekir)"""
+    directory = tempfile.mkdtemp(prefix="m3u-replay-")
+    cert_path = os.path.join(directory, "cert.pem")
+    key_path = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-keyout", key_path, "-out", cert_path],
+        check=True, capture_output=True,
+    )
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert_path, key_path)
+    return context
+
+
+class ArchiveSite:
+    """Kaydedilmiş fixture arşivinden yanıt veren site"""
+
+    def __init__(self, path):
+        self.records = load_archive(path)
+
+    def respond(self, method, url):
+        """(status, başlıklar, gövde) döndürür; kayıt yoksa None"""
+        record = self.records.get((method, url))
+        if record is None and method == "HEAD":
+            record = self.records.get(("GET", url))
+        if record is None:
+            return None
+        return record["status"], record.get("headers", {}), decode_body(record)
+
+
+class ReplayServer:
+    """Bir siteyi (arşiv ya da sentetik) tüm host'lar için tek bir yerel HTTPS portundan sunar
+
+    Betikler M3U_HOST_MAP=127.0.0.1:<port> ile çalıştırıldığında tüm istekler bu sunucuya
+    gelir; istenen host Host başlığından okunur. Gecikme, sapma ve hata oranı ayarlanabilir.
+    """
+
+    def __init__(self, site, latency=0.0, jitter=0.0, error_rate=0.0, seed=None):
+        self.site = site
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.bytes_sent = 0
+        self.missing = 0
+        self.errors = 0
+        self.port = None
+        self._runner = None
+
+    async def handle(self, request):
+        self.requests += 1
+        delay = self.latency + (self.random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=503, text="injected error")
+
+        url = f"https://{request.host}{request.path_qs}"
+        result = self.site.respond(request.method, url)
+        if result is None:
+            self.missing += 1
+            logger.debug("[!] Kayıt yok: %s %s", request.method, url)
+            return web.Response(status=404, text="not recorded")
+
+        status, headers, body = result
+        self.bytes_sent += len(body)
+        return web.Response(status=status, headers=headers, body=body)
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Sunucuyu başlatır ve dinlenen portu döndürür (port=0: boş port seçilir)"""
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port, ssl_context=self_signed_context())
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    def host_map(self):
+        """Betiklere verilecek M3U_HOST_MAP değeri"""
+        return f"127.0.0.1:{self.port}"
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "bytes": self.bytes_sent,
+            "missing": self.missing,
+            "errors": self.errors,
+        }
+
+
+def add_server_arguments(parser):
+    """Replay ve sentetik sunucunun ortak seçenekleri"""
+    parser.add_argument("--port", type=int, default=8443, help="Dinlenecek port (varsayılan 8443)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Her yanıttan önce beklenecek süre (saniye)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Gecikmeye eklenecek rastgele sapma (± saniye)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 döndürülecek isteklerin oranı (0-1)")
+    parser.add_argument("--seed", type=int, help="Gecikme/hata rastgeleliği için tohum")
+    return parser
+
+
+async def serve(server, port):
+    """Sunucuyu başlatıp durdurulana kadar çalıştırır"""
+    await server.start(port=port)
+    logger.info("[✓] Sunucu hazır: %s=%s", HOST_MAP_ENV, server.host_map())
+    try:
+        await asyncio.Event().wait()
+    finally:
+        logger.info("[✓] İstatistik: %s", server.stats())
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kaydedilmiş fixture arşivini ağsız test için yerel HTTPS sunucusundan sunar")
+    parser.add_argument("archive", help="Recorder ile kaydedilen .jsonl.gz arşivi")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    site = ArchiveSite(args.archive)
+    logger.info("[+] %s kayıt yüklendi: %s", len(site.records), args.archive)
+    server = ReplayServer(site, args.latency, args.jitter, args.error_rate, args.seed)
+    try:
+        asyncio.run(serve(server, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -0,0 +1,64 @@
+import re
+import time
+from urllib.parse import unquote
+
+
+STREAM_URL_PATTERN = re.compile(r'https://([^./]+)\.premiumvideo\.click/(?:uploads/encode/|hls/)([a-zA-Z0-9]+)')
+PROXY_PREFIX_PATTERN = re.compile(r'^https?://[^/]+/[^?]*\?[a-z_]+=(https?(?::|%3A).+)$', re.IGNORECASE)
+
+
+def strip_proxy(url):
+    """create_proxy_url'in eklediği proxy önekini kaldırır (URL kodlanmışsa çözer)"""
+    match = PROXY_PREFIX_PATTERN.match(url)
+    return unquote(match.group(1)) if match else url
+
+
+def parse_stream_url(url):
+    """Ham M3U8 URL'sinden (file_id, domain) çıkarır"""
+    match = STREAM_URL_PATTERN.match(url)
+    if not match:
+        return None, None
+    return match.group(2), match.group(1)
+
+
+def episode_key(title, season_num, episode_num):
+    """Dizi bölümü için çözüm önbelleği anahtarı"""
+    return f"{title}|{season_num}|{episode_num}"
+
+
+class ResolutionCache:
+    """Çözülmüş ham M3U8 URL'lerini (file_id, domain) saklayan önbellek"""
+
+    def __init__(self, store):
+        self.entries = store.section("resolutions")
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+
+    def adopt(self, key, seed_key):
+        """key için kayıt yoksa seed_key altındaki (playlist'ten doldurulmuş) kaydı key'e taşır; key'i döndürür"""
+        if key not in self.entries and seed_key in self.entries:
+            self.entries[key] = self.entries.pop(seed_key)
+        return key
+
+    def put(self, key, url, logo="", ts=None):
+        """Ham (proxy'siz) URL'yi önbelleğe yazar"""
+        file_id, domain = parse_stream_url(url)
+        self.entries[key] = {
+            "url": url,
+            "file_id": file_id,
+            "domain": domain,
+            "logo": logo or "",
+            "ts": int(ts if ts is not None else time.time()),
+        }
+        return self.entries[key]
@@ -0,0 +1,106 @@
+import argparse
+import logging
+import os
+import re
+import time
+
+from platforms import PLAYLISTS, playlist_path
+from resolution_cache import ResolutionCache, episode_key, strip_proxy
+from state import StateStore
+
+
+logger = logging.getLogger(__name__)
+
+
+ATTRIBUTE_PATTERN = re.compile(r'([a-z-]+)="([^"]*)"')
+EPISODE_NAME_PATTERN = re.compile(r'^(.*) Sezon (\d+) Bölüm (\d+)$')
+
+
+def parse_playlist(path):
+    """M3U dosyasındaki #EXTINF + URL çiftlerini sözlük olarak döndürür (ham #EXTINF satırı "extinf" alanında)"""
+    entries = []
+    attributes = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("#EXTINF"):
+                attributes = dict(ATTRIBUTE_PATTERN.findall(line))
+                attributes["title"] = line.rsplit(",", 1)[-1]
+                attributes["extinf"] = line
+            elif line and not line.startswith("#") and attributes is not None:
+                attributes["url"] = line
+                entries.append(attributes)
+                attributes = None
+    return entries
+
+
+def entry_key(entry):
+    """Playlist girdisinin çözüm önbelleği anahtarını bulur (bölüm ya da film)"""
+    name = entry.get("tvg-name", "")
+    match = EPISODE_NAME_PATTERN.match(name)
+    if match:
+        return episode_key(entry.get("group-title") or match.group(1), int(match.group(2)), int(match.group(3)))
+    return name
+
+
+def seed_cache(cache, path):
+    """Playlist'i okuyup önbellekte olmayan girdileri ekler, eklenen sayısını döndürür
+
+    Aynı anahtara farklı URL'lerle düşen girdiler (örn. aynı adlı iki film) hangisinin
+    hangisi olduğu bilinemediği için eklenmez; betik onları yeniden çözer.
+    """
+    ts = int(os.path.getmtime(path))
+    entries = parse_playlist(path)
+    urls = {}
+    for entry in entries:
+        urls.setdefault(entry_key(entry), set()).add(strip_proxy(entry["url"]))
+    ambiguous = {key for key, found in urls.items() if len(found) > 1}
+    if ambiguous:
+        logger.info("[!] %s: %s anahtar birden fazla girdiyle eşleştiği için önbelleğe alınmadı", os.path.basename(path), len(ambiguous))
+
+    added = 0
+    for entry in entries:
+        key = entry_key(entry)
+        if not key or key in ambiguous or cache.get(key):
+            continue
+        cache.put(key, strip_proxy(entry["url"]), entry.get("tvg-logo", ""), ts=ts)
+        added += 1
+    return added
+
+
+def seed_if_empty(cache, platform):
+    """Önbellek boşsa depodaki son playlist'ten doldurur (soğuk başlangıcı önler)"""
+    path = playlist_path(platform)
+    if len(cache) or not os.path.exists(path):
+        return 0
+    added = seed_cache(cache, path)
+    logger.info("[+] Çözüm önbelleği %s dosyasından dolduruldu: %s girdi", os.path.basename(path), added)
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Depodaki .m3u dosyalarından çözüm önbelleğini doldurur")
+    parser.add_argument("platforms", nargs="*", help="Platform adları (boşsa hepsi)")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    total = 0
+    for platform in args.platforms or PLAYLISTS:
+        path = playlist_path(platform)
+        if not os.path.exists(path):
+            logger.info("[!] %s: playlist bulunamadı (%s)", platform, path)
+            continue
+
+        store = StateStore(platform)
+        cache = ResolutionCache(store)
+        added = seed_cache(cache, path)
+        store.save()
+        total += added
+        logger.info("[+] %s: %s girdi eklendi, önbellekte %s girdi var", platform, added, len(cache))
+
+    logger.info("[✓] Toplam %s girdi içe aktarıldı. Süre: %.2f saniye", total, time.time() - start_time)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
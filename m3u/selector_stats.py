@@ -0,0 +1,45 @@
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+# Bu kadar sayfada hiç eşleşmeyen seçici "ölü" sayılır ve sona atılır
+DEAD_AFTER_PAGES = 50
+
+
+class SelectorStats:
+    """Hangi seçicinin hangi sayfa türünü çözdüğünü sayar ve sıralamayı buna göre yapar"""
+
+    def __init__(self, store):
+        self.counters = store.section("selectors")
+
+    def _page_type(self, page_type):
+        return self.counters.setdefault(page_type, {"pages": 0, "hits": {}})
+
+    def order(self, page_type, selectors):
+        """Seçicileri en verimliden başlayarak sıralar, ölü seçicileri sona atar"""
+        stats = self._page_type(page_type)
+        stats["pages"] += 1
+        hits = stats["hits"]
+        pages = stats["pages"]
+
+        def sort_key(item):
+            index, selector = item
+            count = hits.get(selector, 0)
+            dead = count == 0 and pages > DEAD_AFTER_PAGES
+            return (dead, -count, index)
+
+        return [selector for _, selector in sorted(enumerate(selectors), key=sort_key)]
+
+    def hit(self, page_type, selector):
+        """Sayfayı çözen seçiciyi kaydeder"""
+        hits = self._page_type(page_type)["hits"]
+        hits[selector] = hits.get(selector, 0) + 1
+
+    def summary(self):
+        """Sayfa türü başına seçici isabet özetini loglar"""
+        for page_type, stats in sorted(self.counters.items()):
+            pages = stats["pages"]
+            parts = [f"{selector}={count}" for selector, count in sorted(stats["hits"].items(), key=lambda kv: -kv[1])]
+            logger.info("[*] Seçici istatistiği [%s] %s sayfa: %s", page_type, pages, ', '.join(parts) or 'isabet yok')
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+import signal
+
+
+logger = logging.getLogger(__name__)
+
+
+class GracefulShutdown:
+    """SIGTERM/SIGINT gelince yeni işi durdurur, kısa bir süre bekler, sonra ana görevi iptal eder
+
+    İlk sinyalde bütçe kapatılır; kalan diziler/filmler kayıtlı girdilerle yazılır ve
+    devam eden istekler grace saniye boyunca tamamlanabilir. Süre dolarsa ya da ikinci
+    sinyal gelirse ana görev iptal edilir; playlist ve durum finally bloklarında yazılır.
+    """
+
+    def __init__(self, budget, grace=10.0):
+        self.budget = budget
+        self.grace = grace
+        self.signum = None
+        self._task = None
+        self._timer = None
+
+    @property
+    def requested(self):
+        return self.signum is not None
+
+    @property
+    def exit_code(self):
+        return 128 + self.signum if self.signum else 0
+
+    def install(self, grace=None):
+        """Çalışan event loop'a sinyal işleyicilerini ekler (ana görevin içinden çağrılmalı)"""
+        if grace is not None:
+            self.grace = grace
+        loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self._on_signal, signum)
+            except (NotImplementedError, RuntimeError):
+                # Windows'ta add_signal_handler yok; varsayılan davranış geçerli
+                pass
+
+    def _on_signal(self, signum):
+        name = signal.Signals(signum).name
+        if self.signum is not None:
+            logger.warning("[!] İkinci sinyal (%s) alındı, hemen durduruluyor.", name)
+            self._cancel()
+            return
+
+        self.signum = signum
+        logger.warning("[!] %s alındı: yeni iş başlatılmıyor, devam eden istekler için %g saniye bekleniyor.", name, self.grace)
+        self.budget.stop()
+        self._timer = asyncio.get_running_loop().call_later(self.grace, self._cancel)
+
+    def _cancel(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
@@ -0,0 +1,69 @@
+import json
+import logging
+import os
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+# Benchmark/test çalıştırmaları depodaki durumu bozmasın diye M3U_STATE_DIR ile değiştirilebilir
+STATE_DIR = os.environ.get("M3U_STATE_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "durum")
+
+
+def platform_name(script_path):
+    """Betik dosya adından platform adını çıkarır (m3u/Exxen.py -> Exxen)"""
+    return os.path.splitext(os.path.basename(script_path))[0]
+
+
+class StateStore:
+    """Çalıştırmalar arasında saklanan platform durumu (durum/<platform>.json)"""
+
+    def __init__(self, platform, state_dir=STATE_DIR):
+        self.platform = platform
+        self.path = os.path.join(state_dir, f"{platform}.json")
+        self.data = {}
+        self.load()
+
+    def load(self):
+        """Durum dosyasını okur, yoksa ya da bozuksa boş durumla başlar"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+        except FileNotFoundError:
+            self.data = {}
+        except (ValueError, OSError) as e:
+            logger.warning("[!] Durum dosyası okunamadı (%s): %s", self.path, e)
+            self.data = {}
+
+    def begin_run(self):
+        """Çalıştırma sayacını artırır ve yeni çalıştırma numarasını döndürür"""
+        self.data["run"] = self.data.get("run", 0) + 1
+        return self.data["run"]
+
+    @property
+    def run_no(self):
+        return self.data.get("run", 0)
+
+    @property
+    def listing(self):
+        """Son çalıştırmadaki sitedeki liste sırası (dizi/film URL'leri)"""
+        return self.data.get("listing", [])
+
+    def set_listing(self, urls):
+        """Liste sırasını saklar; playlist ağa çıkmadan aynı sırayla yeniden üretilebilir"""
+        self.data["listing"] = list(urls)
+
+    def section(self, name):
+        """İsimli bölümü döndürür, yoksa boş olarak oluşturur"""
+        return self.data.setdefault(name, {})
+
+    def save(self):
+        """Durumu geçici dosyaya yazıp atomik olarak yerine taşır"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.data["updated_at"] = int(time.time())
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        logger.info("[✓] Durum kaydedildi: %s", self.path)
@@ -0,0 +1,234 @@
+import argparse
+import asyncio
+import hashlib
+import logging
+import random
+from functools import lru_cache
+from urllib.parse import parse_qs, urlsplit
+
+from replay import ReplayServer, add_server_arguments, serve
+
+
+logger = logging.getLogger(__name__)
+
+
+SITE_HOST = "dizifun5.com"
+DOMAINS = ["d1", "d2", "d3", "d4"]
+
+# Bölüm/film sayfasındaki oynatıcı türü -> varsayılan oran
+DEFAULT_PLAYER_MIX = {
+    "playhouse": 0.6,   # iframe[title="playhouse"] -> 302 -> dN CDN
+    "hex": 0.15,        # hexToString("...") script'i içinde playhouse URL'si
+    "gujan": 0.1,       # iframe[title="dizifunplay"] -> gujan /e/<id> sayfası
+    "fallback": 0.1,    # premiumvideo.click/player.php?file_id=<id> iframe'i
+    "none": 0.05,       # oynatıcı yok (no_iframe)
+}
+
+HTML_HEADERS = {"Content-Type": "text/html; charset=utf-8"}
+M3U8_HEADERS = {"Content-Type": "application/vnd.apple.mpegurl"}
+
+
+def parse_range(text):
+    """'1-8' ya da '5' biçimindeki aralığı (en az, en çok) çiftine çevirir"""
+    low, _, high = text.partition("-")
+    low = int(low)
+    high = int(high) if high else low
+    if low < 1 or high < low:
+        raise argparse.ArgumentTypeError(f"Geçersiz aralık: {text} (örnek: 1-8)")
+    return low, high
+
+
+def parse_mix(text):
+    """'playhouse=0.7,none=0.3' biçimindeki oynatıcı oranlarını sözlüğe çevirir"""
+    mix = {}
+    for item in text.split(","):
+        kind, _, weight = item.partition("=")
+        if kind.strip() not in DEFAULT_PLAYER_MIX:
+            raise argparse.ArgumentTypeError(f"Bilinmeyen oynatıcı türü: {kind} ({', '.join(DEFAULT_PLAYER_MIX)})")
+        mix[kind.strip()] = float(weight)
+    return mix
+
+
+def file_id(key):
+    """Girdi için sabit, yalnızca harf/rakamdan oluşan file_id"""
+    return hashlib.md5(key.encode("utf-8")).hexdigest()[:20]
+
+
+def file_domain(fid):
+    """file_id'nin bulunduğu CDN alan adı (playhouse bu adrese yönlendirir)"""
+    return DOMAINS[int(fid[0], 16) % len(DOMAINS)]
+
+
+def html_page(body, title="dizifun"):
+    return f'<!DOCTYPE html><html><head><title>{title}</title></head><body>{body}</body></html>'
+
+
+# test_m3u8_url içerikte "404", "500" vb. arar; örnek gövde bunları içermemeli
+M3U8_BODY = (
+    "#EXTM3U\n#EXT-X-VERSION:3\n"
+    "#EXT-X-STREAM-INF:BANDWIDTH=2128000,RESOLUTION=1280x720\n720p/index.m3u8\n"
+    "#EXT-X-STREAM-INF:BANDWIDTH=896000,RESOLUTION=640x360\n360p/index.m3u8\n"
+).encode("utf-8")
+
+
+class SyntheticSite:
+    """Betiklerin ayrıştırdığı DOM yapısıyla birebir aynı sayfaları isteğe göre üreten sahte dizifun sitesi
+
+    Her platform (/<platform>/diziler?p=N, diziler için /diziler?p=N) kendi katalog boyutu,
+    sezon ve bölüm dağılımıyla üretilir; /filmler?p=N film listesidir. Oynatıcı türleri
+    (playhouse, hex, gujan, fallback, yok) verilen oranlarla dağıtılır. Aynı tohumla
+    aynı site üretilir; sayfalar bellekte tutulmaz.
+    """
+
+    def __init__(self, series=500, movies=2000, seasons=(1, 6), episodes=(4, 16), page_size=24,
+                 player_mix=None, seed=0):
+        self.series = series
+        self.movies = movies
+        self.seasons = seasons
+        self.episodes = episodes
+        self.page_size = page_size
+        self.seed = seed
+        mix = player_mix or DEFAULT_PLAYER_MIX
+        self.player_kinds = list(mix)
+        self.player_weights = [mix[kind] for kind in self.player_kinds]
+
+    def _random(self, *key):
+        return random.Random(":".join(str(part) for part in (self.seed,) + key))
+
+    def _skewed(self, rng, bounds):
+        # Kısa diziler uzunlardan daha yaygın: mod alt sınırda
+        low, high = bounds
+        return int(round(rng.triangular(low, high, low)))
+
+    @lru_cache(maxsize=4096)
+    def series_layout(self, platform, index):
+        """Dizinin sezon -> bölüm sayısı düzeni"""
+        rng = self._random("series", platform, index)
+        return [self._skewed(rng, self.episodes) for _ in range(self._skewed(rng, self.seasons))]
+
+    def player_kind(self, key):
+        return self._random("player", key).choices(self.player_kinds, self.player_weights)[0]
+
+    # --- Sayfa üreticileri ---
+
+    def listing_page(self, items, page, href):
+        start = (page - 1) * self.page_size
+        links = "".join(
+            f'<div class="uk-width-large-1-6"><div class="uk-panel"><a class="uk-position-cover" href="{href(i)}"></a>'
+            f'<img src="/images/data/{i}.webp"></div></div>'
+            for i in range(start, min(start + self.page_size, items))
+        )
+        pagination = ""
+        if start + self.page_size < items:
+            pagination = f'<ul class="uk-pagination"><li><a class="uk-pagination-next" href="?p={page + 1}">Sonraki</a></li></ul>'
+        return html_page(f'<div class="uk-grid">{links}</div>{pagination}')
+
+    def series_page(self, platform, index):
+        layout = self.series_layout(platform, index)
+        buttons = "".join(f'<button class="season-btn" id="season-btn-{s}">{s}. Sezon</button>' for s in range(1, len(layout) + 1))
+        blocks = "".join(
+            f'<div id="season-{s}">'
+            + "".join(f'<div class="uk-width-large-1-5"><a href="?sezon={s}&bolum={e}">{e}. Bölüm</a></div>' for e in range(1, count + 1))
+            + "</div>"
+            for s, count in enumerate(layout, start=1)
+        )
+        title = f"{platform.title()} Dizi {index}"
+        return html_page(
+            f'<div class="text-bold">{title}</div><div class="media-cover"><img src="/images/data/{platform}-{index}.webp"></div>'
+            f'<div class="season-menu">{buttons}</div>{blocks}',
+            title,
+        )
+
+    def player_page(self, key, title):
+        fid = file_id(key)
+        kind = self.player_kind(key)
+        playhouse = f"https://playhouse.premiumvideo.click/player/{fid}"
+        if kind == "playhouse":
+            player = f'<iframe title="playhouse" src="{playhouse}" allowfullscreen></iframe>'
+        elif kind == "hex":
+            player = f'<script>var u = hexToString("{playhouse.encode("utf-8").hex()}"); load(u);</script>'
+        elif kind == "gujan":
+            player = f'<iframe title="dizifunplay" src="https://gujan.premiumvideo.click/e/{fid}"></iframe>'
+        elif kind == "fallback":
+            player = f'<iframe id="londonIframe" src="https://{file_domain(fid)}.premiumvideo.click/player.php?file_id={fid}"></iframe>'
+        else:
+            player = '<div class="player-error">Video bulunamadı</div>'
+        return html_page(f'<div class="text-bold">{title}</div><div class="media-cover"><img src="/images/data/{fid}.webp"></div>{player}', title)
+
+    # --- Yönlendirme ---
+
+    def respond(self, method, url):
+        parts = urlsplit(url)
+        query = parse_qs(parts.query)
+        host, path = parts.hostname, parts.path
+
+        if host == SITE_HOST:
+            return self._site(path, query)
+        if host == "playhouse.premiumvideo.click" and path.startswith("/player/"):
+            fid = path.rsplit("/", 1)[-1]
+            return 302, {"Location": f"https://{file_domain(fid)}.premiumvideo.click/player/{fid}"}, b""
+        if host == "gujan.premiumvideo.click":
+            if path.startswith("/e/"):
+                fid = path.rsplit("/", 1)[-1]
+                source = f"https://gujan.premiumvideo.click/hls/{fid}_o/playlist.m3u8"
+                body = html_page(f'<video><source src="{source}" type="application/x-mpegURL"></video>')
+                return 200, HTML_HEADERS, body.encode("utf-8")
+            if path.startswith("/hls/"):
+                return 200, M3U8_HEADERS, M3U8_BODY
+        if host and host.endswith(".premiumvideo.click"):
+            domain = host.split(".", 1)[0]
+            if path.startswith("/uploads/encode/"):
+                fid = path.split("/")[3]
+                if file_domain(fid) == domain:
+                    return 200, M3U8_HEADERS, M3U8_BODY
+                return 404, HTML_HEADERS, b"<html><title>404 Not Found</title></html>"
+            if path.startswith("/player"):
+                return 200, HTML_HEADERS, html_page("player").encode("utf-8")
+        return None
+
+    def _site(self, path, query):
+        page = int(query.get("p", ["1"])[0])
+        segments = [segment for segment in path.split("/") if segment]
+
+        if segments == ["filmler"]:
+            body = self.listing_page(self.movies, page, lambda i: f"/film/film-{i}")
+        elif segments == ["diziler"] or (len(segments) == 2 and segments[1] == "diziler"):
+            platform = segments[0]
+            body = self.listing_page(self.series, page, lambda i: f"/dizi/{platform}-{i}")
+        elif len(segments) == 2 and segments[0] == "dizi":
+            platform, _, index = segments[1].rpartition("-")
+            if "sezon" in query and "bolum" in query:
+                season, episode = int(query["sezon"][0]), int(query["bolum"][0])
+                body = self.player_page(f"{platform}-{index}-{season}-{episode}", f"Bölüm {episode}")
+            else:
+                body = self.series_page(platform, int(index))
+        elif len(segments) == 2 and segments[0] == "film":
+            index = segments[1].rsplit("-", 1)[-1]
+            body = self.player_page(f"film-{index}", f"Film {index}")
+        else:
+            return None
+        return 200, HTML_HEADERS, body.encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ölçek testleri için dizifun benzeri sentetik siteyi yerel HTTPS sunucusundan sunar")
+    parser.add_argument("--series", type=int, default=500, help="Platform başına dizi sayısı (varsayılan 500)")
+    parser.add_argument("--movies", type=int, default=2000, help="Film sayısı (varsayılan 2000)")
+    parser.add_argument("--seasons", type=parse_range, default=(1, 6), help="Dizi başına sezon aralığı (varsayılan 1-6, kısa diziler daha sık)")
+    parser.add_argument("--episodes", type=parse_range, default=(4, 16), help="Sezon başına bölüm aralığı (varsayılan 4-16)")
+    parser.add_argument("--page-size", type=int, default=24, help="Liste sayfası başına öğe (varsayılan 24)")
+    parser.add_argument("--player-mix", type=parse_mix, help="Oynatıcı türü oranları, örn. playhouse=0.6,hex=0.15,gujan=0.1,fallback=0.1,none=0.05")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    site = SyntheticSite(args.series, args.movies, args.seasons, args.episodes, args.page_size, args.player_mix, args.seed or 0)
+    server = ReplayServer(site, args.latency, args.jitter, args.error_rate, args.seed)
+    try:
+        asyncio.run(serve(server, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -0,0 +1,118 @@
+import logging
+import math
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+
+logger = logging.getLogger(__name__)
+
+
+# Süresi ölçülen pipeline aşamaları (tabloda bu sırayla gösterilir)
+LISTING = "listing"        # liste sayfaları (sayfalama dahil)
+METADATA = "metadata"      # dizi/film başlık ve logo
+EPISODES = "episodes"      # dizi sayfasından bölüm listesi
+GUJAN = "gujan"            # gujan iframe'inden M3U8 çözümü
+PLAYHOUSE = "playhouse"    # playhouse yönlendirmesi ve M3U8 doğrulaması
+FALLBACK = "fallback"      # d1-d4 domainlerinin tek tek denenmesi
+PROXY_URL = "proxy"        # proxy URL'si oluşturma
+WRITE = "write"            # playlist'e yazma
+
+STAGES = [LISTING, METADATA, EPISODES, GUJAN, PLAYHOUSE, FALLBACK, PROXY_URL, WRITE]
+
+NO_HOST = "-"
+
+
+def host_of(url):
+    return (urlsplit(url).hostname or NO_HOST) if url else NO_HOST
+
+
+class Histogram:
+    """Süre örneklerini tutar; yüzdelikler ve kova sayıları örneklerden hesaplanır"""
+
+    def __init__(self):
+        self.samples = []
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self.samples.append(seconds)
+        self.total += seconds
+
+    @property
+    def count(self):
+        return len(self.samples)
+
+    def percentile(self, q):
+        """En yakın sıra yöntemiyle q (0-100) yüzdeliği"""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+    def bucket_counts(self, bounds):
+        """Her üst sınır için o süreyi aşmayan örnek sayısı (kümülatif)"""
+        ordered = sorted(self.samples)
+        counts = []
+        index = 0
+        for bound in bounds:
+            while index < len(ordered) and ordered[index] <= bound:
+                index += 1
+            counts.append(index)
+        return counts
+
+
+class _Span:
+    """Ölçülen aşama; host sonradan (örn. yönlendirilen CDN domaini) güncellenebilir"""
+
+    def __init__(self, url):
+        self.url = url
+
+
+class StageTimer:
+    """Pipeline aşamalarının sürelerini host başına histogramlarda toplar
+
+    Her betik tek platformu çalıştırdığından toplamlar platform başınadır; çalıştırma
+    sonunda aşama/host başına p50, p95 ve p99 tablosu loglanır.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+
+    def observe(self, stage, seconds, url=None):
+        key = (stage, host_of(url))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+    @contextmanager
+    def stage(self, stage, url=None):
+        """Bloğun süresini aşamaya ekler; span.url değiştirilirse host olarak o kullanılır"""
+        span = _Span(url)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            self.observe(stage, time.perf_counter() - start, span.url)
+
+    def rows(self):
+        """(aşama, host, histogram) satırlarını aşama sırasına göre döndürür"""
+        order = {stage: index for index, stage in enumerate(STAGES)}
+        keys = sorted(self.histograms, key=lambda key: (order.get(key[0], len(order)), key[0], key[1]))
+        return [(stage, host, self.histograms[(stage, host)]) for stage, host in keys]
+
+    def report(self, platform):
+        """Aşama/host başına sayı, toplam süre ve yüzdelikleri tablo olarak loglar"""
+        rows = self.rows()
+        if not rows:
+            return
+        lines = [
+            f"[✓] {platform} aşama süreleri (ms):",
+            f"    {'aşama':<10} {'host':<30} {'adet':>7} {'toplam s':>9} {'p50':>8} {'p95':>8} {'p99':>8}",
+        ]
+        for stage, host, histogram in rows:
+            lines.append(
+                f"    {stage:<10} {host:<30} {histogram.count:>7} {histogram.total:>9.1f} "
+                f"{histogram.percentile(50) * 1000:>8.1f} {histogram.percentile(95) * 1000:>8.1f} {histogram.percentile(99) * 1000:>8.1f}"
+            )
+        logger.info("\n".join(lines))
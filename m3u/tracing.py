@@ -0,0 +1,144 @@
+import asyncio
+import contextvars
+import functools
+import heapq
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+
+logger = logging.getLogger(__name__)
+
+
+# Verilirse çalıştırma sonunda istek span'leri bu dosyaya Chrome Trace Event JSON olarak yazılır
+TRACE_ENV = "M3U_TRACE"
+
+# Açık span'in (id, satır) bilgisi; gather/create_task ile oluşturulan görevler üst span'i devralır
+CURRENT_SPAN = contextvars.ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """fetch_page, test_m3u8_url, playhouse yönlendirmesi gibi işleri span olarak kaydeder
+
+    Her asyncio görevi, ilk span'i açıldığında boştaki en küçük satıra (tid) yerleşir ve
+    en dış span'i kapanınca satırı bırakır; böylece satır sayısı o anki eşzamanlılığı
+    gösterir. Üst span'i (bölüm -> dizi) başka satırda olan span'ler akış okuyla bağlanır.
+    Çıktı Perfetto ya da about:tracing ile açılır. Kapalıyken span'ler hiçbir şey yapmaz.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.events = []
+        self.started = time.perf_counter()
+        self._next_id = 0
+        self._tasks = {}
+        self._free_lanes = []
+        self._lanes = 0
+
+    def configure(self, path=None):
+        """Çıktı dosyasını ayarlar (yoksa $M3U_TRACE); ikisi de yoksa izleme kapalı kalır"""
+        self.path = path or os.environ.get(TRACE_ENV) or None
+        self.started = time.perf_counter()
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def _now(self):
+        return (time.perf_counter() - self.started) * 1e6
+
+    def _acquire_lane(self, task):
+        slot = self._tasks.get(task)
+        if slot is None:
+            if self._free_lanes:
+                lane = heapq.heappop(self._free_lanes)
+            else:
+                self._lanes += 1
+                lane = self._lanes
+            slot = self._tasks[task] = [lane, 0]
+        slot[1] += 1
+        return slot[0]
+
+    def _release_lane(self, task):
+        slot = self._tasks[task]
+        slot[1] -= 1
+        if slot[1] == 0:
+            del self._tasks[task]
+            heapq.heappush(self._free_lanes, slot[0])
+
+    def span(self, name, detail=None, **args):
+        """Bloğu span olarak kaydeder; izleme kapalıysa boş bağlam döndürür"""
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, detail, args)
+
+    @contextmanager
+    def _span(self, name, detail, args):
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        lane = self._acquire_lane(task)
+        self._next_id += 1
+        span_id = self._next_id
+        parent = CURRENT_SPAN.get()
+        token = CURRENT_SPAN.set((span_id, lane))
+        start = self._now()
+        try:
+            yield
+        finally:
+            CURRENT_SPAN.reset(token)
+            end = self._now()
+            self._release_lane(task)
+            event_args = {"id": span_id, **args}
+            if detail is not None:
+                event_args["detail"] = str(detail)
+            if parent:
+                event_args["parent"] = parent[0]
+                if parent[1] != lane:
+                    # Üst span başka satırdaysa (ör. dizi -> paralel bölümler) akış oku çizilir
+                    self.events.append({"name": "parent", "cat": "link", "ph": "s", "id": span_id, "pid": os.getpid(), "tid": parent[1], "ts": start})
+                    self.events.append({"name": "parent", "cat": "link", "ph": "f", "bp": "e", "id": span_id, "pid": os.getpid(), "tid": lane, "ts": start})
+            self.events.append({
+                "name": name,
+                "cat": name,
+                "ph": "X",
+                "pid": os.getpid(),
+                "tid": lane,
+                "ts": round(start, 1),
+                "dur": round(end - start, 1),
+                "args": event_args,
+            })
+
+    def traced(self, name, detail_arg=1):
+        """Async fonksiyonu span'e saran dekoratör; detay olarak verilen sıradaki argüman yazılır"""
+        def decorate(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return await func(*args, **kwargs)
+                with self._span(name, args[detail_arg] if len(args) > detail_arg else None, {}):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def write(self, platform):
+        """Span'leri Chrome Trace Event JSON olarak yazar; izleme kapalıysa hiçbir şey yapmaz"""
+        if not self.enabled:
+            return None
+        pid = os.getpid()
+        metadata = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": platform}}]
+        metadata += [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": lane, "args": {"name": f"eşzamanlı iş {lane}"}}
+            for lane in range(1, self._lanes + 1)
+        ]
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        logger.info("[✓] İzleme kaydedildi: %s (%s olay, en fazla %s eşzamanlı iş)", self.path, len(self.events), self._lanes)
+        return self.path
@@ -0,0 +1,238 @@
+import base64
+import gzip
+import json
+import logging
+import os
+import socket
+
+import aiohttp
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import DefaultResolver
+
+
+logger = logging.getLogger(__name__)
+
+
+# "127.0.0.1:8443" (tüm host'lar) ya da "dizifun5.com=127.0.0.1:8443,*.premiumvideo.click=127.0.0.1:8443"
+HOST_MAP_ENV = "M3U_HOST_MAP"
+# Verilirse yapılan istek/yanıtlar bu fixture arşivine (.jsonl.gz) kaydedilir
+RECORD_ENV = "M3U_RECORD"
+
+# Arşive yazılan yanıt başlıkları (Content-Length yazılmaz; kısmi okunan gövdelerle çelişir)
+RECORDED_HEADERS = ("Content-Type", "Location")
+
+
+def parse_host_map(spec):
+    """Host eşleme tanımını {desen: (ip, port)} sözlüğüne çevirir ("*" tüm host'lar)"""
+    mapping = {}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        pattern, _, target = item.rpartition("=")
+        ip, _, port = target.rpartition(":")
+        mapping[pattern or "*"] = (ip or "127.0.0.1", int(port))
+    return mapping
+
+
+def match_host(mapping, host):
+    """Host için eşlenen (ip, port) çiftini döndürür; eşleşme yoksa None"""
+    if host in mapping:
+        return mapping[host]
+    for pattern, target in mapping.items():
+        if pattern.startswith("*.") and host.endswith(pattern[1:]):
+            return target
+    return mapping.get("*")
+
+
+class MappedResolver(AbstractResolver):
+    """Eşlenen host'ları yerel replay sunucusuna çözen DNS çözücü
+
+    URL'ler, Host başlığı ve yönlendirmeler değişmeden kalır; yalnızca bağlantı yerel
+    adrese gider. Eşlenmeyen host'lar normal DNS ile çözülür.
+    """
+
+    def __init__(self, mapping):
+        self.mapping = mapping
+        self._default = DefaultResolver()
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        target = match_host(self.mapping, host)
+        if target is None:
+            return await self._default.resolve(host, port, family)
+        ip, mapped_port = target
+        return [{
+            "hostname": host,
+            "host": ip,
+            "port": mapped_port,
+            "family": socket.AF_INET,
+            "proto": 0,
+            "flags": socket.AI_NUMERICHOST,
+        }]
+
+    async def close(self):
+        await self._default.close()
+
+
+def encode_body(data):
+    """Gövdeyi arşive yazılabilir hale getirir (metin değilse base64)"""
+    try:
+        return {"text": data.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(data).decode("ascii")}
+
+
+def decode_body(record):
+    if "base64" in record:
+        return base64.b64decode(record["base64"])
+    return record.get("text", "").encode("utf-8")
+
+
+def load_archive(path):
+    """Fixture arşivini {(method, url): kayıt} sözlüğü olarak okur"""
+    records = {}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            records[(record["method"], record["url"])] = record
+    return records
+
+
+def save_archive(path, records):
+    """Kayıtları geçici dosyaya yazıp atomik olarak yerine taşır"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        for record in records.values():
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+    os.replace(tmp_path, path)
+
+
+class _TeeStream:
+    """Yanıt gövdesinden okunan her parçayı kayda da ekleyen StreamReader sarmalayıcısı"""
+
+    def __init__(self, stream, chunks):
+        self._stream = stream
+        self._chunks = chunks
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    async def read(self, n=-1):
+        data = await self._stream.read(n)
+        self._chunks.append(data)
+        return data
+
+
+class Recorder:
+    """İstek/yanıt çiftlerini aiohttp trace olaylarıyla yakalayıp fixture arşivine yazar
+
+    Listeleme, dizi/bölüm sayfaları, gujan iframe'leri, playhouse yönlendirmeleri ve
+    master.m3u8 başları (istemcinin okuduğu kadarı) kaydedilir. Var olan arşive eklenir.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.records = load_archive(path) if os.path.exists(path) else {}
+        self._pending = []
+
+    def trace_config(self):
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_redirect.append(self._on_redirect)
+        trace_config.on_request_end.append(self._on_end)
+        return trace_config
+
+    def _headers(self, response):
+        return {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers}
+
+    async def _on_redirect(self, session, context, params):
+        response = params.response
+        self.records[(params.method, str(params.url))] = {
+            "method": params.method,
+            "url": str(params.url),
+            "status": response.status,
+            "headers": self._headers(response),
+        }
+
+    async def _on_end(self, session, context, params):
+        response = params.response
+        chunks = []
+        response.content = _TeeStream(response.content, chunks)
+        record = {
+            "method": params.method,
+            "url": str(params.url),
+            "status": response.status,
+            "headers": self._headers(response),
+        }
+        self.records[(params.method, str(params.url))] = record
+        self._pending.append((record, chunks))
+
+    def save(self):
+        for record, chunks in self._pending:
+            record.update(encode_body(b"".join(chunks)))
+        self._pending = []
+        save_archive(self.path, self.records)
+        logger.info("[✓] %s yanıt kaydedildi: %s", len(self.records), self.path)
+
+
+RECORDER = Recorder(os.environ[RECORD_ENV]) if os.environ.get(RECORD_ENV) else None
+
+
+class TrafficStats:
+    """Host ve durum koduna göre yapılan istekleri ve alınan gövde baytlarını sayar
+
+    Yönlendirmeler (302) ayrı istek olarak sayılır; bağlantı/zaman aşımı hataları
+    "error" durumuyla kaydedilir.
+    """
+
+    def __init__(self):
+        self.requests = {}
+        self.bytes = {}
+
+    def trace_config(self):
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_redirect.append(self._on_response)
+        trace_config.on_request_end.append(self._on_response)
+        trace_config.on_request_exception.append(self._on_exception)
+        trace_config.on_response_chunk_received.append(self._on_chunk)
+        return trace_config
+
+    def count(self, host, status):
+        key = (host or "-", status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+
+    async def _on_response(self, session, context, params):
+        self.count(params.url.host, str(params.response.status))
+
+    async def _on_exception(self, session, context, params):
+        self.count(params.url.host, "error")
+
+    async def _on_chunk(self, session, context, params):
+        host = params.url.host or "-"
+        self.bytes[host] = self.bytes.get(host, 0) + len(params.chunk)
+
+
+TRAFFIC = TrafficStats()
+
+
+class RecordingSession(aiohttp.ClientSession):
+    """Kapanırken kaydedilen yanıtları arşive yazan oturum"""
+
+    async def close(self):
+        await super().close()
+        RECORDER.save()
+
+
+def client_session(limit=100):
+    """Betiklerin kullandığı ClientSession'ı ortam değişkenlerine göre (host eşleme, kayıt) kurar"""
+    mapping = parse_host_map(os.environ.get(HOST_MAP_ENV))
+    if mapping:
+        # Replay sunucusu kendinden imzalı sertifika kullanır
+        connector = aiohttp.TCPConnector(limit=limit, resolver=MappedResolver(mapping), ssl=False)
+    else:
+        connector = aiohttp.TCPConnector(limit=limit)
+
+    trace_configs = [TRAFFIC.trace_config()]
+    if RECORDER:
+        return RecordingSession(connector=connector, trace_configs=trace_configs + [RECORDER.trace_config()])
+    return aiohttp.ClientSession(connector=connector, trace_configs=trace_configs)
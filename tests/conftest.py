@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+
+SCRIPT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "m3u")
+sys.path.insert(0, SCRIPT_DIR)
+
+# Modüller içe aktarılırken durum ve playlist dizinini okur; testler depodaki dosyalara dokunmasın
+os.environ["M3U_STATE_DIR"] = tempfile.mkdtemp(prefix="m3u-test-durum-")
+os.environ["M3U_PLAYLIST_DIR"] = tempfile.mkdtemp(prefix="m3u-test-playlist-")
@@ -0,0 +1,45 @@
+import json
+import os
+
+from delta import diff_entries, write_changes
+
+
+def entry(tvg_id, url, title=None):
+    return {"tvg-id": tvg_id, "url": url, "title": title or tvg_id}
+
+
+def test_identical_lists_have_no_changes():
+    entries = [entry("a", "u1"), entry("b", "u2")]
+    assert diff_entries(entries, list(entries)) == {"added": [], "removed": [], "changed": []}
+
+
+def test_added_removed_and_changed_entries():
+    delta = diff_entries([entry("a", "u1"), entry("b", "u2")], [entry("a", "u1b"), entry("c", "u3")])
+    assert delta["changed"] == [{"tvg-id": "a", "title": "a", "old_url": "u1", "url": "u1b"}]
+    assert delta["added"] == [{"tvg-id": "c", "title": "c", "url": "u3"}]
+    assert delta["removed"] == [{"tvg-id": "b", "title": "b", "url": "u2"}]
+
+
+def test_reordering_is_not_a_change():
+    delta = diff_entries([entry("a", "u1"), entry("b", "u2")], [entry("b", "u2"), entry("a", "u1")])
+    assert delta == {"added": [], "removed": [], "changed": []}
+
+
+def test_duplicate_ids_are_matched_one_to_one():
+    # sanitize_id çakışması: iki girdi aynı tvg-id'yi taşıyabilir
+    delta = diff_entries([entry("x", "u1"), entry("x", "u2")], [entry("x", "u1"), entry("x", "u3")])
+    assert delta["changed"] == [{"tvg-id": "x", "title": "x", "old_url": "u2", "url": "u3"}]
+    assert delta["added"] == [] and delta["removed"] == []
+
+
+def test_same_delta_leaves_changes_file_untouched(tmp_path):
+    delta = {"added": [], "removed": [], "changed": []}
+    path = write_changes("Exxen", "Exxen.m3u", delta, state_dir=str(tmp_path))
+    os.utime(path, (0, 0))
+
+    assert write_changes("Exxen", "Exxen.m3u", delta, state_dir=str(tmp_path)) == path
+    assert os.path.getmtime(path) == 0
+
+    write_changes("Exxen", "Exxen.m3u", {"added": [entry("a", "u1")], "removed": [], "changed": []}, state_dir=str(tmp_path))
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["added"] == [entry("a", "u1")]
@@ -0,0 +1,77 @@
+from failures import (BACKOFF_BASE, BACKOFF_MAX, NO_FILE_ID, NO_IFRAME, NO_PAGE, PROBE_FAILED, CarryForward,
+                      NegativeCache, failure_reason)
+from refresh import DAY
+from resolution_cache import ResolutionCache
+from state import StateStore
+
+
+NOW = 1_700_000_000
+URL = "https://dizifun5.com/dizi/exxen-0?sezon=1&bolum=1"
+
+
+def store(tmp_path):
+    return StateStore("Exxen", state_dir=str(tmp_path))
+
+
+def test_failure_reason():
+    assert failure_reason(False, None) == NO_IFRAME
+    assert failure_reason(True, None) == NO_FILE_ID
+    assert failure_reason(True, "abc") == PROBE_FAILED
+
+
+def test_backoff_doubles_up_to_the_limit(tmp_path):
+    cache = NegativeCache(store(tmp_path), now=NOW)
+    delays = []
+    for _ in range(12):
+        cache.record(URL, NO_IFRAME, now=NOW)
+        delays.append(cache.entries[URL]["retry_at"] - NOW)
+    assert delays[:3] == [BACKOFF_BASE, 2 * BACKOFF_BASE, 4 * BACKOFF_BASE]
+    assert max(delays) == BACKOFF_MAX
+
+
+def test_backed_off_entry_is_skipped_until_retry(tmp_path):
+    cache = NegativeCache(store(tmp_path), now=NOW)
+    cache.record(URL, PROBE_FAILED, now=NOW)
+    assert cache.pending_reason(URL, now=NOW + 60) == PROBE_FAILED
+    assert cache.pending_reason(URL, now=NOW + BACKOFF_BASE) is None
+    assert cache.skipped == {PROBE_FAILED: 1}
+
+
+def test_transient_failures_are_not_backed_off(tmp_path):
+    cache = NegativeCache(store(tmp_path), now=NOW)
+    cache.record(URL, NO_PAGE, now=NOW)
+    assert cache.pending_reason(URL, now=NOW) is None
+
+
+def test_success_clears_the_record(tmp_path):
+    cache = NegativeCache(store(tmp_path), now=NOW)
+    cache.record(URL, NO_FILE_ID, now=NOW)
+    cache.record(URL, None, now=NOW)
+    assert len(cache) == 0
+
+
+def test_unverified_url_is_kept_with_the_record(tmp_path):
+    cache = NegativeCache(store(tmp_path), now=NOW)
+    cache.record(URL, PROBE_FAILED, "https://d2.premiumvideo.click/uploads/encode/abc/master.m3u8", now=NOW)
+    assert cache.fallback(URL).startswith("https://d2.")
+    cache.record(URL, NO_IFRAME, now=NOW)
+    assert cache.fallback(URL) is None
+
+
+def test_old_records_are_dropped_on_load(tmp_path):
+    state = store(tmp_path)
+    NegativeCache(state, now=NOW).record(URL, NO_IFRAME, now=NOW)
+    assert len(NegativeCache(state, now=NOW + 61 * DAY)) == 0
+
+
+def test_carry_forward_only_for_recent_transient_failures(tmp_path):
+    resolutions = ResolutionCache(store(tmp_path))
+    resolutions.put("Dizi|1|1", "https://d1.premiumvideo.click/uploads/encode/abc/master.m3u8", ts=NOW)
+    carry = CarryForward(max_age=7 * DAY)
+
+    assert carry.url(resolutions, "Dizi|1|1", NO_PAGE, now=NOW + DAY).startswith("https://d1.")
+    assert carry.url(resolutions, "Dizi|1|1", PROBE_FAILED, now=NOW + DAY)
+    assert carry.url(resolutions, "Dizi|1|1", NO_IFRAME, now=NOW + DAY) is None
+    assert carry.url(resolutions, "Dizi|1|1", NO_PAGE, now=NOW + 8 * DAY) is None
+    assert carry.url(resolutions, "Dizi|1|2", NO_PAGE, now=NOW) is None
+    assert len(carry.carried) == 2 and carry.expired == 1
@@ -0,0 +1,82 @@
+import os
+
+from playlist import PlaylistWriter
+from seed import parse_playlist
+
+
+def lines(name, url, group="Dizi"):
+    return [f'#EXTINF:-1 tvg-id="{name}" tvg-name="{name}" group-title="{group}",{name}\n', url + "\n"]
+
+
+def write(path, keys, results, **kwargs):
+    writer = PlaylistWriter(str(path), keys, **kwargs).open()
+    for key, value in results:
+        writer.add(key, value)
+    writer.close()
+    return writer
+
+
+def names(path):
+    return [entry["tvg-name"] for entry in parse_playlist(str(path))]
+
+
+def test_out_of_order_results_are_written_in_key_order(tmp_path):
+    path = tmp_path / "a.m3u"
+    write(path, ["a", "b", "c"], [("c", lines("c", "u3")), ("a", lines("a", "u1")), ("b", lines("b", "u2"))])
+    assert names(path) == ["a", "b", "c"]
+    assert not os.path.exists(str(path) + ".tmp")
+
+
+def test_full_buffer_fills_the_head_key(tmp_path):
+    path = tmp_path / "a.m3u"
+    fills = []
+
+    def fill(key):
+        fills.append(key)
+        return lines(key, "stored")
+
+    writer = write(path, ["a", "b", "c"], [("b", lines("b", "u2")), ("c", lines("c", "u3"))], fill=fill, max_buffered=1)
+    assert fills == ["a"]
+    assert names(path) == ["a", "b", "c"]
+    assert writer.entries == 3
+
+
+def test_late_and_unknown_keys_are_ignored(tmp_path):
+    path = tmp_path / "a.m3u"
+    writer = write(path, ["a", "b"], [("a", lines("a", "u1")), ("a", lines("a", "again")), ("x", lines("x", "u"))],
+                   fill=lambda key: lines(key, "stored"))
+    assert names(path) == ["a", "b"]
+    assert writer.entries == 2
+
+
+def test_keys_without_stored_data_keep_previous_entries(tmp_path):
+    path = tmp_path / "a.m3u"
+    write(path, ["a", "b"], [("a", lines("a", "u1")), ("b", lines("b", "u2"))])
+
+    # İkinci çalıştırma yalnızca "a"yı işledi, "b"nin kayıtlı verisi yok
+    writer = write(path, ["a", "b"], [("a", lines("a", "new"))], fill=lambda key: None, previous_path=str(path))
+    entries = {entry["tvg-name"]: entry["url"] for entry in parse_playlist(str(path))}
+    assert entries == {"a": "new", "b": "u2"}
+    assert writer.unfilled == 1
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    path = tmp_path / "a.m3u"
+    results = [("a", lines("a", "u1")), ("b", lines("b", "u2"))]
+    write(path, ["a", "b"], results)
+    mtime = os.path.getmtime(path)
+    os.utime(path, (mtime - 100, mtime - 100))
+
+    writer = write(path, ["a", "b"], results, previous_path=str(path))
+    assert writer.delta == {"added": [], "removed": [], "changed": []}
+    assert os.path.getmtime(path) == mtime - 100
+    assert not os.path.exists(str(path) + ".tmp")
+
+
+def test_changed_content_records_delta(tmp_path):
+    path = tmp_path / "a.m3u"
+    write(path, ["a", "b"], [("a", lines("a", "u1")), ("b", lines("b", "u2"))])
+    writer = write(path, ["a", "c"], [("a", lines("a", "u1b")), ("c", lines("c", "u3"))], previous_path=str(path))
+    assert [item["title"] for item in writer.delta["changed"]] == ["a"]
+    assert [item["title"] for item in writer.delta["added"]] == ["c"]
+    assert [item["title"] for item in writer.delta["removed"]] == ["b"]
@@ -0,0 +1,80 @@
+from refresh import DAY, FROZEN_AFTER_RUNS, REVERIFY_EVERY_RUNS, SeriesState
+from state import StateStore
+
+
+NOW = 1_700_000_000
+URL = "https://dizifun5.com/dizi/exxen-0"
+
+
+def state(tmp_path):
+    return SeriesState(StateStore("Exxen", state_dir=str(tmp_path)))
+
+
+def episodes(layout):
+    return [(f"{URL}?sezon={s}&bolum={e}", s, e) for s, count in enumerate(layout, start=1) for e in range(1, count + 1)]
+
+
+def test_new_series_is_due(tmp_path):
+    series = state(tmp_path)
+    assert series.is_due(URL, now=NOW)
+    assert series.schedule_counts["scheduled"] == 1
+
+
+def test_recently_changed_series_is_checked_every_run(tmp_path):
+    series = state(tmp_path)
+    series.update(URL, "fp", "Dizi", "", episodes([3]), now=NOW)
+    assert series.is_due(URL, now=NOW + 60)
+
+
+def test_warm_series_waits_a_day(tmp_path):
+    series = state(tmp_path)
+    series.update(URL, "fp", "Dizi", "", episodes([3]), now=NOW - 30 * DAY)
+    series.update(URL, "fp", "Dizi", "", episodes([3]), now=NOW)
+    assert series.get(URL)["tier"] == "warm"
+
+    assert not series.is_due(URL, now=NOW + 6 * 3600)
+    assert series.is_due(URL, now=NOW + DAY)
+    assert series.schedule_counts == {"scheduled": 1, "skipped": 1, "overdue": 0}
+
+
+def test_fingerprint_change_is_detected(tmp_path):
+    series = state(tmp_path)
+    assert series.is_unchanged(URL, "fp")
+    series.update(URL, "fp", "Dizi", "", episodes([3]), now=NOW)
+    assert series.is_unchanged(URL, "fp")
+    assert not series.is_unchanged(URL, "fp2")
+
+
+def test_old_seasons_freeze_and_newest_is_always_refreshed(tmp_path):
+    series = state(tmp_path)
+    layout = episodes([4, 4, 2])
+    for run in range(1, FROZEN_AFTER_RUNS + 1):
+        refresh, _ = series.plan_seasons(URL, layout, run)
+        assert refresh == {1, 2, 3}
+
+    refresh, _ = series.plan_seasons(URL, layout, FROZEN_AFTER_RUNS + 1)
+    assert refresh == {3}
+
+
+def test_changed_season_is_refreshed_again(tmp_path):
+    series = state(tmp_path)
+    for run in range(1, FROZEN_AFTER_RUNS + 2):
+        series.plan_seasons(URL, episodes([4, 2]), run)
+
+    refresh, _ = series.plan_seasons(URL, episodes([5, 2]), FROZEN_AFTER_RUNS + 2)
+    assert refresh == {1, 2}
+
+
+def test_at_most_one_frozen_season_is_reverified_per_run(tmp_path):
+    series = state(tmp_path)
+    layout = episodes([4, 4, 4, 2])
+    reverified = []
+    for run in range(1, 3 * REVERIFY_EVERY_RUNS):
+        _, reverify = series.plan_seasons(URL, layout, run)
+        assert len(reverify) <= 1
+        reverified.extend((run, season) for season in reverify)
+
+    for season in (1, 2, 3):
+        runs = [run for run, reverified_season in reverified if reverified_season == season]
+        assert runs, season
+        assert all(b - a >= REVERIFY_EVERY_RUNS for a, b in zip(runs, runs[1:]))
@@ -0,0 +1,88 @@
+import json
+import os
+
+import pytest
+
+from bench import ServerThread, run_platform
+from replay import ReplayServer
+from seed import parse_playlist
+from synthetic import SyntheticSite
+
+
+class FaultySite(SyntheticSite):
+    """Sentetik site; CDN'deki M3U8'leri ya da dizi sayfalarını isteğe göre bozar"""
+
+    def __init__(self, **kwargs):
+        super().__init__(series=3, movies=2, seasons=(1, 2), episodes=(2, 4), **kwargs)
+        self.dead_cdn = False
+        self.broken_series = False
+        self.probes = 0
+
+    def respond(self, method, url):
+        if "/uploads/encode/" in url:
+            self.probes += 1
+            if self.dead_cdn:
+                return 404, {"Content-Type": "text/html"}, b"<html><title>404 Not Found</title></html>"
+        if self.broken_series and "/dizi/" in url and "bolum=" not in url:
+            return 500, {"Content-Type": "text/html"}, b""
+        return super().respond(method, url)
+
+
+@pytest.fixture
+def serve():
+    threads = []
+
+    def start(site):
+        server = ReplayServer(site)
+        thread = ServerThread(server)
+        threads.append(thread)
+        return server, thread.start()
+
+    yield start
+    for thread in threads:
+        thread.stop()
+
+
+def playlist_entries(workdir):
+    return {entry["tvg-name"]: entry["url"] for entry in parse_playlist(os.path.join(workdir, "Exxen", "Exxen.m3u"))}
+
+
+def state(workdir):
+    with open(os.path.join(workdir, "Exxen", "durum", "Exxen.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_probe_failures_are_backed_off_without_caching_the_guess(tmp_path, serve):
+    site = FaultySite(player_mix={"fallback": 1})
+    site.dead_cdn = True
+    server, host_map = serve(site)
+    workdir = str(tmp_path)
+
+    assert run_platform("Exxen", host_map, workdir, server)["exit_code"] == 0
+    first = playlist_entries(workdir)
+    failures = state(workdir)["failures"]
+    assert first and len(failures) == len(first)
+    assert {entry["reason"] for entry in failures.values()} == {"probe_failed"}
+    # Doğrulanmamış default d2 adresi yazılır ama önbelleğe girmez
+    assert all("d2.premiumvideo.click" in url for url in first.values())
+    assert state(workdir)["resolutions"] == {}
+
+    probes = site.probes
+    run_platform("Exxen", host_map, workdir, server)
+    assert site.probes == probes
+    assert playlist_entries(workdir) == first
+
+
+def test_unreachable_series_page_keeps_stored_episodes(tmp_path, serve):
+    site = FaultySite(player_mix={"playhouse": 1})
+    server, host_map = serve(site)
+    workdir = str(tmp_path)
+
+    run_platform("Exxen", host_map, workdir, server)
+    first = playlist_entries(workdir)
+    assert first
+
+    site.broken_series = True
+    assert run_platform("Exxen", host_map, workdir, server)["exit_code"] == 0
+    assert playlist_entries(workdir) == first
+    assert not os.path.exists(os.path.join(workdir, "Exxen", "durum", "Exxen.journal.jsonl"))
@@ -0,0 +1,49 @@
+from resolution_cache import ResolutionCache, episode_key
+from seed import entry_key, parse_playlist, seed_cache
+from state import StateStore
+
+
+PLAYLIST = """#EXTM3U
+#EXTINF:-1 tvg-id="DIZI_1_1" tvg-name="Dizi Sezon 1 Bölüm 1" tvg-logo="logo.webp" group-title="Dizi",Dizi Sezon 1 Bölüm 1
+https://proxy.example/?url=https%3A%2F%2Fd1.premiumvideo.click%2Fuploads%2Fencode%2Faaa%2Fmaster.m3u8
+#EXTINF:-1 tvg-id="ARAF" tvg-name="Araf" tvg-logo="araf1.webp" group-title="Filmler",Araf
+https://d1.premiumvideo.click/uploads/encode/bbb/master.m3u8
+#EXTINF:-1 tvg-id="ARAF" tvg-name="Araf" tvg-logo="araf2.webp" group-title="Filmler",Araf
+https://d2.premiumvideo.click/uploads/encode/ccc/master.m3u8
+#EXTINF:-1 tvg-id="DONUS" tvg-name="Dönüş" tvg-logo="donus.webp" group-title="Filmler",Dönüş
+https://d3.premiumvideo.click/uploads/encode/ddd/master.m3u8
+"""
+
+
+def playlist(tmp_path):
+    path = tmp_path / "a.m3u"
+    path.write_text(PLAYLIST, encoding="utf-8")
+    return str(path)
+
+
+def test_entry_keys(tmp_path):
+    entries = parse_playlist(playlist(tmp_path))
+    assert [entry_key(entry) for entry in entries] == [episode_key("Dizi", 1, 1), "Araf", "Araf", "Dönüş"]
+    assert entries[0]["extinf"].startswith("#EXTINF")
+
+
+def test_ambiguous_titles_are_not_seeded(tmp_path):
+    cache = ResolutionCache(StateStore("filmler", state_dir=str(tmp_path)))
+    assert seed_cache(cache, playlist(tmp_path)) == 2
+    assert cache.get("Araf") is None
+    assert cache.get("Dönüş")["file_id"] == "ddd"
+    # Proxy öneki kaldırılır
+    assert cache.get(episode_key("Dizi", 1, 1))["url"] == "https://d1.premiumvideo.click/uploads/encode/aaa/master.m3u8"
+
+
+def test_seeded_title_entry_moves_to_the_url_key(tmp_path):
+    cache = ResolutionCache(StateStore("filmler", state_dir=str(tmp_path)))
+    seed_cache(cache, playlist(tmp_path))
+    movie_url = "https://dizifun5.com/film/donus"
+    assert cache.adopt(movie_url, "Dönüş") == movie_url
+    assert cache.get(movie_url)["file_id"] == "ddd"
+    assert cache.get("Dönüş") is None
+    # URL anahtarı zaten varsa başlıkla kayıt taşınmaz
+    cache.put("Dönüş", "https://d4.premiumvideo.click/uploads/encode/eee/master.m3u8")
+    cache.adopt(movie_url, "Dönüş")
+    assert cache.get(movie_url)["file_id"] == "ddd"